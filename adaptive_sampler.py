@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+    Name: adaptive_sampler.py
+    Created: 10/18/26
+    Purpose: Sampler that reads each group of metrics as often as it is
+    changing, fast while a value moves or crosses a threshold and
+    backing off while the host is idle
+
+    Works anywhere a Sampler does, pass it to Collector with
+    interval=None so the collector sleeps until the next group is due
+"""
+import os
+import time
+# pip install psutil
+import psutil
+from system_sampler import Snapshot, busy_percent
+
+# Seconds between readings of a group that is changing
+FAST_SECONDS = 0.1
+# Longest seconds between readings of a group that isn't
+SLOW_SECONDS = 10.0
+
+# Kernel clock ticks per second, CPU times are counted in whole ticks
+try:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    # Windows counts in 100 ns units, far finer than any period here
+    CLOCK_TICKS = 10_000_000
+
+
+class MetricGroup:
+    def __init__(self, name, read, measure=None, change=0.0, relative=0.0,
+                 thresholds=(), counter=False, noise=0.0, fast=FAST_SECONDS,
+                 slow=SLOW_SECONDS):
+        """
+            One group of metrics read together, with its own period
+            :param read: Function that reads the group's value
+            :param measure: Function turning the value into one number
+            to watch for changes, None to always back off
+            :param change: Smallest change of the number that counts
+            :param relative: Or this fraction of the last number
+            :param thresholds: Numbers that count as a change when crossed,
+            above the last one the group stays fast
+            :param counter: The number only ever grows, watch its rate
+            :param noise: How far the number can jump over one second
+            without anything happening, it grows for shorter periods
+            :param fast: Seconds between readings while changing
+            :param slow: Longest seconds between readings while idle
+        """
+        self.name = name
+        self.read = read
+        self.measure = measure
+        self.change = change
+        self.relative = relative
+        self.thresholds = thresholds
+        self.counter = counter
+        self.noise = noise
+        self.fast = fast
+        self.slow = slow
+
+        self.value = None
+        self.level = None
+        self.time = None
+        # Start fast and back off once the values settle
+        self.period = fast
+        self.due = 0.0
+        self._count = None
+
+# ------------------------------ UPDATE ---------------------------------- #
+    def update(self, now):
+        """
+            Read the group and pick how long until it is read again
+            :param now: time.monotonic()
+        """
+        self.value = self.read()
+        if self.measure is None:
+            self.period = self.slow
+            self.due = now + self.period
+            return
+        level = self.measure(self.value)
+        elapsed = None if self.time is None else now - self.time
+        self.time = now
+
+        if self.counter:
+            # Watch the rate the counter grows at, not the counter
+            count = level
+            level = None
+            if self._count is not None and elapsed > 0:
+                level = (count - self._count) / elapsed
+            self._count = count
+
+        if level is not None:
+            if self.level is None or self.changed(self.level, level, elapsed):
+                self.period = self.fast
+            else:
+                self.period = min(self.period * 2, self.slow)
+            self.level = level
+        self.due = now + self.period
+
+    def changed(self, old, new, elapsed):
+        """
+            :param elapsed: Seconds between the two readings
+            :returns: True if new is different enough from old to keep
+            reading fast
+            :rtype: bool
+        """
+        smallest = max(self.change, self.relative * abs(old))
+        if elapsed:
+            smallest = max(smallest, self.noise / elapsed)
+        if abs(new - old) >= smallest:
+            return True
+        for threshold in self.thresholds:
+            if (old < threshold) != (new < threshold):
+                return True
+        # Keep a close eye on anything running hot
+        return bool(self.thresholds) and new >= self.thresholds[-1]
+
+
+class AdaptiveSampler:
+    def __init__(self, mounts=("/",), percpu=False, perdisk=False,
+                 pernic=False, diskio=False, cpustats=False,
+                 fast=FAST_SECONDS, slow=SLOW_SECONDS, provider=psutil):
+        """
+            Same options as Sampler, plus
+            :param fast: Seconds between readings of a changing group
+            :param slow: Longest seconds between readings of an idle group
+        """
+        self.mounts = tuple(mounts)
+        self.percpu = percpu
+        self.perdisk = perdisk
+        self.pernic = pernic
+        self.diskio = diskio
+        self.cpustats = cpustats
+        self.provider = provider
+
+        # Facts that never change are read once
+        self.cpu_count = provider.cpu_count(logical=False)
+        self.logical_cpu_count = provider.cpu_count()
+
+        provider.cpu_percent(interval=None)
+        if percpu:
+            provider.cpu_times_percent(interval=None, percpu=True)
+
+        def group(*args, **kwargs):
+            return MetricGroup(*args, fast=fast, slow=slow, **kwargs)
+
+        # CPU percents are counted in whole clock ticks, two readings can
+        # each be a tick out, on every core
+        cores = self.logical_cpu_count or 1
+        cpu_noise = 2 * 100 / (CLOCK_TICKS * cores)
+
+        # Counters are read every time a snapshot is taken, RateEngine
+        # needs a new reading at each snapshot timestamp, but how fast
+        # they change still decides how soon the next snapshot is
+        self.counters = [
+            group("cpu", lambda: provider.cpu_percent(interval=None),
+                  lambda percent: percent, change=5.0,
+                  thresholds=(80.0, 95.0), noise=cpu_noise),
+            group("net", self.read_net, lambda net: sum(
+                  (net[0].bytes_sent, net[0].bytes_recv)),
+                  change=10_000, relative=0.25, counter=True),
+        ]
+        if diskio or perdisk:
+            self.counters.append(group(
+                "disk_io", self.read_disk_io, lambda disk: 0 if disk[0]
+                is None else disk[0].read_bytes + disk[0].write_bytes,
+                change=100_000, relative=0.25, counter=True))
+        if cpustats:
+            # Context switches jump around too much to go by
+            self.counters.append(group("cpu_stats", provider.cpu_stats))
+        # Everything else is only read when its own period is up
+        self.groups = [
+            group("memory", provider.virtual_memory,
+                  lambda memory: memory.percent, change=2.0,
+                  thresholds=(80.0, 95.0)),
+            group("swap", provider.swap_memory,
+                  lambda swap: swap.percent, change=2.0,
+                  thresholds=(50.0,)),
+            group("cpu_freq", provider.cpu_freq,
+                  lambda freq: 0.0 if freq is None else freq.current,
+                  change=100.0),
+            group("disk_usage", self.read_disk_usage,
+                  lambda usage: max(
+                      [disk.percent for disk in usage.values()] or [0.0]),
+                  change=1.0, thresholds=(90.0, 95.0)),
+        ]
+        if percpu:
+            self.groups.append(group(
+                "cpu_percpu",
+                lambda: provider.cpu_times_percent(interval=None, percpu=True),
+                lambda cores: max(busy_percent(core) for core in cores),
+                change=10.0, thresholds=(90.0,), noise=2 * 100 / CLOCK_TICKS))
+        self.by_name = {
+            group.name: group for group in self.counters + self.groups}
+
+    def read_net(self):
+        pernic = None
+        if self.pernic:
+            pernic = self.provider.net_io_counters(pernic=True)
+        return self.provider.net_io_counters(), pernic
+
+    def read_disk_io(self):
+        disk_io = perdisk = None
+        if self.diskio:
+            disk_io = self.provider.disk_io_counters()
+        if self.perdisk:
+            perdisk = self.provider.disk_io_counters(perdisk=True)
+        return disk_io, perdisk
+
+    def read_disk_usage(self):
+        return {mount: self.provider.disk_usage(mount)
+                for mount in self.mounts}
+
+# ------------------------------ SAMPLE ---------------------------------- #
+    def sample(self):
+        """
+            Read the counters and every group that is due
+            :returns: Snapshot with the newest value of every group
+            :rtype: Snapshot
+        """
+        now = time.monotonic()
+        for group in self.counters:
+            group.update(now)
+        for group in self.groups:
+            if group.due <= now:
+                group.update(now)
+
+        values = self.by_name
+        cpu_percpu = cpu_times_percpu = None
+        if self.percpu:
+            cpu_times_percpu = values["cpu_percpu"].value
+            cpu_percpu = [busy_percent(times) for times in cpu_times_percpu]
+        net_io, net_io_pernic = values["net"].value
+        disk_io = disk_io_perdisk = cpu_stats = None
+        if "disk_io" in values:
+            disk_io, disk_io_perdisk = values["disk_io"].value
+        if "cpu_stats" in values:
+            cpu_stats = values["cpu_stats"].value
+
+        return Snapshot(
+            timestamp=time.monotonic_ns(),
+            cpu_percent=values["cpu"].value,
+            cpu_percpu=cpu_percpu,
+            cpu_times_percpu=cpu_times_percpu,
+            cpu_freq=values["cpu_freq"].value,
+            virtual_memory=values["memory"].value,
+            swap_memory=values["swap"].value,
+            net_io=net_io,
+            net_io_pernic=net_io_pernic,
+            disk_io=disk_io,
+            disk_io_perdisk=disk_io_perdisk,
+            cpu_stats=cpu_stats,
+            disk_usage=values["disk_usage"].value
+        )
+
+# ---------------------------- NEXT DELAY -------------------------------- #
+    def next_delay(self):
+        """
+            :returns: Seconds until the next group is due
+            :rtype: float
+        """
+        due = min(group.due for group in self.counters + self.groups)
+        return max(due - time.monotonic(), 0.0)
+
+    def periods(self):
+        """
+            :returns: {group name: seconds between its readings}
+            :rtype: dict
+        """
+        return {name: group.period for name, group in self.by_name.items()}
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+    Name: benchmark_suite.py
+    Created: 10/18/26
+    Purpose: Time the sampling and drawing hot paths and write the
+    results as JSON, so a slower change shows up against a saved run
+
+    Runs headless, Tk labels are fake widgets unless a display is
+    available and Matplotlib draws with the Agg backend
+
+    Example: python benchmark_suite.py --output baseline.json
+             python benchmark_suite.py --baseline baseline.json
+"""
+import argparse
+import importlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+# pip install matplotlib numpy psutil rich
+import matplotlib
+# Before anything imports pyplot, no window is ever opened
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from rich.console import Console
+from rich.table import Table
+from system_sampler import Sampler
+from ring_buffer import RingBuffer
+from tk_binding import TkBinding
+
+# Points in the network chart for each chart benchmark
+CHART_POINTS = (10, 1_000, 100_000)
+# A result this much slower than the baseline is a regression
+TOLERANCE = 0.25
+
+
+# ------------------------------- TIMING --------------------------------- #
+def measure(name, function, calls, **info):
+    """
+        Call function calls times and time every call
+        :returns: Result with the mean, median and fastest call
+        :rtype: dict
+    """
+    # One call first so imports and caches don't count
+    function()
+    times = []
+    for i in range(calls):
+        start = time.perf_counter_ns()
+        function()
+        times.append(time.perf_counter_ns() - start)
+    result = {
+        "name": name,
+        "calls": calls,
+        "mean_us": statistics.fmean(times) / 1000,
+        "median_us": statistics.median(times) / 1000,
+        "min_us": min(times) / 1000,
+    }
+    result.update(info)
+    return result
+
+
+# ------------------------------ SNAPSHOT -------------------------------- #
+def legacy_snapshot(provider):
+    """
+        One tick the way SystemInfo.get_cpu_info read the system before
+        the sampler, every value asked for on its own
+    """
+    provider.cpu_count(logical=False)
+    provider.cpu_count()
+    provider.cpu_percent(interval=None)
+    provider.cpu_freq().current
+    provider.virtual_memory().total
+    provider.virtual_memory().total - provider.virtual_memory().available
+    provider.virtual_memory().percent
+    provider.net_io_counters()
+    provider.disk_usage("/")
+
+
+def snapshot_benchmarks(provider, calls):
+    sampler = Sampler(provider=provider)
+    full = Sampler(percpu=True, perdisk=True, pernic=True, diskio=True,
+                   cpustats=True, provider=provider)
+    return [
+        measure("snapshot_legacy", lambda: legacy_snapshot(provider), calls),
+        measure("snapshot_sampler", sampler.sample, calls),
+        measure("snapshot_sampler_full", full.sample, calls),
+    ]
+
+
+# ----------------------------- TK LABELS -------------------------------- #
+class FakeRoot:
+    """
+        Runs idle callbacks when asked to instead of from a Tk loop
+    """
+    def __init__(self):
+        self.idle = []
+
+    def after_idle(self, function):
+        self.idle.append(function)
+
+    def run_idle(self):
+        idle, self.idle = self.idle, []
+        for function in idle:
+            function()
+
+
+class FakeLabel:
+    def __init__(self):
+        self.options = {}
+
+    def configure(self, options=None, **kwargs):
+        self.options.update(options or {}, **kwargs)
+
+
+def make_labels(count):
+    """
+        Real Tk labels when there is a display, fake ones otherwise
+        :returns: (root, labels, "tk" or "fake")
+        :rtype: tuple
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        labels = [tk.Label(root) for i in range(count)]
+        for label in labels:
+            label.pack()
+        return root, labels, "tk"
+    except Exception:
+        # No display, or Tk isn't installed
+        return FakeRoot(), [FakeLabel() for i in range(count)], "fake"
+
+
+def label_benchmarks(calls, count=9):
+    """
+        Time a tick of count labels configured every time, and through
+        TkBinding with a third of the values changing
+    """
+    root, labels, kind = make_labels(count)
+    binding = TkBinding(root)
+    for i, label in enumerate(labels):
+        binding.bind(i, label)
+    tick = [0]
+
+    def configure_all():
+        tick[0] += 1
+        for i, label in enumerate(labels):
+            label.configure(text=f" {tick[0] + i} %")
+
+    def run_idle():
+        if kind == "tk":
+            root.update_idletasks()
+        else:
+            root.run_idle()
+
+    def bound():
+        tick[0] += 1
+        for i in range(count):
+            # Only every third label changes each tick
+            value = tick[0] if i % 3 == 0 else i
+            binding.set(i, f" {value} %")
+        run_idle()
+
+    results = [
+        measure("tk_labels_configure", configure_all, calls,
+                labels=count, widgets=kind, widget_calls_per_tick=count),
+        measure("tk_labels_binding", bound, calls,
+                labels=count, widgets=kind),
+    ]
+    # Includes the after_idle of every tick
+    results[1]["widget_calls_per_tick"] = binding.calls / binding.frames
+    if kind == "tk":
+        root.destroy()
+    return results
+
+
+# ------------------------------- CHART ---------------------------------- #
+def make_chart(points):
+    """
+        SystemMonitorApp with an Agg canvas instead of a Tk one and a
+        network history of points samples
+    """
+    from system_info_gui_chart_1 import SystemMonitorApp
+
+    app = SystemMonitorApp.__new__(SystemMonitorApp)
+    app.upload_data = RingBuffer(points)
+    app.download_data = RingBuffer(points)
+    app.network_time = RingBuffer(points)
+    app.figure_network = Figure(figsize=(6, 3), tight_layout=True)
+    app.network_ax = app.figure_network.add_subplot(111)
+    app.canvas_network = FigureCanvasAgg(app.figure_network)
+    app.create_network_chart()
+
+    start = time.time()
+    for i in range(points):
+        app.network_time.append(start + i)
+        app.upload_data.append(i % 100)
+        app.download_data.append(i % 250)
+    app.canvas_network.draw()
+    return app
+
+
+def chart_benchmarks(calls):
+    results = []
+    for points in CHART_POINTS:
+        app = make_chart(points)
+        clock = [app.network_time.last()]
+
+        def frame():
+            # A new sample a second, like the collector
+            clock[0] += 1
+            app.network_time.append(clock[0])
+            app.upload_data.append(50.0)
+            app.download_data.append(120.0)
+            app.update_line_charts()
+
+        results.append(measure(
+            f"chart_frame_{points}", frame, calls, points=points))
+    return results
+
+
+# ----------------------------- RICH TABLE ------------------------------- #
+def table_rows(snapshot):
+    """
+        The rows psutil_sys_info_table.py shows, from one snapshot
+        :rtype: list
+    """
+    virtual_memory = snapshot.virtual_memory
+    return [
+        ("CPU usage", f"{snapshot.cpu_percent} %"),
+        ("CPU frequency", f"{snapshot.cpu_freq.current / 1024:,.2f} Ghz"),
+        ("RAM total", f"{virtual_memory.total / 1024 ** 3:,.2f} GB"),
+        ("RAM usage", f"{virtual_memory.used / 1024 ** 3:,.2f} GB"),
+        ("RAM usage pct", f"{virtual_memory.percent} %"),
+        ("Net IO sent", f"{snapshot.net_io.bytes_sent:,}"),
+        ("Net IO recv", f"{snapshot.net_io.bytes_recv:,}"),
+    ]
+
+
+def build_table(rows):
+    table = Table(
+        title="\nSystem Information",
+        title_style="bold blue",
+        header_style="bold blue"
+    )
+    table.add_column("Description", justify="right")
+    table.add_column("Value", min_width=20)
+    for description, value in rows:
+        table.add_row(description, value)
+    return table
+
+
+def table_benchmarks(provider, calls):
+    rows = table_rows(Sampler(provider=provider).sample())
+    console = Console(file=io.StringIO(), width=100, force_terminal=True)
+    table = build_table(rows)
+
+    def print_table():
+        console.print(table)
+        # Don't let the output grow between calls
+        console.file.seek(0)
+        console.file.truncate()
+
+    return [
+        measure("rich_table_build", lambda: build_table(rows), calls),
+        measure("rich_table_print", print_table, calls),
+    ]
+
+
+# ------------------------------ BASELINE -------------------------------- #
+def regressions(results, baseline, tolerance=TOLERANCE):
+    """
+        :returns: Names of the results slower than the baseline by
+        more than tolerance
+        :rtype: list
+    """
+    before = {result["name"]: result for result in baseline["results"]}
+    slower = []
+    for result in results:
+        old = before.get(result["name"])
+        if old and result["median_us"] > old["median_us"] * (1 + tolerance):
+            slower.append(
+                f"{result['name']}: {old['median_us']:,.1f} us -> "
+                f"{result['median_us']:,.1f} us")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the sampling and drawing hot paths")
+    parser.add_argument("--provider", default="psutil",
+                        help="module with the psutil functions to sample")
+    parser.add_argument("--calls", type=int, default=200,
+                        help="timed calls of each benchmark")
+    parser.add_argument("--output", help="file to write the JSON to, "
+                        "stdout when left out")
+    parser.add_argument("--baseline", help="JSON of an earlier run, exit "
+                        "with 1 if anything got slower")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="fraction slower than the baseline allowed")
+    args = parser.parse_args()
+
+    provider = importlib.import_module(args.provider)
+    results = []
+    results += snapshot_benchmarks(provider, args.calls)
+    results += label_benchmarks(args.calls)
+    results += chart_benchmarks(args.calls)
+    results += table_benchmarks(provider, args.calls)
+
+    report = {
+        "created": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "provider": args.provider,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            slower = regressions(results, json.load(file), args.tolerance)
+        for line in slower:
+            print(f"slower: {line}", file=sys.stderr)
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
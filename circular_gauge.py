@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+    Name: circular_gauge.py
+    Created: 10/18/26
+    Purpose: Circular gauge drawn on a Tk canvas, the canvas items are
+    created once and only reconfigured on every update
+"""
+import tkinter as tk
+
+
+class CircularGauge:
+    def __init__(self, canvas, x=75, y=75, radius=60,
+                 color="green", track_color="gray85"):
+        """
+            Create the track and arc items on the canvas, the value is
+            shown by the label under the gauge
+            :param canvas: tk.Canvas to draw the gauge on
+            :param x: Center x of the gauge
+            :param y: Center y of the gauge
+            :param radius: Radius of the gauge
+        """
+        self.canvas = canvas
+        self.percent = None
+        self.start_angle = 90  # Start from top (12 o'clock)
+
+        box = self.bounding_box(x, y, radius)
+
+        # Full circle behind the arc showing the 100% range
+        self.track = canvas.create_oval(*box, fill=track_color, outline="")
+
+        # Pie slice showing the current value, hidden until it has a value
+        self.arc = canvas.create_arc(
+            *box,
+            start=self.start_angle, extent=0,
+            fill=color, outline="", state=tk.HIDDEN
+        )
+
+# ------------------------------- SET ------------------------------------ #
+    def set(self, percent):
+        """
+            Show a new value, only the existing arc is changed
+            :param percent: Value to show from 0 to 100
+        """
+        percent = min(max(percent, 0), 100)
+        if percent == self.percent:
+            return
+
+        self.percent = percent
+        if percent == 0:
+            self.canvas.itemconfigure(self.arc, state=tk.HIDDEN)
+        else:
+            # Calculate extent in degrees, clockwise from the top
+            extent = -360 * percent / 100
+            self.canvas.itemconfigure(
+                self.arc, extent=extent, state=tk.NORMAL)
+
+# ------------------------------ MOVE ------------------------------------ #
+    def move(self, x, y, radius):
+        """
+            Move or resize the gauge without creating new items
+        """
+        box = self.bounding_box(x, y, radius)
+        self.canvas.coords(self.track, *box)
+        self.canvas.coords(self.arc, *box)
+
+# --------------------------- BOUNDING BOX ------------------------------- #
+    @staticmethod
+    def bounding_box(x, y, radius):
+        return (x - radius, y - radius, x + radius, y + radius)
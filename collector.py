@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+    Name: collector.py
+    Created: 10/18/26
+    Purpose: Sample the system on a background thread so the Tk main
+    thread never waits on psutil, and never touches Tk off the main thread
+"""
+import queue
+import threading
+import time
+import tkinter as tk
+from system_sampler import Sampler
+
+# How often the Tk main thread checks for a new snapshot in milliseconds
+POLL_MS = 50
+
+
+class Collector:
+    def __init__(self, sampler=None, interval=1.0):
+        """
+            :param sampler: Sampler to take snapshots with
+            :param interval: Seconds between snapshots, None to let an
+            AdaptiveSampler decide with its next_delay()
+        """
+        self.sampler = sampler if sampler is not None else Sampler()
+        self.interval = interval
+
+        # Only the newest snapshot matters, older ones are dropped
+        self.queue = queue.Queue(maxsize=1)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._root = None
+        self._after_id = None
+
+# ------------------------------ START ----------------------------------- #
+    def start(self):
+        """
+            Start sampling on a daemon thread
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+# ------------------------------- RUN ------------------------------------ #
+    def run(self):
+        """
+            Collector thread, take a snapshot every interval seconds
+        """
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            self.publish(self.sampler.sample())
+
+            if self.interval is None:
+                self._stop_event.wait(self.sampler.next_delay())
+                continue
+
+            # Sleep until the next deadline so sampling time doesn't add up
+            deadline += self.interval
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                # Fell behind, start counting again from now
+                deadline = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+
+# ----------------------------- PUBLISH ---------------------------------- #
+    def publish(self, snapshot):
+        """
+            Put a snapshot on the queue, replacing one not yet read
+        """
+        try:
+            self.queue.put_nowait(snapshot)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(snapshot)
+
+# ------------------------------ LATEST ---------------------------------- #
+    def latest(self):
+        """
+            Get the newest snapshot without waiting
+            :returns: Newest snapshot, None if there is no new one
+            :rtype: Snapshot
+        """
+        snapshot = None
+        while True:
+            try:
+                snapshot = self.queue.get_nowait()
+            except queue.Empty:
+                return snapshot
+
+# ----------------------------- SCHEDULE --------------------------------- #
+    def schedule(self, root, callback, poll_ms=POLL_MS):
+        """
+            Poll for new snapshots from the Tk main thread
+            :param root: Tk root window to schedule the polls on
+            :param callback: Called with each new snapshot
+        """
+        self._root = root
+
+        def poll():
+            snapshot = self.latest()
+            if snapshot is not None:
+                callback(snapshot)
+            self._after_id = root.after(poll_ms, poll)
+
+        self._after_id = root.after(0, poll)
+
+# ------------------------------- STOP ----------------------------------- #
+    def stop(self):
+        """
+            Stop polling and stop the collector thread
+        """
+        if self._after_id is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except tk.TclError:
+                # The window was already destroyed with its callbacks
+                pass
+            self._after_id = None
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+    Name: collector_engine.py
+    Created: 10/18/26
+    Purpose: Read each group of metrics on its own schedule with
+    asyncio, cpu every second and disks every few, instead of reading
+    everything together at the pace of the slowest
+
+    Every group is a coroutine that sleeps until its next deadline and
+    hands the blocking psutil call to a thread pool. Deadlines are a
+    fixed grid from the start time, so reading time and jitter never
+    add up, and one group waiting on a slow read never holds up another
+
+    Example: python collector_engine.py --seconds 10
+"""
+import argparse
+import asyncio
+import queue
+import random
+import sys
+import threading
+import time
+import tkinter as tk
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+# pip install psutil
+import psutil
+
+# How often the Tk main thread checks for new readings in milliseconds
+POLL_MS = 50
+# Seconds between readings of each default group
+PERIODS = {
+    "cpu": 1.0,
+    "mem": 2.0,
+    "net": 1.0,
+    "disk": 5.0,
+    "sensors": 2.0,
+    "processes": 3.0,
+}
+# Most seconds a reading is moved past its deadline, so groups with the
+# same period don't all reach the thread pool at once
+JITTER = 0.05
+# Most seconds stop() waits for the engine's thread, a read stuck on a
+# hung mount is left behind on its pool thread
+STOP_SECONDS = 1.0
+
+# One read of a group
+# timestamp is time.monotonic_ns() when the read started, use it for
+# rates, duration is the seconds the read took and late the seconds it
+# started after its deadline, jitter included
+Reading = namedtuple("Reading", "name timestamp value duration late")
+
+
+class CollectorGroup:
+    def __init__(self, name, read, period=1.0, jitter=JITTER):
+        """
+            One group of metrics read together on its own schedule
+            :param read: Blocking function that reads the group's value,
+            runs on a pool thread
+            :param period: Seconds between deadlines
+            :param jitter: Most seconds a read starts after its deadline
+        """
+        self.name = name
+        self.read = read
+        self.period = period
+        self.jitter = jitter
+
+        self.runs = 0
+        # Deadlines skipped because the read before took too long
+        self.overruns = 0
+        self.errors = 0
+        self.max_duration = 0.0
+        self.max_late = 0.0
+
+
+def default_groups(names=tuple(PERIODS), provider=psutil, mounts=("/",),
+                   process_count=10, periods=None, jitter=JITTER):
+    """
+        The groups the front ends show
+        :param names: Which of cpu, mem, net, disk, sensors and
+        processes to read, in that order
+        :param provider: psutil or a module with the same functions
+        :param periods: {name: seconds} to change from PERIODS
+        :rtype: list
+    """
+    periods = dict(PERIODS, **(periods or {}))
+    reads = {}
+    if "cpu" in names:
+        # The first cpu_percent(interval=None) call always returns 0.0
+        provider.cpu_percent(interval=None)
+        reads["cpu"] = lambda: provider.cpu_percent(interval=None)
+    if "mem" in names:
+        reads["mem"] = provider.virtual_memory
+    if "net" in names:
+        reads["net"] = provider.net_io_counters
+    if "disk" in names:
+        reads["disk"] = lambda: {
+            mount: provider.disk_usage(mount) for mount in mounts}
+    if "sensors" in names:
+        # Only imported when asked for, sensors are found when made
+        from sensors import Sensors
+        reads["sensors"] = Sensors().read
+    if "processes" in names:
+        from process_table import ProcessTable
+        reads["processes"] = ProcessTable(
+            process_count, provider=provider).update
+    return [CollectorGroup(name, read, periods[name], jitter)
+            for name, read in reads.items()]
+
+
+class CollectorEngine:
+    def __init__(self, groups=None, workers=None, seed=None):
+        """
+            :param groups: CollectorGroups, default_groups() if None
+            :param workers: Threads for the blocking reads, one per
+            group if None, which is as many as can ever be busy since a
+            group waits for its read before the next
+            :param seed: Seed for the jitter, for repeatable schedules
+        """
+        if groups is None:
+            groups = default_groups()
+        self.groups = list(groups)
+        self.group_names = {group.name: group for group in self.groups}
+        self.workers = workers or len(self.groups)
+        self.random = random.Random(seed)
+
+        # Functions called with every Reading on the engine's thread
+        self.subscribers = []
+        # Newest Reading of every group
+        self.readings = {}
+
+        self.loop = None
+        self._stop_event = None
+        self._ready = threading.Event()
+        self._thread = None
+        # Newest Reading of every group not yet seen by Tk
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._root = None
+        self._after_id = None
+
+# ----------------------------- SUBSCRIBE -------------------------------- #
+    def subscribe(self, callback):
+        """
+            Call callback(reading) with every reading, from the engine's
+            thread, so it must return quickly and not touch Tk
+        """
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+# ------------------------------- RUN ------------------------------------ #
+    async def run(self):
+        """
+            Read every group on its schedule until stop()
+        """
+        self.loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._ready.set()
+        executor = ThreadPoolExecutor(
+            self.workers, thread_name_prefix="collector")
+        start = self.loop.time()
+        tasks = [asyncio.ensure_future(
+            self.run_group(group, executor, start))
+            for group in self.groups]
+        try:
+            await self._stop_event.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Not a with block, that waits for every running read and
+            # a hung one would never let stop() return
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run_group(self, group, executor, start):
+        """
+            Read one group at every deadline on its grid
+        """
+        deadline = start
+        while True:
+            # Jitter moves this read only, the grid stays where it is
+            delay = deadline + self.random.uniform(0, group.jitter) \
+                - self.loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            late = self.loop.time() - deadline
+
+            try:
+                reading = await self.loop.run_in_executor(
+                    executor, self.read_group, group, late)
+            except Exception as error:
+                # A group that fails once, like a sensor that went away,
+                # is tried again at its next deadline
+                group.errors += 1
+                print(f"collector {group.name}: {error!r}", file=sys.stderr)
+            else:
+                self.publish(reading)
+
+            deadline += group.period
+            now = self.loop.time()
+            if deadline <= now:
+                # The read took longer than the period, skip the missed
+                # deadlines instead of reading several times in a row
+                missed = int((now - deadline) // group.period) + 1
+                group.overruns += missed
+                deadline += missed * group.period
+
+    def read_group(self, group, late):
+        """
+            Read a group on a pool thread
+            :rtype: Reading
+        """
+        start = time.monotonic_ns()
+        value = group.read()
+        duration = (time.monotonic_ns() - start) / 1e9
+        group.runs += 1
+        group.max_duration = max(group.max_duration, duration)
+        group.max_late = max(group.max_late, late)
+        return Reading(group.name, start, value, duration, late)
+
+# ----------------------------- PUBLISH ---------------------------------- #
+    def publish(self, reading):
+        """
+            Keep the newest reading of its group and hand it to every
+            subscriber, a subscriber that raises is counted as an error
+            of the group and the others still get the reading
+        """
+        self.readings[reading.name] = reading
+        with self._lock:
+            self._pending[reading.name] = reading
+        for callback in self.subscribers:
+            try:
+                callback(reading)
+            except Exception as error:
+                group = self.group_names.get(reading.name)
+                if group is not None:
+                    group.errors += 1
+                print(f"collector {reading.name} subscriber: {error!r}",
+                      file=sys.stderr)
+
+# ------------------------------ START ----------------------------------- #
+    def start(self):
+        """
+            Run the engine's event loop on a daemon thread
+        """
+        self._ready.clear()
+        self._thread = threading.Thread(
+            target=asyncio.run, args=(self.run(),), daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+# ----------------------------- SCHEDULE --------------------------------- #
+    def schedule(self, root, callbacks, poll_ms=POLL_MS):
+        """
+            Poll for new readings from the Tk main thread
+            :param root: Tk root window to schedule the polls on
+            :param callbacks: {group name: function(reading)}, called
+            with the newest reading of each group that has a new one
+        """
+        self._root = root
+
+        def poll():
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for name, reading in pending.items():
+                if name in callbacks:
+                    callbacks[name](reading)
+            self._after_id = root.after(poll_ms, poll)
+
+        self._after_id = root.after(0, poll)
+
+# ------------------------------- STOP ----------------------------------- #
+    def stop(self):
+        """
+            Stop polling and stop the engine, waits up to STOP_SECONDS
+            for reads running now
+        """
+        if self._after_id is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except tk.TclError:
+                # The window was already destroyed with its callbacks
+                pass
+            self._after_id = None
+
+        if self._thread is not None:
+            self.loop.call_soon_threadsafe(self._stop_event.set)
+            self._thread.join(STOP_SECONDS)
+            self._thread = None
+
+# ------------------------------ SUMMARY --------------------------------- #
+    def summary(self):
+        """
+            :returns: Runs, skipped deadlines and worst times of every
+            group
+            :rtype: str
+        """
+        lines = []
+        for group in self.groups:
+            lines.append(
+                f"{group.name:>10}: every {group.period:g} s, "
+                f"{group.runs} runs, {group.overruns} skipped, "
+                f"{group.errors} errors, "
+                f"slowest {group.max_duration * 1000:.1f} ms, "
+                f"latest start {group.max_late * 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Read every group on its own schedule and print "
+        "when each read started")
+    parser.add_argument("--seconds", type=float, default=10.0,
+                        help="how long to run")
+    parser.add_argument("--workers", type=int,
+                        help="threads for the reads, one per group if "
+                        "left out")
+    args = parser.parse_args()
+
+    engine = CollectorEngine(workers=args.workers)
+    start = time.monotonic_ns()
+    readings = queue.Queue()
+    engine.subscribe(readings.put)
+    engine.start()
+    try:
+        end = time.monotonic() + args.seconds
+        while time.monotonic() < end:
+            try:
+                reading = readings.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            print(f"{(reading.timestamp - start) / 1e9:8.3f} s "
+                  f"{reading.name:>10} read in "
+                  f"{reading.duration * 1000:6.1f} ms, "
+                  f"{reading.late * 1000:5.1f} ms after its deadline")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop()
+    print(engine.summary())
+
+
+if __name__ == "__main__":
+    main()
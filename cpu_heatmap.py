@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+    Name: cpu_heatmap.py
+    Created: 10/18/26
+    Purpose: Per-core CPU history with min/max/p95 per core and per NUMA
+    node, drawn as one Tk image or one block of rich text for any
+    number of cores
+"""
+import glob
+import os
+import tkinter as tk
+# pip install numpy
+import numpy as np
+
+NODE_ROOT = "/sys/devices/system/node"
+
+
+def make_palette():
+    """
+        One color for every whole percent, green to yellow to red
+        :returns: 101 x 3 array of red, green, blue
+        :rtype: numpy.ndarray
+    """
+    percent = np.arange(101)
+    red = np.interp(percent, [0, 50, 100], [0, 230, 220])
+    green = np.interp(percent, [0, 50, 100], [150, 200, 0])
+    blue = np.interp(percent, [0, 50, 100], [60, 0, 0])
+    return np.stack([red, green, blue], axis=1).astype(np.uint8)
+
+
+PALETTE = make_palette()
+# The same colors as Tk color names
+PALETTE_HEX = np.array(
+    [f"#{red:02x}{green:02x}{blue:02x}" for red, green, blue in PALETTE])
+
+
+def parse_cpu_list(text):
+    """
+        Read a Linux cpu list like 0-3,8-11
+        :returns: Core numbers
+        :rtype: list
+    """
+    cores = []
+    for part in text.strip().split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            cores.extend(range(int(first), int(last) + 1))
+        elif part:
+            cores.append(int(part))
+    return cores
+
+
+def read_numa_nodes(core_count, root=NODE_ROOT):
+    """
+        Find which cores belong to each NUMA node, read once at startup
+        Hosts without NUMA information are one node with every core
+        :returns: List of (node name, array of core numbers)
+        :rtype: list
+    """
+    nodes = []
+    for path in sorted(glob.glob(os.path.join(root, "node[0-9]*"))):
+        try:
+            with open(os.path.join(path, "cpulist")) as f:
+                cores = [core for core in parse_cpu_list(f.read())
+                         if core < core_count]
+        except OSError:
+            continue
+        if cores:
+            nodes.append((os.path.basename(path), np.array(cores)))
+
+    if not nodes:
+        nodes = [("node0", np.arange(core_count))]
+    return nodes
+
+
+class CoreHistory:
+    def __init__(self, core_count, length=60, nodes=None):
+        """
+            Keep the last length samples of every core
+            :param core_count: Number of logical cores
+            :param length: Number of samples to keep
+            :param nodes: NUMA nodes from read_numa_nodes()
+        """
+        self.core_count = core_count
+        self.length = length
+        self.nodes = nodes if nodes is not None else \
+            read_numa_nodes(core_count)
+
+        # cores x time, every sample is written twice so the last
+        # length samples are always one contiguous slice
+        self._data = np.zeros((core_count, 2 * length), dtype=np.float32)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+# ------------------------------ APPEND ---------------------------------- #
+    def append(self, percpu):
+        """
+            Add one sample with a percent for every core
+        """
+        values = np.asarray(percpu, dtype=np.float32)
+        self._data[:, self._head] = values
+        self._data[:, self._head + self.length] = values
+
+        self._head = (self._head + 1) % self.length
+        if self._count < self.length:
+            self._count += 1
+
+# ------------------------------- VIEW ----------------------------------- #
+    def view(self):
+        """
+            :returns: cores x time from oldest to newest, not a copy
+            :rtype: numpy.ndarray
+        """
+        start = (self._head - self._count) % self.length
+        return self._data[:, start:start + self._count]
+
+    def latest(self):
+        """
+            :returns: Newest percent of every core
+            :rtype: numpy.ndarray
+        """
+        return self._data[:, (self._head - 1) % self.length]
+
+# ---------------------------- CORE STATS -------------------------------- #
+    def core_stats(self):
+        """
+            Min, max and 95th percentile of every core over the history
+            :returns: Three arrays with one value per core
+            :rtype: tuple
+        """
+        history = self.view()
+        if history.shape[1] == 0:
+            zeros = np.zeros(self.core_count, dtype=np.float32)
+            return zeros, zeros, zeros
+        return (
+            history.min(axis=1),
+            history.max(axis=1),
+            np.percentile(history, 95, axis=1)
+        )
+
+# ---------------------------- NODE STATS -------------------------------- #
+    def node_stats(self):
+        """
+            Min, max and 95th percentile over every core of every node
+            :returns: List of (node name, min, max, p95)
+            :rtype: list
+        """
+        history = self.view()
+        stats = []
+        for name, cores in self.nodes:
+            samples = history[cores]
+            if samples.size == 0:
+                stats.append((name, 0.0, 0.0, 0.0))
+            else:
+                stats.append((
+                    name,
+                    float(samples.min()),
+                    float(samples.max()),
+                    float(np.percentile(samples, 95))
+                ))
+        return stats
+
+# --------------------------- PHOTO ROWS --------------------------------- #
+    def photo_rows(self, cell_width, cell_height):
+        """
+            Render the history for tk.PhotoImage.put(), one row of
+            cell_height pixels per core and cell_width pixels per sample
+            :rtype: str
+        """
+        history = self.view()
+        colors = PALETTE_HEX[np.clip(history, 0, 100).astype(np.intp)]
+        colors = np.repeat(np.repeat(colors, cell_height, axis=0),
+                           cell_width, axis=1)
+        return " ".join("{" + " ".join(row) + "}" for row in colors)
+
+
+def block_text(percpu, columns=32):
+    """
+        Draw every core as half a character cell, two cores stacked in
+        each character, so 256 cores fit in 4 lines of 32 characters
+        :param percpu: Percent of every core
+        :returns: rich Text with one colored block per core pair
+        :rtype: rich.text.Text
+    """
+    # Imported here so the Tk views don't need rich installed
+    from rich.text import Text
+
+    percent = np.clip(np.asarray(percpu), 0, 100).astype(np.intp)
+    colors = PALETTE_HEX[percent]
+
+    text = Text()
+    row_length = columns * 2
+    for first in range(0, len(colors), row_length):
+        row = colors[first:first + row_length]
+        # Even cores on top of the character, odd cores underneath
+        for top in range(0, len(row), 2):
+            if top + 1 < len(row):
+                text.append("▀", style=f"{row[top]} on {row[top + 1]}")
+            else:
+                text.append("▀", style=row[top])
+        text.append("\n")
+    text.rstrip()
+    return text
+
+
+class TkHeatmap:
+    def __init__(self, parent, history, width=240, height=128):
+        """
+            Show a CoreHistory as one image, time left to right and
+            one row per core
+            :param parent: Tk widget to put the image label in
+        """
+        self.history = history
+        self.cell_width = max(width // history.length, 1)
+        self.cell_height = max(height // history.core_count, 1)
+
+        self.image = tk.PhotoImage(
+            width=self.cell_width * history.length,
+            height=self.cell_height * history.core_count
+        )
+        self.label = tk.Label(parent, image=self.image)
+
+# ------------------------------ UPDATE ---------------------------------- #
+    def update(self):
+        """
+            Redraw the image from the history with one Tcl call
+        """
+        if len(self.history) == 0:
+            return
+        # Right align the newest sample while the history fills up
+        x = self.cell_width * (self.history.length - len(self.history))
+        self.image.put(
+            self.history.photo_rows(self.cell_width, self.cell_height),
+            to=(x, 0)
+        )
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+    Name: disk_io.py
+    Created: 10/18/26
+    Purpose: Read/write throughput, IOPS and service time of every disk,
+    and usage of every mount without a dead network mount stalling us
+"""
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+# pip install psutil
+import psutil
+from rate_engine import RateEngine
+
+# Throughput of one disk over the last tick
+# read_bytes and write_bytes are bytes per second
+# read_iops and write_iops are operations per second
+# service_ms is the average milliseconds each operation took
+# busy_percent is how much of the time the disk was working, Linux only
+DiskRates = namedtuple(
+    "DiskRates",
+    [
+        "device",
+        "read_bytes",
+        "write_bytes",
+        "read_iops",
+        "write_iops",
+        "service_ms",
+        "busy_percent",
+    ]
+)
+
+# Usage of one mount
+# usage is the psutil disk_usage namedtuple, None until the first probe
+# state is "ok", "waiting" for the first probe or when the probe has sat
+# in the queue longer than the timeout behind hung ones, "hung" when the
+# last probe has taken longer than the timeout or "error"
+MountUsage = namedtuple(
+    "MountUsage",
+    [
+        "mount",
+        "device",
+        "fstype",
+        "usage",
+        "state",
+    ]
+)
+
+# Devices that aren't disks
+SKIP_DEVICES = ("loop", "ram", "zram")
+# Whole disks on Linux, partitions are counted again inside their disk
+BLOCK_ROOT = "/sys/block"
+# Network file systems disk_partitions(all=False) leaves out
+NETWORK_FILESYSTEMS = {
+    "nfs", "nfs4", "cifs", "smbfs", "smb3", "9p", "fuse.sshfs", "afs"}
+# Seconds between rereading the mount table
+PARTITIONS_SECONDS = 30
+
+
+class DiskIO:
+    def __init__(self, rate_engine=None, block_root=BLOCK_ROOT):
+        """
+            Turn disk_io_counters(perdisk=True) into rates per disk
+            :param rate_engine: RateEngine to share with other counters
+            :param block_root: Folder listing the whole disks
+        """
+        self.rate_engine = rate_engine if rate_engine is not None \
+            else RateEngine()
+        self.block_root = block_root
+        # {device: True if it is a whole disk to show}
+        self.devices = {}
+
+# ------------------------------ UPDATE ---------------------------------- #
+    def update(self, perdisk, timestamp=None):
+        """
+            :param perdisk: disk_io_counters(perdisk=True) from a snapshot
+            :param timestamp: time.monotonic_ns() of the snapshot
+            :returns: DiskRates of every disk sorted by device
+            :rtype: list
+        """
+        disks = []
+        for device in sorted(perdisk):
+            show = self.devices.get(device)
+            if show is None:
+                show = self.devices[device] = self.is_disk(device)
+            if not show:
+                continue
+
+            rates = self.rate_engine.update_counters(
+                f"disk.{device}", perdisk[device], timestamp)
+
+            # Milliseconds spent per second divided by operations per
+            # second is the milliseconds spent per operation
+            operations = rates["read_count"] + rates["write_count"]
+            service_ms = 0.0
+            if operations > 0:
+                service_ms = (rates["read_time"] + rates["write_time"]) \
+                    / operations
+
+            disks.append(DiskRates(
+                device=device,
+                read_bytes=rates["read_bytes"],
+                write_bytes=rates["write_bytes"],
+                read_iops=rates["read_count"],
+                write_iops=rates["write_count"],
+                service_ms=service_ms,
+                # Milliseconds busy per second, 1000 is 100 %
+                busy_percent=min(rates.get("busy_time", 0.0) / 10, 100.0)
+            ))
+        return disks
+
+# ------------------------------ IS DISK --------------------------------- #
+    def is_disk(self, device):
+        """
+            Decide once per device if it is a whole disk worth showing
+            :rtype: bool
+        """
+        if device.startswith(SKIP_DEVICES):
+            return False
+        # Without a list of whole disks, show everything
+        if not os.path.isdir(self.block_root):
+            return True
+        return os.path.exists(os.path.join(self.block_root, device))
+
+
+class MountProber:
+    def __init__(self, timeout=2.0, workers=4, provider=psutil):
+        """
+            Read the usage of every mount on worker threads, so a
+            hung mount only ever ties up one worker
+            :param timeout: Seconds before a probe counts as hung
+            :param workers: Number of probe threads
+            :param provider: Module with the psutil functions we call
+        """
+        self.timeout = timeout
+        self.provider = provider
+
+        # {mount: [monotonic time it was queued, time a worker started it
+        # or None while still queued]} of probes not finished yet
+        self.pending = {}
+        # {mount: (usage or None, state)} from the last finished probe
+        self.results = {}
+        self.lock = threading.Lock()
+
+        self._partitions = []
+        self._partitions_time = None
+
+        # Daemon threads, a statvfs stuck in the kernel can't be
+        # interrupted and must not keep the program from exiting
+        self.queue = queue.Queue()
+        for i in range(workers):
+            threading.Thread(target=self.work, daemon=True).start()
+
+# ------------------------------- WORK ----------------------------------- #
+    def work(self):
+        """
+            Worker thread, read the usage of one mount at a time
+        """
+        while True:
+            mount = self.queue.get()
+            with self.lock:
+                self.pending[mount][1] = time.monotonic()
+            try:
+                result = (self.provider.disk_usage(mount), "ok")
+            except OSError:
+                result = (None, "error")
+            with self.lock:
+                self.results[mount] = result
+                del self.pending[mount]
+
+# ----------------------------- PARTITIONS ------------------------------- #
+    def partitions(self):
+        """
+            Local disks plus network mounts, without the pseudo file
+            systems like proc and tmpfs, reread every PARTITIONS_SECONDS
+            :rtype: list
+        """
+        now = time.monotonic()
+        if self._partitions_time is not None and \
+                now - self._partitions_time < PARTITIONS_SECONDS:
+            return self._partitions
+        self._partitions_time = now
+
+        partitions = self.provider.disk_partitions(all=False) + [
+            partition for partition in self.provider.disk_partitions(all=True)
+            if partition.fstype in NETWORK_FILESYSTEMS
+        ]
+        # Stacked mounts list a mount point more than once, keep the first
+        mounts = {}
+        for partition in partitions:
+            mounts.setdefault(partition.mountpoint, partition)
+        self._partitions = list(mounts.values())
+        return self._partitions
+
+# ------------------------------- PROBE ---------------------------------- #
+    def probe(self):
+        """
+            Start a probe of every mount that isn't still being probed
+            and return what is known so far, never waits
+            :returns: MountUsage of every mount
+            :rtype: list
+        """
+        now = time.monotonic()
+        mounts = []
+        with self.lock:
+            for partition in self.partitions():
+                mount = partition.mountpoint
+                usage, state = self.results.get(mount, (None, "waiting"))
+
+                if mount not in self.pending:
+                    self.pending[mount] = [now, None]
+                    self.queue.put(mount)
+                else:
+                    # Keep the last usage, but say it is out of date
+                    queued, started = self.pending[mount]
+                    if started is not None:
+                        if now - started > self.timeout:
+                            state = "hung"
+                    elif now - queued > self.timeout:
+                        # Every worker is stuck on hung mounts
+                        state = "waiting"
+
+                mounts.append(MountUsage(
+                    mount=mount,
+                    device=partition.device,
+                    fstype=partition.fstype,
+                    usage=usage,
+                    state=state
+                ))
+        return mounts
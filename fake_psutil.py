@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+    Name: fake_psutil.py
+    Created: 10/18/26
+    Purpose: Stand-in for the psutil functions the monitors call, for a
+    made-up host of any size whose load follows a script or a recording
+
+    Pass the module, or a FakeSystem, anywhere a provider is taken:
+        Sampler(provider=fake_psutil)
+        ProcessTable(provider=FakeSystem(cores=256, processes=10_000))
+        python benchmark_suite.py --provider fake_psutil
+
+    Values are made a block of samples at a time with NumPy, and every
+    cpu_percent() call moves to the next sample the way a real host
+    moves on between two ticks. The same seed always gives the same
+    values
+
+    Example: python fake_psutil.py --cores 256 --processes 10000 --nics 64
+"""
+import argparse
+import time
+from collections import namedtuple
+from contextlib import nullcontext
+# pip install numpy psutil
+import numpy as np
+# The monitors catch psutil's own exceptions
+from psutil import Error, NoSuchProcess
+from metrics_file import MetricsReader, Record
+
+# Samples made at once
+BLOCK = 4096
+GB = 1024 ** 3
+
+# Every psutil function a provider needs, the module level functions
+# of this module are these methods of a FakeSystem
+FUNCTIONS = (
+    "cpu_percent", "cpu_times_percent", "cpu_count", "cpu_freq",
+    "cpu_stats", "virtual_memory", "swap_memory", "net_io_counters",
+    "net_if_stats", "disk_io_counters", "disk_usage", "disk_partitions",
+    "boot_time", "pids", "Process",
+)
+
+# Same fields as psutil's own results on Linux
+scputimes = namedtuple(
+    "scputimes", ["user", "nice", "system", "idle", "iowait", "irq",
+                  "softirq", "steal", "guest", "guest_nice"])
+scpufreq = namedtuple("scpufreq", ["current", "min", "max"])
+scpustats = namedtuple(
+    "scpustats", ["ctx_switches", "interrupts", "soft_interrupts", "syscalls"])
+svmem = namedtuple(
+    "svmem", ["total", "available", "percent", "used", "free", "active",
+              "inactive", "buffers", "cached", "shared", "slab"])
+sswap = namedtuple("sswap", ["total", "used", "free", "percent", "sin", "sout"])
+snetio = namedtuple(
+    "snetio", ["bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+               "errin", "errout", "dropin", "dropout"])
+snicstats = namedtuple("snicstats", ["isup", "duplex", "speed", "mtu", "flags"])
+sdiskio = namedtuple(
+    "sdiskio", ["read_count", "write_count", "read_bytes", "write_bytes",
+                "read_time", "write_time", "read_merged_count",
+                "write_merged_count", "busy_time"])
+sdiskusage = namedtuple("sdiskusage", ["total", "used", "free", "percent"])
+sdiskpart = namedtuple("sdiskpart", ["device", "mountpoint", "fstype", "opts"])
+pcputimes = namedtuple(
+    "pcputimes", ["user", "system", "children_user", "children_system",
+                  "iowait"])
+pmem = namedtuple(
+    "pmem", ["rss", "vms", "shared", "text", "lib", "data", "dirty"])
+
+# Fields every trace makes, percents are 0 - 100 and the rest are
+# bytes per second, the same as a metrics_file.Record
+TRACE_FIELDS = ("cpu_percent", "ram_percent", "swap_percent", "disk_percent",
+                "net_sent", "net_recv", "disk_read", "disk_write")
+
+
+class ScriptedTrace:
+    def __init__(self, cores, interval=1.0, seed=0, functions=None):
+        """
+            Made-up load, a slow wave with noise on every core
+            :param cores: Number of cores to make percents for
+            :param interval: Seconds between samples
+            :param functions: {field: function(seconds) -> values} to
+            script any of TRACE_FIELDS, seconds is an array of the
+            sample times since the start
+        """
+        self.cores = cores
+        self.interval = interval
+        self.seed = seed
+        self.functions = functions or {}
+
+        # How far every core is from the average, a wave that peaks at
+        # a different time on each core plus noise, made once and
+        # written twice so any BLOCK samples of it are one slice
+        rng = np.random.default_rng(seed)
+        phases = rng.uniform(0, 2 * np.pi, cores)
+        seconds = np.arange(BLOCK)[:, None] * interval
+        pattern = 15 * np.sin(2 * np.pi * seconds / 60 + phases) \
+            + rng.normal(0, 5, (BLOCK, cores))
+        self.pattern = np.concatenate((pattern, pattern))
+
+    def block(self, start, count):
+        """
+            :returns: {field: array} of samples start to start + count,
+            with cpu_percpu as samples x cores
+            :rtype: dict
+        """
+        if count > BLOCK:
+            blocks = [self.block(first, min(BLOCK, start + count - first))
+                      for first in range(start, start + count, BLOCK)]
+            return {field: np.concatenate([block[field] for block in blocks])
+                    for field in blocks[0]}
+
+        # Seeded by block so a sample is the same however it is reached
+        rng = np.random.default_rng([self.seed, start])
+        seconds = (start + np.arange(count)) * self.interval
+        wave = np.sin(2 * np.pi * seconds / 300)
+
+        values = {
+            "cpu_percent": 30 + 20 * wave,
+            "ram_percent": 50 + 10 * np.sin(2 * np.pi * seconds / 3600),
+            "swap_percent": np.full(count, 5.0),
+            "disk_percent": np.full(count, 60.0),
+            "net_sent": rng.exponential(100_000, count),
+            "net_recv": rng.exponential(500_000, count),
+            "disk_read": rng.exponential(1_000_000, count),
+            "disk_write": rng.exponential(500_000, count),
+        }
+        for field, function in self.functions.items():
+            values[field] = np.broadcast_to(
+                np.asarray(function(seconds), dtype=float), count)
+
+        offset = start % BLOCK
+        percpu = values["cpu_percent"][:, None] \
+            + self.pattern[offset:offset + count]
+        values["cpu_percpu"] = np.clip(percpu, 0, 100, out=percpu)
+        for field in ("cpu_percent", "ram_percent", "swap_percent",
+                      "disk_percent"):
+            values[field] = np.clip(values[field], 0, 100)
+        return values
+
+
+class RecordedTrace:
+    def __init__(self, path, cores=None):
+        """
+            Play back a recording from metrics_recorder.py, over and
+            over once it ends
+            :param path: Segment file or folder of them
+            :param cores: Number of cores to make percents for, the
+            recorded cores are repeated to fill them
+        """
+        reader = MetricsReader(path)
+        try:
+            records = [segment.read(i) for segment in reader.segments
+                       for i in range(segment.count)]
+        finally:
+            reader.close()
+        self.cores = cores if cores is not None else reader.core_count
+        self.interval = (records[-1].timestamp - records[0].timestamp) \
+            / max(len(records) - 1, 1) or 1.0
+
+        self.values = {
+            field: np.array([getattr(record, field) for record in records],
+                            dtype=float)
+            for field in TRACE_FIELDS
+        }
+        percpu = np.array([record.cpu_percpu for record in records],
+                          dtype=float)
+        repeats = -(-self.cores // percpu.shape[1])
+        self.values["cpu_percpu"] = np.tile(percpu, repeats)[:, :self.cores]
+
+    def block(self, start, count):
+        rows = (start + np.arange(count)) % len(self.values["cpu_percent"])
+        return {field: values[rows] for field, values in self.values.items()}
+
+
+class FakeSystem:
+    def __init__(self, cores=8, processes=200, nics=4, disks=2,
+                 mounts=("/",), trace=None, interval=1.0, ram_total=16 * GB,
+                 swap_total=4 * GB, disk_total=512 * GB, seed=0):
+        """
+            :param cores: Logical cores, half of them physical, a
+            trace's own cores when one is given
+            :param processes: Number of processes pids() lists
+            :param nics: Interfaces, named eth0, eth1, ...
+            :param disks: Disks, named sda, sdb, ...
+            :param mounts: Mount points disk_partitions() lists
+            :param trace: ScriptedTrace or RecordedTrace, a scripted
+            one when None
+            :param interval: Seconds one sample stands for, a trace's
+            own interval when one is given
+        """
+        self.trace = trace if trace is not None \
+            else ScriptedTrace(cores, interval, seed)
+        self.cores = self.trace.cores
+        self.interval = self.trace.interval
+        self.ram_total = ram_total
+        self.swap_total = swap_total
+        self.disk_total = disk_total
+        self.mounts = tuple(mounts)
+        self.start_time = time.time()
+
+        rng = np.random.default_rng(seed)
+        self.nic_names = [f"eth{i}" for i in range(nics)]
+        self.disk_names = [self.disk_name(i) for i in range(disks)]
+        # Share of the traffic each interface and disk carries
+        self.nic_shares = rng.dirichlet(np.ones(nics)) if nics else []
+        self.disk_shares = rng.dirichlet(np.ones(disks)) if disks else []
+
+        # Most processes sleep, a few use most of the CPU
+        self._pids = list(range(1, processes + 1))
+        busy = rng.random(processes) < 0.1
+        self.process_shares = np.where(
+            busy, rng.exponential(0.05, processes), 0.0).tolist()
+        self.process_rss = (rng.lognormal(17, 1.5, processes)
+                            .astype(np.int64).tolist())
+
+        # Totals of the counters up to the start of the current block
+        self.totals = dict.fromkeys(
+            ("net_sent", "net_recv", "disk_read", "disk_write"), 0.0)
+        self.index = 0
+        self.values = None
+        self.load(0)
+
+    @staticmethod
+    def disk_name(i):
+        name = ""
+        i += 1
+        while i:
+            i, letter = divmod(i - 1, 26)
+            name = chr(ord("a") + letter) + name
+        return "sd" + name
+
+# ------------------------------- BLOCK ---------------------------------- #
+    def load(self, start):
+        """
+            Make the block of samples that starts at start
+        """
+        if self.values is not None:
+            # Carry the counters on from the end of the last block
+            for field in self.totals:
+                self.totals[field] = float(self.counters[field][-1])
+        self.block_start = start
+        self.values = self.trace.block(start, BLOCK)
+        # Counters are the running total of the rates
+        self.counters = {
+            field: self.totals[field]
+            + np.cumsum(self.values[field] * self.interval)
+            for field in self.totals
+        }
+        # Plain floats are much faster to read one at a time
+        self.rows = {field: values.tolist()
+                     for field, values in self.values.items()
+                     if field != "cpu_percpu"}
+        self.counter_rows = {field: values.tolist()
+                             for field, values in self.counters.items()}
+
+    def advance(self, steps=1):
+        """
+            Move on to a later sample
+        """
+        self.index += steps
+        if self.index - self.block_start >= BLOCK:
+            self.load(self.index - (self.index - self.block_start) % BLOCK)
+
+    def row(self):
+        return self.index - self.block_start
+
+    def samples(self, count):
+        """
+            The next count samples at once, for filling storage or charts
+            much faster than one call at a time
+            :returns: {field: array} with cpu_percpu as samples x cores
+            :rtype: dict
+        """
+        values = self.trace.block(self.index, count)
+        self.advance(count)
+        return values
+
+    def records(self, count):
+        """
+            The next count samples as records for a MetricsWriter
+            :rtype: generator
+        """
+        start = self.index
+        values = self.samples(count)
+        timestamps = (self.start_time
+                      + (start + np.arange(count)) * self.interval).tolist()
+        columns = [values[field].tolist() for field in TRACE_FIELDS]
+        percpu = np.rint(values["cpu_percpu"]).astype(np.uint8).tolist()
+        for i, timestamp in enumerate(timestamps):
+            yield Record(timestamp, *(column[i] for column in columns),
+                         tuple(percpu[i]))
+
+# -------------------------------- CPU ----------------------------------- #
+    def cpu_percent(self, interval=None, percpu=False):
+        self.advance()
+        if percpu:
+            return self.values["cpu_percpu"][self.row()].round(1).tolist()
+        return round(self.rows["cpu_percent"][self.row()], 1)
+
+    def cpu_times_percent(self, interval=None, percpu=False):
+        if not percpu:
+            busy = self.rows["cpu_percent"][self.row()]
+            return scputimes(0.7 * busy, 0.0, 0.3 * busy, 100.0 - busy,
+                             0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        return [
+            scputimes(0.7 * busy, 0.0, 0.3 * busy, 100.0 - busy,
+                      0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+            for busy in self.values["cpu_percpu"][self.row()].tolist()
+        ]
+
+    def cpu_count(self, logical=True):
+        return self.cores if logical else max(self.cores // 2, 1)
+
+    def cpu_freq(self, percpu=False):
+        busy = self.rows["cpu_percent"][self.row()]
+        return scpufreq(1200.0 + 24.0 * busy, 800.0, 4000.0)
+
+    def cpu_stats(self):
+        ticks = self.index * self.cores
+        return scpustats(ticks * 1000, ticks * 500, ticks * 300, 0)
+
+# ------------------------------- MEMORY --------------------------------- #
+    def virtual_memory(self):
+        percent = self.rows["ram_percent"][self.row()]
+        used = int(self.ram_total * percent / 100)
+        available = self.ram_total - used
+        return svmem(self.ram_total, available, round(percent, 1), used,
+                     available // 2, used, available // 2, 0,
+                     available // 2, 0, 0)
+
+    def swap_memory(self):
+        percent = self.rows["swap_percent"][self.row()]
+        used = int(self.swap_total * percent / 100)
+        return sswap(self.swap_total, used, self.swap_total - used,
+                     round(percent, 1), 0, 0)
+
+# ------------------------------ NETWORK --------------------------------- #
+    def net_io_counters(self, pernic=False, nowrap=True):
+        i = self.row()
+        sent = self.counter_rows["net_sent"][i]
+        recv = self.counter_rows["net_recv"][i]
+        if not pernic:
+            return self.netio(sent, recv)
+        return {name: self.netio(sent * share, recv * share)
+                for name, share in zip(self.nic_names, self.nic_shares)}
+
+    @staticmethod
+    def netio(sent, recv):
+        # About one packet per kilobyte
+        return snetio(int(sent), int(recv), int(sent) // 1000,
+                      int(recv) // 1000, 0, 0, 0, 0)
+
+    def net_if_stats(self):
+        # duplex 2 is psutil.NIC_DUPLEX_FULL
+        return {name: snicstats(True, 2, 10_000, 1500, "up,running")
+                for name in self.nic_names}
+
+# ------------------------------- DISKS ---------------------------------- #
+    def disk_io_counters(self, perdisk=False, nowrap=True):
+        i = self.row()
+        read = self.counter_rows["disk_read"][i]
+        write = self.counter_rows["disk_write"][i]
+        if not perdisk:
+            return self.diskio(read, write)
+        return {name: self.diskio(read * share, write * share)
+                for name, share in zip(self.disk_names, self.disk_shares)}
+
+    @staticmethod
+    def diskio(read, write):
+        # 64 KB per operation, a millisecond each
+        reads = int(read) // 65536
+        writes = int(write) // 65536
+        return sdiskio(reads, writes, int(read), int(write), reads, writes,
+                       0, 0, reads + writes)
+
+    def disk_usage(self, path):
+        percent = self.rows["disk_percent"][self.row()]
+        used = int(self.disk_total * percent / 100)
+        return sdiskusage(self.disk_total, used, self.disk_total - used,
+                          round(percent, 1))
+
+    def disk_partitions(self, all=False):
+        return [
+            sdiskpart(f"/dev/{self.disk_names[i % len(self.disk_names)]}"
+                      if self.disk_names else "none", mount, "ext4", "rw")
+            for i, mount in enumerate(self.mounts)
+        ]
+
+# ----------------------------- PROCESSES -------------------------------- #
+    def boot_time(self):
+        return self.start_time - 86400
+
+    def pids(self):
+        return self._pids
+
+    def Process(self, pid=None):
+        if pid is None or not 1 <= pid <= len(self._pids):
+            raise NoSuchProcess(pid)
+        return FakeProcess(self, pid)
+
+
+class FakeProcess:
+    def __init__(self, system, pid):
+        self.system = system
+        self.pid = pid
+
+    def oneshot(self):
+        return nullcontext()
+
+    def cpu_times(self):
+        # Share of one core since the fake boot
+        seconds = self.system.process_shares[self.pid - 1] \
+            * self.system.index * self.system.interval
+        return pcputimes(0.7 * seconds, 0.3 * seconds, 0.0, 0.0, 0.0)
+
+    def memory_info(self):
+        rss = self.system.process_rss[self.pid - 1]
+        return pmem(rss, 2 * rss, 0, 0, 0, 0, 0)
+
+    def create_time(self):
+        return self.system.boot_time() + self.pid
+
+    def name(self):
+        return f"process-{self.pid}"
+
+    def is_running(self):
+        return True
+
+
+# ---------------------------- MODULE LEVEL ------------------------------ #
+def configure(**kwargs):
+    """
+        Pick the host the module level functions describe, takes the
+        same arguments as FakeSystem
+        :rtype: FakeSystem
+    """
+    global system
+    system = FakeSystem(**kwargs)
+    globals().update(
+        {name: getattr(system, name) for name in FUNCTIONS})
+    return system
+
+
+system = None
+configure()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure how fast the fake host makes samples")
+    parser.add_argument("--cores", type=int, default=256)
+    parser.add_argument("--processes", type=int, default=10_000)
+    parser.add_argument("--nics", type=int, default=64)
+    parser.add_argument("--disks", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=2.0,
+                        help="seconds to run each measurement for")
+    args = parser.parse_args()
+
+    from system_sampler import Sampler
+    from process_table import ProcessTable
+
+    fake = FakeSystem(args.cores, args.processes, args.nics, args.disks)
+
+    def rate(function, count):
+        done = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.seconds:
+            function()
+            done += count
+        return done / (time.perf_counter() - start)
+
+    print(f"{args.cores} cores, {args.processes} processes, {args.nics} "
+          f"interfaces, {args.disks} disks")
+    print(f"samples():        {rate(lambda: fake.samples(BLOCK), BLOCK):15,.0f}"
+          " samples/s")
+    print(f"records():        "
+          f"{rate(lambda: list(fake.records(BLOCK)), BLOCK):15,.0f} records/s")
+    scalar = Sampler(provider=fake)
+    print(f"Sampler:          {rate(scalar.sample, 1):15,.0f} snapshots/s")
+    full = Sampler(percpu=True, perdisk=True, pernic=True, diskio=True,
+                   cpustats=True, provider=fake)
+    print(f"Sampler, per core: {rate(full.sample, 1):14,.0f} snapshots/s")
+    table = ProcessTable(provider=fake)
+    print(f"ProcessTable:     {rate(table.update, 1):15,.1f} updates/s")
+
+
+if __name__ == "__main__":
+    main()
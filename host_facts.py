@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+    Name: host_facts.py
+    Created: 10/18/26
+    Purpose: Facts about the host that don't change while a view runs,
+    read once at startup instead of every tick
+
+    Physical cores come from parsing /proc/cpuinfo and sysfs, and
+    platform.processor() starts a uname process on Linux, so neither
+    belongs in an update loop
+"""
+import platform
+import time
+from dataclasses import dataclass
+# pip install psutil
+import psutil
+
+
+@dataclass(frozen=True)
+class HostFacts:
+    system: str
+    os_version: str
+    processor: str
+    architecture: str
+    host_name: str
+    # None when the OS won't say
+    cpu_count: int
+    logical_cpu_count: int
+    # Bytes
+    ram_total: int
+    # Epoch seconds
+    boot_time: float
+
+
+def read_host_facts(provider=psutil):
+    """
+        Read every fact now, use HostFactsCache to read them once
+        :param provider: psutil or a module with the same functions
+        :rtype: HostFacts
+    """
+    return HostFacts(
+        system=platform.system(),
+        os_version=platform.platform(),
+        processor=platform.processor(),
+        architecture=platform.architecture()[0],
+        host_name=platform.node(),
+        cpu_count=provider.cpu_count(logical=False),
+        logical_cpu_count=provider.cpu_count() or 1,
+        ram_total=provider.virtual_memory().total,
+        boot_time=provider.boot_time()
+    )
+
+
+class HostFactsCache:
+    def __init__(self, ttl=None, provider=psutil):
+        """
+            :param ttl: Seconds before the facts are read again, for
+            hosts that hot-plug CPUs or memory, None to read them once
+            :param provider: psutil or a module with the same functions
+        """
+        self.ttl = ttl
+        self.provider = provider
+        self.facts = None
+        self.read_time = None
+
+    def get(self):
+        """
+            :returns: The facts, read again if they are older than ttl
+            :rtype: HostFacts
+        """
+        now = time.monotonic()
+        if self.facts is None or (
+                self.ttl is not None and now - self.read_time >= self.ttl):
+            self.facts = read_host_facts(self.provider)
+            self.read_time = now
+        return self.facts
+
+
+# Shared by every view in the process
+_cache = HostFactsCache()
+
+
+def host_facts():
+    """
+        The facts of this host, read the first time they are asked for
+        :rtype: HostFacts
+    """
+    return _cache.get()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+    Name: hub_benchmark.py
+    Created: 10/18/26
+    Purpose: Start metrics_hub.py headless, pretend to be many hosts
+    sending to it once a second, and report how much of one core the
+    hub used
+
+    Example: python hub_benchmark.py --hosts 1000 --seconds 10
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+# pip install numpy psutil
+import numpy as np
+import psutil
+from hub_protocol import MAGIC
+from metrics_hub import PACKET_DTYPE
+
+# Sends are spread over this many slices of each second, like real
+# hosts that don't all send at the same moment
+SLICES = 20
+
+
+def make_packets(hosts):
+    """
+        One packet per simulated host with random values
+        :rtype: numpy.ndarray
+    """
+    packets = np.zeros(hosts, dtype=PACKET_DTYPE)
+    packets["magic"] = MAGIC
+    packets["host"] = [f"host-{i:05d}".encode() for i in range(hosts)]
+    packets["ram_total"] = 16 * 1024 ** 3
+    packets["core_count"] = 8
+    return packets
+
+
+def randomize(packets, rng):
+    """
+        New values for every host, done for the whole fleet at once
+    """
+    count = len(packets)
+    packets["timestamp"] = time.time()
+    packets["cpu_percent"] = rng.gamma(2.0, 10.0, count).clip(0, 100)
+    packets["ram_percent"] = rng.normal(55, 15, count).clip(0, 100)
+    packets["swap_percent"] = rng.uniform(0, 10, count)
+    packets["disk_percent"] = rng.uniform(20, 90, count)
+    packets["net_sent"] = rng.exponential(50_000, count)
+    packets["net_recv"] = rng.exponential(200_000, count)
+
+
+def open_senders(hosts, transport, address):
+    """
+        One socket per simulated host for TCP, one shared socket for UDP
+        :rtype: list
+    """
+    if transport == "udp":
+        return [socket.socket(socket.AF_INET, socket.SOCK_DGRAM)]
+    return [socket.create_connection(address) for i in range(hosts)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the CPU metrics_hub.py needs for a fleet")
+    parser.add_argument("--hosts", type=int, default=1000,
+                        help="number of simulated hosts")
+    parser.add_argument("--seconds", type=int, default=10,
+                        help="seconds to send for")
+    parser.add_argument("--tcp", action="store_true",
+                        help="send over TCP instead of UDP")
+    parser.add_argument("--port", type=int, default=19102,
+                        help="port to run the hub on")
+    args = parser.parse_args()
+
+    transport = "tcp" if args.tcp else "udp"
+    address = ("127.0.0.1", args.port)
+    hub_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "metrics_hub.py")
+    hub = subprocess.Popen(
+        [sys.executable, hub_path, "--headless", "--port", str(args.port)],
+        stderr=subprocess.PIPE, text=True)
+
+    try:
+        # Wait for the hub to listen
+        for attempt in range(50):
+            try:
+                socket.create_connection(address, timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        rng = np.random.default_rng(1)
+        packets = make_packets(args.hosts)
+        senders = open_senders(args.hosts, transport, address)
+        slices = np.array_split(np.arange(args.hosts), SLICES)
+
+        process = psutil.Process(hub.pid)
+        start_cpu = process.cpu_times()
+        start = time.monotonic()
+        deadline = start
+        for second in range(args.seconds):
+            randomize(packets, rng)
+            for hosts in slices:
+                for i in hosts:
+                    data = packets[i].tobytes()
+                    if transport == "udp":
+                        senders[0].sendto(data, address)
+                    else:
+                        senders[i].sendall(data)
+                deadline += 1 / SLICES
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+        # Let the last batch be decoded
+        time.sleep(0.5)
+        elapsed = time.monotonic() - start
+        end_cpu = process.cpu_times()
+
+        for sender in senders:
+            sender.close()
+    finally:
+        hub.send_signal(signal.SIGINT)
+        report = hub.communicate(timeout=10)[1].strip()
+
+    cpu = (end_cpu.user + end_cpu.system) - \
+        (start_cpu.user + start_cpu.system)
+    print(f"{args.hosts} hosts x 1 Hz over {transport} for "
+          f"{args.seconds} s")
+    print(f"hub: {report}")
+    print(f"hub CPU: {cpu:.2f} s in {elapsed:.1f} s, "
+          f"{cpu / elapsed * 100:.1f} % of one core")
+
+
+if __name__ == "__main__":
+    main()
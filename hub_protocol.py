@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+    Name: hub_protocol.py
+    Created: 10/18/26
+    Purpose: Fixed size binary snapshot a host sends to metrics_hub.py,
+    small enough that a thousand of them fit in one read
+"""
+import struct
+
+MAGIC = b"SIH1"
+# Hub port for both UDP and TCP
+PORT = 9102
+# Longest host name sent, longer names are cut off
+HOST_LENGTH = 32
+
+# Every field of a packet in order, with its little endian struct code
+# Percents are 0 - 100, net_sent and net_recv are bytes per second
+FIELDS = [
+    ("magic", "4s"),
+    ("host", f"{HOST_LENGTH}s"),
+    ("timestamp", "d"),
+    ("cpu_percent", "f"),
+    ("ram_percent", "f"),
+    ("swap_percent", "f"),
+    ("disk_percent", "f"),
+    ("net_sent", "f"),
+    ("net_recv", "f"),
+    ("ram_total", "Q"),
+    ("core_count", "H"),
+]
+
+# Packed, no padding, so NumPy can read the same bytes with a
+# structured dtype built from FIELDS
+PACKET = struct.Struct("<" + "".join(code for name, code in FIELDS))
+
+
+def encode(host, timestamp, cpu_percent, ram_percent, swap_percent,
+           disk_percent, net_sent, net_recv, ram_total, core_count):
+    """
+        Pack one snapshot for the hub
+        :param host: Host name, str
+        :param timestamp: Epoch seconds
+        :rtype: bytes
+    """
+    return PACKET.pack(
+        MAGIC,
+        host.encode("utf-8")[:HOST_LENGTH],
+        timestamp,
+        cpu_percent,
+        ram_percent,
+        swap_percent,
+        disk_percent,
+        net_sent,
+        net_recv,
+        ram_total,
+        core_count
+    )
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+    Name: launcher.py
+    Created: 10/18/26
+    Purpose: Open any number of views on one collector, so a second
+    view only costs its drawing and never samples the system again
+
+    Every Tk view gets its own window and subscribes to the snapshots
+    of one Collector, views written for CollectorEngine get the same
+    snapshots as readings. Processes and sensors are read at most once
+    per snapshot, however many views show them
+
+    Example: python launcher.py labels bars chart
+             python launcher.py circles table --interval 2
+"""
+import argparse
+import importlib
+import sys
+import tkinter as tk
+from collections import namedtuple
+from collector import Collector
+from collector_engine import Reading
+from proc_sampler import make_sampler
+
+# Processes in the shared process list
+PROCESS_COUNT = 10
+
+# module is imported only when the view is opened, tk views are built
+# in their own window and console views print to this terminal
+View = namedtuple("View", "module kind")
+VIEWS = {
+    # Label grid
+    "labels": View("system_info_gui", "tk"),
+    "theme": View("system_info_gui_theme", "tk"),
+    # Progress bars
+    "bars": View("system_info_gui_gauges_2", "tk"),
+    "gauges": View("system_info_gui_gauges_5", "tk"),
+    # Circular gauges
+    "circles": View("system_info_gui_gauges_3", "tk"),
+    "dials": View("system_info_gui_gauges_4", "tk"),
+    "chart": View("system_info_gui_chart_1", "tk"),
+    # Rich panel and table
+    "rich": View("psutil_sys_info_rich", "console"),
+    "table": View("psutil_sys_info_table", "console"),
+}
+
+
+def group_readings(snapshot):
+    """
+        The readings a CollectorEngine would have taken, from one snapshot
+        :returns: {group name: Reading}
+        :rtype: dict
+    """
+    timestamp = snapshot.timestamp
+    return {
+        "cpu": Reading("cpu", timestamp, snapshot.cpu_percent, 0.0, 0.0),
+        "mem": Reading("mem", timestamp, snapshot.virtual_memory, 0.0, 0.0),
+        "net": Reading("net", timestamp, snapshot.net_io, 0.0, 0.0),
+        "disk": Reading("disk", timestamp, snapshot.disk_usage, 0.0, 0.0),
+    }
+
+
+class SharedCollector:
+    def __init__(self, interval=1.0):
+        """
+            One collector with everything any view shows, every core,
+            disk and interface
+            :param interval: Seconds between snapshots
+        """
+        self.collector = Collector(
+            make_sampler(percpu=True, perdisk=True, pernic=True), interval)
+        # Functions called with every snapshot on the main thread
+        self.subscribers = []
+        self.snapshots = 0
+
+        # Made the first time a view asks, with the snapshot they were
+        # last read for
+        self.process_table = None
+        self.process_rows = (None, None)
+        self.sensor_source = None
+        self.sensor_readings = (None, None)
+
+# ----------------------------- SUBSCRIBE -------------------------------- #
+    def subscribe(self, callback, window=None):
+        """
+            Call callback(snapshot) with every snapshot
+            :param window: Tk window of the view, it stops getting
+            snapshots once the window is closed
+        """
+        self.subscribers.append(callback)
+        if window is None:
+            return
+
+        def forget(event):
+            # <Destroy> also comes for every widget in the window
+            if str(event.widget) == str(window) and \
+                    callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+        window.bind("<Destroy>", forget, add="+")
+
+    def subscribe_groups(self, callbacks, window=None):
+        """
+            Feed a view written for CollectorEngine.schedule()
+            :param callbacks: {group name: function(reading)}
+        """
+        def show(snapshot):
+            for name, reading in group_readings(snapshot).items():
+                if name in callbacks:
+                    callbacks[name](reading)
+
+        self.subscribe(show, window)
+
+# ----------------------------- PUBLISH ---------------------------------- #
+    def publish(self, snapshot):
+        """
+            Hand a snapshot to every view, on the main thread
+        """
+        self.snapshots += 1
+        # A view may close while it is being shown
+        for callback in list(self.subscribers):
+            callback(snapshot)
+
+# ------------------------ PROCESSES AND SENSORS ------------------------- #
+    def processes(self, snapshot):
+        """
+            :returns: The busiest processes, listed once per snapshot
+            :rtype: list
+        """
+        if self.process_rows[0] != snapshot.timestamp:
+            if self.process_table is None:
+                from process_table import ProcessTable
+                self.process_table = ProcessTable(PROCESS_COUNT)
+            rows = self.process_table.update(
+                snapshot.timestamp, snapshot.virtual_memory.total)
+            self.process_rows = (snapshot.timestamp, rows)
+        return self.process_rows[1]
+
+    def sensors(self, snapshot):
+        """
+            :returns: Every sensor, read once per snapshot
+            :rtype: SensorReadings
+        """
+        if self.sensor_readings[0] != snapshot.timestamp:
+            if self.sensor_source is None:
+                from sensors import Sensors
+                self.sensor_source = Sensors()
+            self.sensor_readings = (
+                snapshot.timestamp, self.sensor_source.read())
+        return self.sensor_readings[1]
+
+# ------------------------------- RUN ------------------------------------ #
+    def start(self, root=None):
+        """
+            Start sampling, views are shown from root's Tk loop, or
+            from run() when there is no Tk view
+        """
+        self.collector.start()
+        if root is not None:
+            self.collector.schedule(root, self.publish)
+
+    def run(self):
+        """
+            Show every snapshot from this thread until interrupted, for
+            console views without a Tk loop
+        """
+        while True:
+            self.publish(self.collector.queue.get())
+
+    def stop(self):
+        self.collector.stop()
+
+
+def open_views(names, source):
+    """
+        Build every view on source, console views print to this terminal
+        :returns: Tk root, None when every view is a console view
+    """
+    root = None
+    for name in names:
+        view = VIEWS[name]
+        module = importlib.import_module(view.module)
+        if view.kind == "console":
+            module.SystemInfo(source=source)
+            continue
+
+        if root is None:
+            # Hidden, every view has a window of its own
+            root = tk.Tk()
+            root.withdraw()
+        window = tk.Toplevel(root)
+        if hasattr(module, "SystemMonitorApp"):
+            module.SystemMonitorApp(window, source=source)
+        elif hasattr(module, "App"):
+            module.App(window, source=source).start()
+        else:
+            module.SystemInfo(root=window, source=source)
+        # Quit with the last window
+        window.bind("<Destroy>", lambda event, window=window:
+                    quit_when_closed(root, window, event), add="+")
+    return root
+
+
+def quit_when_closed(root, window, event):
+    """
+        Close the hidden root once no view window is left
+    """
+    if str(event.widget) != str(window):
+        return
+    if not any(child.winfo_class() == "Toplevel" and child is not window
+               for child in root.winfo_children()):
+        root.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Open views that all share one collector")
+    parser.add_argument("views", nargs="+", choices=tuple(VIEWS),
+                        metavar="view", help="views to open: "
+                        + ", ".join(VIEWS))
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds between snapshots")
+    args = parser.parse_args()
+    console_views = [name for name in args.views
+                     if VIEWS[name].kind == "console"]
+    if len(console_views) > 1:
+        parser.error("only one console view fits in the terminal")
+
+    source = SharedCollector(args.interval)
+    root = open_views(args.views, source)
+    source.start(root)
+    try:
+        if root is not None:
+            root.mainloop()
+        else:
+            source.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.stop()
+        print(f"{source.snapshots} snapshots shared by {len(args.views)} "
+              "view(s)",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
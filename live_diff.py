@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+    Name: live_diff.py
+    Created: 10/18/26
+    Purpose: Flicker free rich display that only sends the characters
+    that changed since the last frame to the terminal
+"""
+# Windows: pip install rich
+# Linux: pip3 install rich
+from rich.cells import cell_len
+from rich.color import ColorSystem
+from rich.control import Control
+from rich.live import Live
+from rich.segment import Segment
+
+# Console.color_system names to the ColorSystem used to render styles
+COLOR_SYSTEMS = {
+    "standard": ColorSystem.STANDARD,
+    "256": ColorSystem.EIGHT_BIT,
+    "truecolor": ColorSystem.TRUECOLOR,
+    "windows": ColorSystem.WINDOWS,
+}
+
+
+class DiffLive:
+    def __init__(self, renderable, console):
+        """
+            Show a renderable full screen and repaint only what changed
+            :param renderable: Persistent renderable, change its contents
+            in place and call update() to show the changes
+            :param console: rich Console to draw on
+        """
+        self.renderable = renderable
+        self.console = console
+        # The whole screen is drawn by Live once, then only differences
+        self.live = Live(
+            renderable,
+            console=console,
+            screen=True,
+            auto_refresh=False,
+            redirect_stdout=False,
+            redirect_stderr=False
+        )
+        self.lines = []
+        self.size = None
+
+    def __enter__(self):
+        self.live.__enter__()
+        self.repaint()
+        return self
+
+    def __exit__(self, *args):
+        self.live.__exit__(*args)
+
+# ------------------------------ REPAINT --------------------------------- #
+    def repaint(self):
+        """
+            Let Live redraw the whole screen and remember what it drew
+        """
+        self.live.refresh()
+        self.size = self.console.size
+        self.lines = self.render()
+
+# ------------------------------ RENDER ---------------------------------- #
+    def render(self):
+        """
+            Render the screen to lines the same way Live does
+            :returns: One list of segments per screen line
+            :rtype: list
+        """
+        width, height = self.console.size
+        options = self.console.options.update_dimensions(width, height)
+        lines = self.console.render_lines(self.renderable, options, pad=True)
+        return Segment.set_shape(lines, width, height)
+
+# ------------------------------ REPLACE --------------------------------- #
+    def replace(self, renderable):
+        """
+            Show a new renderable, for when the old one can't be changed
+            in place, call update() to send the lines that differ
+        """
+        self.renderable = renderable
+        # Live repaints it after a resize
+        self.live.update(renderable)
+
+# ------------------------------ UPDATE ---------------------------------- #
+    def update(self):
+        """
+            Send only the changed part of every changed line
+        """
+        if not self.console.is_terminal:
+            # Nothing to position a cursor in, print the whole frame
+            self.console.print(self.renderable)
+            return
+
+        if self.console.size != self.size:
+            # The terminal was resized, every line moved
+            self.repaint()
+            return
+
+        lines = self.render()
+        output = []
+        for y, (old, new) in enumerate(zip(self.lines, lines)):
+            if old != new:
+                output.append(self.render_changes(y, old, new))
+        self.lines = lines
+
+        # Write straight to the terminal, printing through the console
+        # would make Live repaint the whole screen after our changes
+        if output:
+            self.console.file.write("".join(output))
+            self.console.file.flush()
+
+# --------------------------- RENDER CHANGES ----------------------------- #
+    def render_changes(self, y, old, new):
+        """
+            Move the cursor to the first changed cell on line y and
+            write up to the last changed cell
+            :returns: Terminal text with the escape codes to do that
+            :rtype: str
+        """
+        old_text = "".join(segment.text for segment in old)
+        new_text = "".join(segment.text for segment in new)
+
+        # Wide characters make text positions and cell positions differ,
+        # rewrite the whole line rather than work the cells out
+        if len(new_text) != cell_len(new_text) or len(old_text) != len(new_text):
+            start, end = 0, cell_len(new_text)
+        else:
+            start = 0
+            while start < len(new_text) and old_text[start] == new_text[start]:
+                start += 1
+            end = len(new_text)
+            while end > start and old_text[end - 1] == new_text[end - 1]:
+                end -= 1
+            if start == end:
+                # Same text, only a style changed, rewrite the line
+                start, end = 0, len(new_text)
+
+        changed = list(Segment.divide(new, [start, end]))[1]
+        color_system = COLOR_SYSTEMS.get(self.console.color_system)
+
+        output = [Control.move_to(start, y).segment.text]
+        for segment in changed:
+            if segment.style and color_system is not None:
+                output.append(segment.style.render(
+                    segment.text, color_system=color_system))
+            else:
+                output.append(segment.text)
+        return "".join(output)
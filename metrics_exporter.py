@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+    Name: metrics_exporter.py
+    Created: 10/18/26
+    Purpose: Serve the CPU, RAM, swap, disk and network metrics the
+    front ends show on /metrics for Prometheus to scrape
+
+    Every tick the collector's snapshot is rendered once to finished
+    HTTP responses, a scrape only writes those bytes and never samples
+
+    Example: python metrics_exporter.py --port 9101
+    curl http://localhost:9101/metrics
+"""
+import argparse
+import asyncio
+import gzip
+import sys
+from collector import Collector
+from host_facts import host_facts
+from system_sampler import Sampler
+from net_io import InterfaceFilter, DEFAULT_EXCLUDE
+
+# How often the event loop checks for a new snapshot in seconds
+POLL_SECONDS = 0.05
+# Seconds an idle keep-alive connection is kept open
+IDLE_SECONDS = 60
+# Longest request line or header line accepted
+MAX_LINE = 8192
+
+PROMETHEUS_TYPE = b"text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_TYPE = b"application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def response(body, content_type, encoding=None, status=b"200 OK"):
+    """
+        Build a whole HTTP/1.1 response with its headers
+        :rtype: bytes
+    """
+    headers = [
+        b"HTTP/1.1 " + status,
+        b"Content-Type: " + content_type,
+        b"Content-Length: " + str(len(body)).encode(),
+    ]
+    if encoding is not None:
+        headers.append(b"Content-Encoding: " + encoding)
+    return b"\r\n".join(headers) + b"\r\n\r\n" + body
+
+
+def label(name, value):
+    """
+        One label in braces, with the backslashes, quotes and newlines
+        a mount or interface name may hold escaped
+        :rtype: str
+    """
+    value = value.replace("\\", "\\\\").replace('"', '\\"').replace(
+        "\n", "\\n")
+    return f'{{{name}="{value}"}}'
+
+
+NOT_FOUND = response(b"Not found, try /metrics\n", b"text/plain",
+                     status=b"404 Not Found")
+NOT_ALLOWED = response(b"Only GET and HEAD\n", b"text/plain",
+                       status=b"405 Method Not Allowed")
+
+
+class MetricsExporter:
+    def __init__(self, interval=1.0, mounts=("/",), include=None,
+                 exclude=DEFAULT_EXCLUDE):
+        """
+            :param interval: Seconds between snapshots
+            :param mounts: Mount points to export disk usage for
+            :param include: Patterns of interfaces to export, None for all
+            :param exclude: Patterns of interfaces to leave out
+        """
+        self.collector = Collector(
+            Sampler(mounts=mounts, pernic=True, diskio=True, cpustats=True),
+            interval)
+        self.filter = InterfaceFilter(include, exclude)
+
+        # Core counts never change, read them once
+        facts = host_facts()
+        self.cpu_count = facts.cpu_count or 0
+        self.logical_cpu_count = facts.logical_cpu_count
+
+        # {(openmetrics, gzip): whole HTTP response}, replaced every tick
+        self.responses = {}
+        self.render(self.collector.sampler.sample())
+
+# ------------------------------ RENDER ---------------------------------- #
+    def render(self, snapshot):
+        """
+            Turn a snapshot into every response a scrape can ask for
+        """
+        virtual_memory = snapshot.virtual_memory
+        swap_memory = snapshot.swap_memory
+
+        families = [
+            ("sysinfo_cpu_count", "gauge", "Number of CPU cores", [
+                ('{type="physical"}', self.cpu_count),
+                ('{type="logical"}', self.logical_cpu_count)]),
+            ("sysinfo_cpu_usage_percent", "gauge", "CPU usage", [
+                ("", snapshot.cpu_percent)]),
+            ("sysinfo_ram_total_bytes", "gauge", "RAM total", [
+                ("", virtual_memory.total)]),
+            ("sysinfo_ram_usage_bytes", "gauge", "RAM usage", [
+                ("", virtual_memory.total - virtual_memory.available)]),
+            ("sysinfo_ram_usage_percent", "gauge", "RAM usage", [
+                ("", virtual_memory.percent)]),
+            ("sysinfo_swap_total_bytes", "gauge", "Swap total", [
+                ("", swap_memory.total)]),
+            ("sysinfo_swap_usage_bytes", "gauge", "Swap usage", [
+                ("", swap_memory.used)]),
+            ("sysinfo_swap_usage_percent", "gauge", "Swap usage", [
+                ("", swap_memory.percent)]),
+        ]
+
+        # cpu_freq() is None where the frequency can't be read
+        if snapshot.cpu_freq is not None:
+            families.append((
+                "sysinfo_cpu_frequency_mhz", "gauge", "CPU frequency", [
+                    ("", snapshot.cpu_freq.current)]))
+
+        families.append((
+            "sysinfo_disk_total_bytes", "gauge", "Disk total", [
+                (label("mount", mount), usage.total)
+                for mount, usage in snapshot.disk_usage.items()]))
+        families.append((
+            "sysinfo_disk_usage_bytes", "gauge", "Disk usage", [
+                (label("mount", mount), usage.used)
+                for mount, usage in snapshot.disk_usage.items()]))
+
+        # Raw counters, Prometheus works out the rates itself
+        # disk_io_counters() is None on hosts without physical disks
+        if snapshot.disk_io is not None:
+            families.append((
+                "sysinfo_disk_io_bytes", "counter", "Disk bytes read and "
+                "written", [
+                    ('{direction="read"}', snapshot.disk_io.read_bytes),
+                    ('{direction="write"}', snapshot.disk_io.write_bytes)]))
+        families.append((
+            "sysinfo_cpu_context_switches", "counter", "Context switches", [
+                ("", snapshot.cpu_stats.ctx_switches)]))
+
+        nics = sorted(
+            (interface, counters)
+            for interface, counters in snapshot.net_io_pernic.items()
+            if self.filter(interface))
+        for name, field, help_text in (
+                ("sysinfo_network_sent_bytes", "bytes_sent", "Bytes sent"),
+                ("sysinfo_network_recv_bytes", "bytes_recv",
+                 "Bytes received"),
+                ("sysinfo_network_errors", "errin", "Receive errors"),
+                ("sysinfo_network_drops", "dropin", "Received packets dropped")):
+            families.append((name, "counter", help_text, [
+                (label("interface", interface), getattr(counters, field))
+                for interface, counters in nics]))
+
+        for openmetrics in (False, True):
+            body = self.exposition(families, openmetrics)
+            content_type = OPENMETRICS_TYPE if openmetrics \
+                else PROMETHEUS_TYPE
+            self.responses[openmetrics, False] = response(
+                body, content_type)
+            self.responses[openmetrics, True] = response(
+                gzip.compress(body, compresslevel=6), content_type, b"gzip")
+
+    @staticmethod
+    def exposition(families, openmetrics):
+        """
+            Write metric families in the Prometheus text format, or
+            OpenMetrics when the scraper asks for it
+            :rtype: bytes
+        """
+        lines = []
+        for name, metric_type, help_text, samples in families:
+            sample_name = name
+            if metric_type == "counter":
+                # Counter samples end in _total, the family name doesn't
+                # in OpenMetrics
+                sample_name = name + "_total"
+                if not openmetrics:
+                    name = sample_name
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{sample_name}{labels} {value}")
+        if openmetrics:
+            lines.append("# EOF")
+        lines.append("")
+        return "\n".join(lines).encode()
+
+# ------------------------------ REFRESH --------------------------------- #
+    async def refresh(self):
+        """
+            Render each new snapshot from the collector thread once
+        """
+        while True:
+            snapshot = self.collector.latest()
+            if snapshot is not None:
+                self.render(snapshot)
+            await asyncio.sleep(POLL_SECONDS)
+
+# ------------------------------ HANDLE ---------------------------------- #
+    async def handle(self, reader, writer):
+        """
+            Answer requests on one connection until the client closes
+            it or it sits idle for IDLE_SECONDS
+        """
+        try:
+            while True:
+                request = await asyncio.wait_for(
+                    reader.readline(), IDLE_SECONDS)
+                if not request:
+                    break
+                parts = request.split()
+                if len(parts) != 3:
+                    break
+                method, path, version = parts
+
+                # Only three headers matter, skip the rest
+                use_gzip = openmetrics = False
+                close = version == b"HTTP/1.0"
+                while True:
+                    line = await asyncio.wait_for(
+                        reader.readline(), IDLE_SECONDS)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.partition(b":")
+                    name = name.strip().lower()
+                    value = value.lower()
+                    if name == b"accept-encoding":
+                        use_gzip = b"gzip" in value
+                    elif name == b"accept":
+                        openmetrics = b"application/openmetrics-text" in value
+                    elif name == b"connection":
+                        close = b"close" in value
+
+                if method not in (b"GET", b"HEAD"):
+                    data = NOT_ALLOWED
+                elif path.split(b"?")[0] != b"/metrics":
+                    data = NOT_FOUND
+                else:
+                    data = self.responses[openmetrics, use_gzip]
+                if method == b"HEAD":
+                    data = data[:data.index(b"\r\n\r\n") + 4]
+
+                writer.write(data)
+                await writer.drain()
+                if close:
+                    break
+        except (asyncio.TimeoutError, asyncio.LimitOverrunError,
+                ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+# ------------------------------- SERVE ---------------------------------- #
+    async def serve(self, host="127.0.0.1", port=9101):
+        """
+            Sample on the collector thread and serve /metrics until
+            cancelled
+        """
+        self.collector.start()
+        server = await asyncio.start_server(
+            self.handle, host, port, limit=MAX_LINE, backlog=1024)
+        refresh = asyncio.ensure_future(self.refresh())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresh.cancel()
+            self.collector.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve system metrics to Prometheus")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on, 0.0.0.0 for every one")
+    parser.add_argument("--port", type=int, default=9101,
+                        help="port to listen on")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds between snapshots")
+    parser.add_argument("--mount", action="append",
+                        help="mount point to export, can be repeated")
+    parser.add_argument("--include", action="append",
+                        help="interface pattern to export, like eth*")
+    parser.add_argument("--exclude", action="append",
+                        help="interface pattern to leave out")
+    args = parser.parse_args()
+
+    exporter = MetricsExporter(
+        args.interval,
+        args.mount or ("/",),
+        args.include,
+        args.exclude if args.exclude is not None else DEFAULT_EXCLUDE
+    )
+    asyncio.run(exporter.serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+    Name: metrics_file.py
+    Created: 10/18/26
+    Purpose: Compact append-only file format for recorded metrics,
+    blocks of delta encoded, compressed samples in hourly segment files
+
+    Samples are kept in memory for a minute and written as one block,
+    column by column, each value as its change from the sample before
+    and the block compressed with zlib. Metrics change little between
+    two samples at 10 Hz, so a sample takes a few bytes instead of 28
+    plus one per core. Per-core percents are the mean of each second,
+    repeated for every sample in it, so they cost nothing between two
+    seconds however many cores there are. A segment is memory mapped to read it, only the
+    block headers are read to index it and a block is only decompressed
+    when a sample in it is read
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import accumulate
+
+MAGIC = b"SYSINFO\x01"
+VERSION = 2
+FILE_PATTERN = "metrics-%Y%m%d-%H%M%S.bin"
+# Seconds of samples in one block, lost if the recorder is killed
+BLOCK_SECONDS = 60
+# Seconds each per-core CPU percent is the mean of
+CORE_SECONDS = 1.0
+ZLIB_LEVEL = 6
+
+# Segment header:
+# magic, version, core count, bytes of one decoded sample,
+# segment start time (epoch seconds), RAM total, swap total,
+# root disk total in bytes
+HEADER = struct.Struct("<8sHHIdQQQ")
+
+# Block header:
+# milliseconds since the segment start of its first sample, number of
+# samples, compressed bytes that follow
+BLOCK = struct.Struct("<III")
+
+# Array type of every column without the per-core CPU percents:
+# milliseconds since the segment start,
+# CPU, RAM, swap and root disk percent in hundredths of a percent,
+# net sent, net recv, disk read and disk write in whole bytes per second
+# Changes between samples are stored, so they are signed
+COLUMNS = "ihhhhqqqq"
+# Every per-core CPU percent is a whole percent
+CORE_COLUMN = "b"
+
+# One decoded sample, cpu_percpu is a tuple of whole percents per core
+Record = namedtuple(
+    "Record",
+    [
+        "timestamp",
+        "cpu_percent",
+        "ram_percent",
+        "swap_percent",
+        "disk_percent",
+        "net_sent",
+        "net_recv",
+        "disk_read",
+        "disk_write",
+        "cpu_percpu",
+    ]
+)
+
+
+def column_types(core_count):
+    """
+        :returns: Array type of every column of a block
+        :rtype: str
+    """
+    return COLUMNS + CORE_COLUMN * core_count
+
+
+def sample_size(core_count):
+    """
+        :returns: Bytes of one sample before it is encoded
+        :rtype: int
+    """
+    return sum(array(typecode).itemsize
+               for typecode in column_types(core_count))
+
+
+def hundredths(percent):
+    """
+        Store a percent as a whole number of hundredths of a percent
+        :rtype: int
+    """
+    return min(max(int(round(percent * 100)), 0), 10000)
+
+
+# ---------------------------- ENCODE BLOCK ------------------------------ #
+def encode_block(rows, core_count):
+    """
+        :param rows: Samples as tuples of whole numbers, one per column
+        :returns: The compressed columns of a block
+        :rtype: bytes
+    """
+    data = []
+    for typecode, column in zip(column_types(core_count), zip(*rows)):
+        previous = 0
+        deltas = array(typecode)
+        for value in column:
+            deltas.append(value - previous)
+            previous = value
+        if sys.byteorder == "big":
+            deltas.byteswap()
+        data.append(deltas.tobytes())
+    return zlib.compress(b"".join(data), ZLIB_LEVEL)
+
+
+def decode_block(payload, count, core_count):
+    """
+        :returns: Every column of a block as a list of whole numbers
+        :rtype: list
+    """
+    data = zlib.decompress(payload)
+    columns = []
+    position = 0
+    for typecode in column_types(core_count):
+        deltas = array(typecode)
+        size = count * deltas.itemsize
+        deltas.frombytes(data[position:position + size])
+        position += size
+        if sys.byteorder == "big":
+            deltas.byteswap()
+        columns.append(list(accumulate(deltas)))
+    return columns
+
+
+def scan_blocks(buffer, size):
+    """
+        Read every block header of a segment
+        :param buffer: Whole segment, header included
+        :param size: Bytes in the segment
+        :returns: [(position of the compressed bytes, first offset,
+        number of samples, compressed bytes)], a block the writer didn't
+        finish is left out
+        :rtype: list
+    """
+    blocks = []
+    position = HEADER.size
+    while position + BLOCK.size <= size:
+        first, count, length = BLOCK.unpack_from(buffer, position)
+        position += BLOCK.size
+        if position + length > size:
+            break
+        blocks.append((position, first, count, length))
+        position += length
+    return blocks
+
+
+class MetricsWriter:
+    def __init__(self, directory, core_count, ram_total, swap_total,
+                 disk_total, rotate_seconds=3600,
+                 block_seconds=BLOCK_SECONDS, core_seconds=CORE_SECONDS):
+        """
+            Write records to segment files in directory
+            :param rotate_seconds: Start a new segment file this often
+            :param block_seconds: Write a block this often, records of
+            the block being filled are only in memory until then
+            :param core_seconds: Store the mean per-core CPU percents of
+            this many seconds, 0 to store every sample's own
+        """
+        self.directory = directory
+        self.core_count = core_count
+        self.ram_total = ram_total
+        self.swap_total = swap_total
+        self.disk_total = disk_total
+        self.rotate_seconds = rotate_seconds
+        self.block_seconds = block_seconds
+        self.core_seconds = core_seconds
+
+        self.file = None
+        self.path = None
+        self.segment_start = 0.0
+        self.segment_end = 0.0
+        # Samples of the block being filled, the per-core percents are
+        # added to the samples of a second once it is over
+        self.rows = []
+        self.block_end = 0.0
+        self.core_start = 0
+        self.core_end = 0.0
+        self.core_sums = [0.0] * core_count
+
+        os.makedirs(directory, exist_ok=True)
+
+# ------------------------------ WRITE ----------------------------------- #
+    def write(self, record):
+        """
+            Add one record, starting a new block or segment when it is
+            time
+            :param record: Record with an epoch seconds timestamp
+        """
+        if self.file is None or record.timestamp >= self.segment_end:
+            self.rotate(record.timestamp)
+        elif record.timestamp >= self.block_end:
+            self.write_block()
+        elif record.timestamp >= self.core_end:
+            self.end_core_mean()
+        if not self.rows:
+            self.block_end = record.timestamp + self.block_seconds
+        if self.core_start == len(self.rows):
+            self.core_end = record.timestamp + self.core_seconds
+
+        self.rows.append([
+            int((record.timestamp - self.segment_start) * 1000),
+            hundredths(record.cpu_percent),
+            hundredths(record.ram_percent),
+            hundredths(record.swap_percent),
+            hundredths(record.disk_percent),
+            max(int(round(record.net_sent)), 0),
+            max(int(round(record.net_recv)), 0),
+            max(int(round(record.disk_read)), 0),
+            max(int(round(record.disk_write)), 0),
+        ])
+        for core, percent in enumerate(record.cpu_percpu):
+            self.core_sums[core] += percent
+
+    def end_core_mean(self):
+        """
+            Give every sample of the second that is over the mean
+            per-core percents of that second
+        """
+        rows = self.rows[self.core_start:]
+        if not rows:
+            return
+        means = [min(max(int(round(total / len(rows))), 0), 100)
+                 for total in self.core_sums]
+        for row in rows:
+            row.extend(means)
+        self.core_start = len(self.rows)
+        self.core_sums = [0.0] * self.core_count
+
+    def write_block(self):
+        """
+            Append the samples kept in memory as one block
+        """
+        if not self.rows:
+            return
+        self.end_core_mean()
+        payload = encode_block(self.rows, self.core_count)
+        self.file.write(BLOCK.pack(self.rows[0][0], len(self.rows),
+                                   len(payload)))
+        self.file.write(payload)
+        self.rows = []
+        self.core_start = 0
+
+# ------------------------------ ROTATE ---------------------------------- #
+    def rotate(self, timestamp):
+        """
+            Close the current segment and start a new one at timestamp
+        """
+        self.close()
+
+        self.segment_start = timestamp
+        self.segment_end = timestamp + self.rotate_seconds
+        name = time.strftime(FILE_PATTERN, time.localtime(timestamp))
+        self.path = os.path.join(self.directory, name)
+
+        if os.path.exists(self.path):
+            # Restarted within the same second, keep the segment's start
+            # time and cut off a block a killed recorder left unfinished
+            with open(self.path, "rb") as segment:
+                data = segment.read()
+            self.segment_start = HEADER.unpack_from(data)[4]
+            blocks = scan_blocks(data, len(data))
+            end = HEADER.size
+            if blocks:
+                position, first, count, length = blocks[-1]
+                end = position + length
+            os.truncate(self.path, end)
+
+        self.file = open(self.path, "ab")
+        # A segment is only ever appended to, the header is written once
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(
+                MAGIC, VERSION, self.core_count,
+                sample_size(self.core_count), timestamp, self.ram_total,
+                self.swap_total, self.disk_total
+            ))
+
+# ------------------------------ FLUSH ----------------------------------- #
+    def flush(self):
+        """
+            Flush the blocks written so far, the block being filled is
+            only written once it is full
+        """
+        if self.file is not None:
+            self.file.flush()
+
+# ------------------------------ CLOSE ----------------------------------- #
+    def close(self):
+        if self.file is not None:
+            self.write_block()
+            self.file.close()
+            self.file = None
+
+
+class Segment:
+    def __init__(self, path):
+        """
+            Memory map one segment file and index its blocks, no block
+            is decompressed until a sample in it is read
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        # mmap can't map an empty file and the header must all be there
+        size = os.fstat(self.file.fileno()).st_size
+        if size < HEADER.size:
+            self.file.close()
+            raise ValueError(
+                f"{path} is too short for a metrics file header, "
+                f"{size} of {HEADER.size} bytes")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.core_count, size_of_sample, self.start,
+         self.ram_total, self.swap_total, self.disk_total) = \
+            HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} metrics file")
+        if sample_size(self.core_count) != size_of_sample:
+            self.close()
+            raise ValueError(f"{path} has a corrupt header")
+
+        # A segment still being written may end with part of a block
+        self.blocks = scan_blocks(self.map, len(self.map))
+        # First offset and first sample number of every block
+        self.index = array("I", (first for position, first, count, length
+                                 in self.blocks))
+        self.block_starts = [0]
+        for position, first, count, length in self.blocks:
+            self.block_starts.append(self.block_starts[-1] + count)
+        self.count = self.block_starts.pop()
+
+        # The last block decompressed, replay reads on through a block
+        self.cached_block = None
+        self.cached_columns = None
+
+    def columns(self, block):
+        """
+            :returns: Every column of a block, decompressed once
+            :rtype: list
+        """
+        if block != self.cached_block:
+            position, first, count, length = self.blocks[block]
+            self.cached_columns = decode_block(
+                self.map[position:position + length], count,
+                self.core_count)
+            self.cached_block = block
+        return self.cached_columns
+
+# ------------------------------- FIND ----------------------------------- #
+    def find(self, timestamp):
+        """
+            Find the last record at or before timestamp
+            :returns: Record number, 0 if timestamp is before the first
+            :rtype: int
+        """
+        target = (timestamp - self.start) * 1000
+
+        # Pick the block from its first offset, then search inside it
+        block = bisect_right(self.index, target) - 1
+        if block < 0:
+            return 0
+        offsets = self.columns(block)[0]
+        return self.block_starts[block] + bisect_right(offsets, target) - 1
+
+# ------------------------------- READ ----------------------------------- #
+    def read(self, i):
+        """
+            Decode record i
+            :rtype: Record
+        """
+        block = bisect_right(self.block_starts, i) - 1
+        columns = self.columns(block)
+        j = i - self.block_starts[block]
+        return Record(
+            timestamp=self.start + columns[0][j] / 1000,
+            cpu_percent=columns[1][j] / 100,
+            ram_percent=columns[2][j] / 100,
+            swap_percent=columns[3][j] / 100,
+            disk_percent=columns[4][j] / 100,
+            net_sent=columns[5][j],
+            net_recv=columns[6][j],
+            disk_read=columns[7][j],
+            disk_write=columns[8][j],
+            cpu_percpu=tuple(column[j] for column in columns[9:])
+        )
+
+    @property
+    def end(self):
+        if self.count == 0:
+            return self.start
+        return self.read(self.count - 1).timestamp
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class MetricsReader:
+    def __init__(self, path):
+        """
+            Open a recorded segment file, or every segment in a folder
+            :param path: Segment file or folder written by MetricsWriter
+        """
+        if os.path.isdir(path):
+            paths = [
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.startswith("metrics-") and name.endswith(".bin")]
+            # Skip a segment the recorder hasn't flushed its header to yet
+            paths = [path for path in paths
+                     if os.path.getsize(path) > HEADER.size]
+        else:
+            paths = [path]
+
+        self.segments = []
+        for segment in map(Segment, paths):
+            if segment.count > 0:
+                self.segments.append(segment)
+            else:
+                segment.close()
+        if not self.segments:
+            raise ValueError(f"No recorded metrics in {path}")
+        self.segments.sort(key=lambda segment: segment.start)
+        self.starts = [segment.start for segment in self.segments]
+
+        # Totals and core count of the first segment
+        first = self.segments[0]
+        self.core_count = first.core_count
+        self.ram_total = first.ram_total
+        self.swap_total = first.swap_total
+        self.disk_total = first.disk_total
+
+    def __len__(self):
+        return sum(segment.count for segment in self.segments)
+
+    @property
+    def start(self):
+        return self.segments[0].start
+
+    @property
+    def end(self):
+        return self.segments[-1].end
+
+# -------------------------------- AT ------------------------------------ #
+    def at(self, timestamp):
+        """
+            Get the last record at or before timestamp
+            :param timestamp: Epoch seconds
+            :rtype: Record
+        """
+        number = max(bisect_right(self.starts, timestamp) - 1, 0)
+        segment = self.segments[number]
+        return segment.read(segment.find(timestamp))
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
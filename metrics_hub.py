@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+    Name: metrics_hub.py
+    Created: 10/18/26
+    Purpose: Receive snapshots from metrics_sender.py on many hosts
+    over UDP and TCP, keep a history per host and show fleet wide
+    aggregates on one rich dashboard
+
+    Example: python metrics_hub.py --host 0.0.0.0
+"""
+import argparse
+import asyncio
+import socket
+import sys
+import time
+# pip install numpy
+import numpy as np
+from hub_protocol import FIELDS, MAGIC, PACKET, PORT
+
+# NumPy type for each struct code in FIELDS
+NUMPY_TYPES = {"d": "<f8", "f": "<f4", "Q": "<u8", "H": "<u2"}
+
+# The same bytes as hub_protocol.PACKET, so a whole batch of packets
+# is decoded with one np.frombuffer()
+PACKET_DTYPE = np.dtype([
+    (name, NUMPY_TYPES.get(code, "S" + code[:-1]))
+    for name, code in FIELDS
+])
+assert PACKET_DTYPE.itemsize == PACKET.size
+
+# Fields kept in each host's history
+METRICS = ("cpu_percent", "ram_percent", "swap_percent", "disk_percent",
+           "net_sent", "net_recv")
+CPU, RAM = 0, 1
+
+# Seconds between decoding everything received
+BATCH_SECONDS = 0.1
+# A host that hasn't sent for this many seconds is offline, adaptive
+# senders can go 10 seconds between packets while idle
+STALE_SECONDS = 30.0
+# UDP receive buffer, room for a few batches of a large fleet
+RECEIVE_BUFFER = 4 * 1024 * 1024
+
+
+class FleetStore:
+    def __init__(self, history=300, capacity=1024):
+        """
+            Per host ring buffers of every metric, grown as hosts join
+            :param history: Samples kept per host
+            :param capacity: Hosts to make room for at the start
+        """
+        self.history = history
+        # {host name bytes: row}, and the host name of every row
+        self.rows = {}
+        self.names = []
+
+        # hosts x 2 * history x metrics, every sample is written twice
+        # so a host's history is always one contiguous slice
+        self.values = np.zeros(
+            (capacity, 2 * history, len(METRICS)), dtype=np.float32)
+        self.heads = np.zeros(capacity, dtype=np.intp)
+        self.counts = np.zeros(capacity, dtype=np.intp)
+
+        # Newest sample of every host
+        self.latest = np.zeros((capacity, len(METRICS)), dtype=np.float32)
+        self.ram_total = np.zeros(capacity, dtype=np.uint64)
+        self.core_count = np.zeros(capacity, dtype=np.uint16)
+        # time.monotonic() on the hub when each host last sent
+        self.last_seen = np.full(capacity, -np.inf)
+
+    def __len__(self):
+        return len(self.names)
+
+# ------------------------------- ROW ------------------------------------ #
+    def row(self, host):
+        """
+            Find the row of a host, adding it the first time it sends
+            :rtype: int
+        """
+        row = self.rows.get(host)
+        if row is None:
+            row = self.rows[host] = len(self.names)
+            self.names.append(host.decode("utf-8", "replace"))
+            if row == len(self.heads):
+                self.grow()
+        return row
+
+    def grow(self):
+        """
+            Double the room for hosts
+        """
+        def doubled(array, fill=0):
+            grown = np.full(
+                (2 * len(array),) + array.shape[1:], fill, dtype=array.dtype)
+            grown[:len(array)] = array
+            return grown
+
+        self.values = doubled(self.values)
+        self.heads = doubled(self.heads)
+        self.counts = doubled(self.counts)
+        self.latest = doubled(self.latest)
+        self.ram_total = doubled(self.ram_total)
+        self.core_count = doubled(self.core_count)
+        self.last_seen = doubled(self.last_seen, -np.inf)
+
+# ------------------------------ INGEST ---------------------------------- #
+    def ingest(self, packets, now=None):
+        """
+            Store a batch of decoded packets with array operations
+            :param packets: Structured array with PACKET_DTYPE
+            :returns: Number of packets stored
+            :rtype: int
+        """
+        if now is None:
+            now = time.monotonic()
+        packets = packets[packets["magic"] == MAGIC]
+        if len(packets) == 0:
+            return 0
+
+        rows = np.fromiter(
+            (self.row(host) for host in packets["host"].tolist()),
+            dtype=np.intp, count=len(packets))
+
+        # A host sending twice in one batch keeps its newest packet,
+        # each row must appear once for the writes below
+        if len(np.unique(rows)) != len(rows):
+            unique, index = np.unique(rows[::-1], return_index=True)
+            keep = len(rows) - 1 - index
+            rows = rows[keep]
+            packets = packets[keep]
+
+        values = np.empty((len(packets), len(METRICS)), dtype=np.float32)
+        for column, name in enumerate(METRICS):
+            values[:, column] = packets[name]
+
+        heads = self.heads[rows]
+        self.values[rows, heads] = values
+        self.values[rows, heads + self.history] = values
+        self.heads[rows] = (heads + 1) % self.history
+        self.counts[rows] = np.minimum(self.counts[rows] + 1, self.history)
+
+        self.latest[rows] = values
+        self.ram_total[rows] = packets["ram_total"]
+        self.core_count[rows] = packets["core_count"]
+        self.last_seen[rows] = now
+        return len(packets)
+
+# ------------------------------ HISTORY --------------------------------- #
+    def host_history(self, host):
+        """
+            :param host: Host name
+            :returns: samples x metrics from oldest to newest, not a copy
+            :rtype: numpy.ndarray
+        """
+        row = self.rows[host.encode("utf-8")]
+        count = self.counts[row]
+        start = (self.heads[row] - count) % self.history
+        return self.values[row, start:start + count]
+
+# ------------------------------ ONLINE ---------------------------------- #
+    def online(self, now=None):
+        """
+            :returns: Rows of the hosts that sent in the last
+            STALE_SECONDS
+            :rtype: numpy.ndarray
+        """
+        if now is None:
+            now = time.monotonic()
+        seen = self.last_seen[:len(self.names)]
+        return np.flatnonzero(seen >= now - STALE_SECONDS)
+
+# ------------------------------ TOP CPU --------------------------------- #
+    def top_cpu(self, count=10, rows=None):
+        """
+            The busiest hosts without sorting the whole fleet
+            :returns: List of (host, CPU percent, RAM percent)
+            :rtype: list
+        """
+        if rows is None:
+            rows = self.online()
+        cpu = self.latest[rows, CPU]
+        if len(rows) > count:
+            top = np.argpartition(cpu, -count)[-count:]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(cpu[top])[::-1]]
+        return [
+            (self.names[rows[i]], float(cpu[i]),
+             float(self.latest[rows[i], RAM]))
+            for i in top
+        ]
+
+# ------------------------- MEMORY PERCENTILES --------------------------- #
+    def memory_percentiles(self, percentiles=(50, 90, 99), rows=None):
+        """
+            :returns: RAM percent at each percentile over the fleet,
+            zeros when no host is online
+            :rtype: numpy.ndarray
+        """
+        if rows is None:
+            rows = self.online()
+        if len(rows) == 0:
+            return np.zeros(len(percentiles))
+        return np.percentile(self.latest[rows, RAM], percentiles)
+
+
+class MetricsHub:
+    def __init__(self, history=300):
+        self.store = FleetStore(history)
+        # Raw bytes received since the last batch was decoded
+        self.pending = []
+        self.received = 0
+        self.rejected = 0
+
+# ------------------------------- BATCH ---------------------------------- #
+    def decode(self):
+        """
+            Decode and store everything received since the last batch
+        """
+        if not self.pending:
+            return
+        data = b"".join(self.pending)
+        self.pending.clear()
+        packets = np.frombuffer(data, dtype=PACKET_DTYPE)
+        stored = self.store.ingest(packets)
+        self.received += stored
+        self.rejected += len(packets) - stored
+
+    async def run_batches(self):
+        while True:
+            await asyncio.sleep(BATCH_SECONDS)
+            self.decode()
+
+# ------------------------------- SERVE ---------------------------------- #
+    async def serve(self, host="127.0.0.1", port=PORT):
+        """
+            Listen for packets on UDP and TCP port until cancelled
+        """
+        loop = asyncio.get_running_loop()
+        datagrams, protocol = await loop.create_datagram_endpoint(
+            lambda: DatagramReceiver(self), local_addr=(host, port))
+        try:
+            datagrams.get_extra_info("socket").setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER)
+        except OSError:
+            # Keep the system default
+            pass
+        server = await loop.create_server(
+            lambda: StreamReceiver(self), host, port, backlog=1024)
+        try:
+            await self.run_batches()
+        finally:
+            datagrams.close()
+            server.close()
+
+
+class DatagramReceiver(asyncio.DatagramProtocol):
+    def __init__(self, hub):
+        self.hub = hub
+
+    def datagram_received(self, data, address):
+        # Only whole packets, anything else isn't from a sender
+        if len(data) % PACKET.size == 0:
+            self.hub.pending.append(data)
+        else:
+            self.hub.rejected += 1
+
+
+class StreamReceiver(asyncio.Protocol):
+    def __init__(self, hub):
+        self.hub = hub
+        self.buffer = bytearray()
+
+    def data_received(self, data):
+        # TCP can split a packet across reads, keep the partial end
+        self.buffer += data
+        usable = len(self.buffer) - len(self.buffer) % PACKET.size
+        if usable:
+            self.hub.pending.append(bytes(self.buffer[:usable]))
+            del self.buffer[:usable]
+
+
+# ------------------------------ DASHBOARD ------------------------------- #
+def dashboard(store, count=10):
+    """
+        Build the fleet view for this tick
+        :rtype: rich.console.Group
+    """
+    # Imported here so the hub runs headless without rich installed
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+
+    rows = store.online()
+    p50, p90, p99 = store.memory_percentiles(rows=rows)
+    mean_cpu = float(store.latest[rows, CPU].mean()) if len(rows) else 0.0
+    ram_total = int(store.ram_total[rows].sum()) / 1024 / 1024 / 1024
+
+    summary = Text()
+    summary.append("\nFleet\n", style="bold blue")
+    summary.append(f"Hosts online: {len(rows)} of {len(store)}\n")
+    summary.append(f"CPU mean: {mean_cpu:.1f} %\n")
+    summary.append(f"RAM total: {ram_total:,.0f} GB\n")
+    summary.append(f"RAM p50 / p90 / p99: {p50:.1f} / {p90:.1f} / "
+                   f"{p99:.1f} %")
+
+    table = Table(
+        title="\nBusiest hosts",
+        title_style="bold blue",
+        header_style="bold blue"
+    )
+    table.add_column("Host", min_width=20)
+    table.add_column("CPU %", justify="right")
+    table.add_column("RAM %", justify="right")
+    for host, cpu, ram in store.top_cpu(count, rows):
+        table.add_row(host, f"{cpu:.1f}", f"{ram:.1f}")
+    return Group(summary, table)
+
+
+async def show_dashboard(hub, refresh=1.0):
+    """
+        Repaint only what changed on the dashboard every refresh seconds
+    """
+    from rich.console import Console
+    from live_diff import DiffLive
+
+    screen = dashboard(hub.store)
+    with DiffLive(screen, Console()) as live:
+        while True:
+            await asyncio.sleep(refresh)
+            screen.renderables[:] = dashboard(hub.store).renderables
+            live.update()
+
+
+async def run(args):
+    hub = MetricsHub(args.history)
+    tasks = [hub.serve(args.host, args.port)]
+    if not args.headless:
+        tasks.append(show_dashboard(hub))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # The benchmark reads this line
+        print(f"received {hub.received} packets from {len(hub.store)} "
+              f"hosts, rejected {hub.rejected}", file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Collect metrics from many hosts")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on, 0.0.0.0 for every one")
+    parser.add_argument("--port", type=int, default=PORT,
+                        help="UDP and TCP port to listen on")
+    parser.add_argument("--history", type=int, default=300,
+                        help="samples kept per host")
+    parser.add_argument("--headless", action="store_true",
+                        help="collect without showing the dashboard")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+    Name: metrics_recorder.py
+    Created: 10/18/26
+    Purpose: Headless collector that records CPU, per-core CPU, RAM,
+    swap, disk and network metrics to rotating segment files
+
+    Example: python metrics_recorder.py --rate 10 --directory metrics
+"""
+import argparse
+import sys
+import time
+from proc_sampler import make_sampler
+from rate_engine import RateEngine
+from metrics_file import MetricsWriter, Record
+
+
+class Recorder:
+    def __init__(self, directory, rate=1.0, rotate_seconds=3600, mount="/"):
+        """
+            :param directory: Folder the segment files are written to
+            :param rate: Samples per second
+            :param rotate_seconds: Start a new segment file this often
+            :param mount: Mount point to record disk usage for
+        """
+        self.interval = 1 / rate
+        self.rate = rate
+        self.mount = mount
+
+        # Straight from /proc on Linux, quick enough for 100 samples
+        # a second
+        self.sampler = make_sampler(mounts=(mount,), percpu=True,
+                                    diskio=True)
+        self.rate_engine = RateEngine()
+        # The wall clock is read once, records are stamped from the
+        # monotonic clock after that so they stay in order when the
+        # wall clock is stepped back or forward
+        self.wall_start = time.time()
+        self.monotonic_start = time.monotonic_ns()
+
+        # Totals never change while recording, they are stored once
+        # in the segment header instead of in every record
+        snapshot = self.sampler.sample()
+        self.writer = MetricsWriter(
+            directory,
+            core_count=len(snapshot.cpu_percpu),
+            ram_total=snapshot.virtual_memory.total,
+            swap_total=snapshot.swap_memory.total,
+            disk_total=snapshot.disk_usage[mount].total,
+            rotate_seconds=rotate_seconds
+        )
+        self.to_record(snapshot)
+
+# ---------------------------- TO RECORD --------------------------------- #
+    def to_record(self, snapshot):
+        """
+            Turn a snapshot into a record, counters become rates
+            :rtype: Record
+        """
+        net = self.rate_engine.update_counters(
+            "net", snapshot.net_io, snapshot.timestamp)
+
+        # disk_io_counters() is None on hosts without physical disks
+        disk_read = disk_write = 0.0
+        if snapshot.disk_io is not None:
+            disk = self.rate_engine.update_counters(
+                "disk", snapshot.disk_io, snapshot.timestamp)
+            disk_read = disk["read_bytes"]
+            disk_write = disk["write_bytes"]
+
+        return Record(
+            timestamp=self.wall_start
+            + (snapshot.timestamp - self.monotonic_start) / 1e9,
+            cpu_percent=snapshot.cpu_percent,
+            ram_percent=snapshot.virtual_memory.percent,
+            swap_percent=snapshot.swap_memory.percent,
+            disk_percent=snapshot.disk_usage[self.mount].percent,
+            net_sent=net["bytes_sent"],
+            net_recv=net["bytes_recv"],
+            disk_read=disk_read,
+            disk_write=disk_write,
+            cpu_percpu=snapshot.cpu_percpu
+        )
+
+# ------------------------------- RUN ------------------------------------ #
+    def run(self):
+        """
+            Record until interrupted, a block of samples is written to
+            disk every minute and flushed within a second
+        """
+        count = 0
+        flush_every = max(int(self.rate), 1)
+        deadline = time.monotonic()
+        try:
+            while True:
+                # Sleep until the next deadline so sampling time doesn't add up
+                deadline += self.interval
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind, start counting again from now
+                    deadline = time.monotonic()
+
+                self.writer.write(self.to_record(self.sampler.sample()))
+
+                count += 1
+                if count % flush_every == 0:
+                    self.writer.flush()
+        finally:
+            self.writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record system metrics without a display")
+    parser.add_argument("--directory", default="metrics",
+                        help="folder to write segment files to")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="samples per second")
+    parser.add_argument("--rotate", type=int, default=3600,
+                        help="seconds per segment file")
+    parser.add_argument("--mount", default="/",
+                        help="mount point to record disk usage for")
+    args = parser.parse_args()
+
+    recorder = Recorder(args.directory, args.rate, args.rotate, args.mount)
+    recorder.run()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+    Name: metrics_replay.py
+    Created: 10/18/26
+    Purpose: Play back metrics recorded by metrics_recorder.py at any
+    speed, with seeking to any point in the recording
+"""
+import time
+from datetime import datetime
+from metrics_file import MetricsReader
+
+
+class ReplayPlayer:
+    def __init__(self, path, speed=1.0, start=None):
+        """
+            :param path: Segment file or folder of segment files
+            :param speed: Recorded seconds played per real second
+            :param start: Epoch seconds to start at, defaults to the
+            start of the recording
+        """
+        self.reader = MetricsReader(path)
+        self.speed = speed
+        self.seek(self.reader.start if start is None else start)
+
+# ------------------------------- SEEK ----------------------------------- #
+    def seek(self, timestamp):
+        """
+            Jump to timestamp and keep playing from there
+            :param timestamp: Epoch seconds
+        """
+        self.position = min(max(timestamp, self.reader.start), self.reader.end)
+        self.wall_start = time.monotonic()
+
+# ----------------------------- POSITION --------------------------------- #
+    def current_time(self):
+        """
+            :returns: Recorded time being played, epoch seconds
+            :rtype: float
+        """
+        elapsed = time.monotonic() - self.wall_start
+        return min(self.position + elapsed * self.speed, self.reader.end)
+
+# ------------------------------ RECORD ---------------------------------- #
+    def record(self):
+        """
+            :returns: Recorded sample for the current replay time
+            :rtype: Record
+        """
+        return self.reader.at(self.current_time())
+
+    def finished(self):
+        return self.current_time() >= self.reader.end
+
+    def close(self):
+        self.reader.close()
+
+
+def parse_time(text):
+    """
+        Read a --start value, epoch seconds or an ISO date and time
+        like 2024-05-01T13:30:00
+        :rtype: float
+    """
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def add_replay_arguments(parser):
+    """
+        Add the replay options shared by every front end to an
+        argparse parser
+    """
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play back a recorded segment file or folder")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="recorded seconds played per second")
+    parser.add_argument("--start", type=parse_time,
+                        help="time to start playing from")
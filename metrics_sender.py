@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+    Name: metrics_sender.py
+    Created: 10/18/26
+    Purpose: Headless collector that sends one compact snapshot a
+    second to metrics_hub.py over UDP or TCP
+
+    Example: python metrics_sender.py --hub 192.168.1.10
+    With --adaptive a snapshot is sent whenever the adaptive sampler
+    takes one, often while the host is busy and every few seconds
+    while it is idle
+"""
+import argparse
+import socket
+import sys
+import time
+from system_sampler import Sampler
+from adaptive_sampler import AdaptiveSampler
+from rate_engine import RateEngine
+from net_io import NetIO
+from host_facts import host_facts
+from hub_protocol import PORT, encode
+
+
+class MetricsSender:
+    def __init__(self, hub, port=PORT, transport="udp", host=None,
+                 interval=1.0, mount="/", adaptive=False):
+        """
+            :param hub: Address of the hub
+            :param transport: "udp" or "tcp"
+            :param host: Name to send as, defaults to the host name
+            :param interval: Seconds between snapshots
+            :param mount: Mount point to send disk usage for
+            :param adaptive: Send as often as the values change instead
+            of every interval seconds
+        """
+        self.address = (hub, port)
+        self.transport = transport
+        self.host = host if host is not None else socket.gethostname()
+        self.interval = interval
+        self.mount = mount
+
+        self.adaptive = adaptive
+        if adaptive:
+            # Disk activity is a reason to send sooner too
+            self.sampler = AdaptiveSampler(
+                mounts=(mount,), pernic=True, diskio=True)
+        else:
+            self.sampler = Sampler(mounts=(mount,), pernic=True)
+        self.net_io = NetIO(rate_engine=RateEngine())
+        # Core count never changes, read it once
+        self.core_count = host_facts().logical_cpu_count
+
+        self.socket = None
+
+# ------------------------------ PACKET ---------------------------------- #
+    def packet(self, snapshot):
+        """
+            Turn a snapshot into a hub packet, counters become rates
+            :rtype: bytes
+        """
+        nics = self.net_io.update(snapshot.net_io_pernic, snapshot.timestamp)
+        return encode(
+            self.host,
+            time.time(),
+            snapshot.cpu_percent,
+            snapshot.virtual_memory.percent,
+            snapshot.swap_memory.percent,
+            snapshot.disk_usage[self.mount].percent,
+            sum(nic.bytes_sent for nic in nics),
+            sum(nic.bytes_recv for nic in nics),
+            snapshot.virtual_memory.total,
+            self.core_count
+        )
+
+# ------------------------------- SEND ----------------------------------- #
+    def send(self, packet):
+        """
+            Send one packet, a TCP connection is opened again next time
+            if the hub went away
+        """
+        if self.transport == "udp":
+            if self.socket is None:
+                self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.sendto(packet, self.address)
+            return
+
+        try:
+            if self.socket is None:
+                self.socket = socket.create_connection(
+                    self.address, timeout=self.interval)
+            self.socket.sendall(packet)
+        except OSError:
+            # Drop this snapshot, the hub only wants the newest one
+            self.close()
+
+    def close(self):
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+# ------------------------------- RUN ------------------------------------ #
+    def run(self):
+        """
+            Send until interrupted
+        """
+        self.packet(self.sampler.sample())
+        deadline = time.monotonic()
+        try:
+            while True:
+                if self.adaptive:
+                    time.sleep(self.sampler.next_delay())
+                    self.send(self.packet(self.sampler.sample()))
+                    continue
+
+                # Sleep until the next deadline so sampling time doesn't add up
+                deadline += self.interval
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind, start counting again from now
+                    deadline = time.monotonic()
+
+                self.send(self.packet(self.sampler.sample()))
+        finally:
+            self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Send system metrics to a metrics hub")
+    parser.add_argument("--hub", default="127.0.0.1",
+                        help="address of the hub")
+    parser.add_argument("--port", type=int, default=PORT,
+                        help="port the hub listens on")
+    parser.add_argument("--tcp", action="store_true",
+                        help="send over TCP instead of UDP")
+    parser.add_argument("--host", help="name to send as")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds between snapshots")
+    parser.add_argument("--mount", default="/",
+                        help="mount point to send disk usage for")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="send fast while values change, slower "
+                        "while the host is idle")
+    args = parser.parse_args()
+
+    sender = MetricsSender(
+        args.hub, args.port, "tcp" if args.tcp else "udp",
+        args.host, args.interval, args.mount, args.adaptive)
+    sender.run()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+    Name: net_io.py
+    Created: 10/18/26
+    Purpose: Byte, packet, error and drop rates of every network
+    interface, and how much of its link speed each one is using
+"""
+import fnmatch
+import re
+import time
+from collections import namedtuple
+# pip install psutil
+import psutil
+from rate_engine import RateEngine
+
+# Traffic on one interface over the last tick, all per second
+# errors and drops add up both directions
+# speed is the link speed in Mbps, 0 when the driver doesn't know it
+# utilisation is the busier direction as a percent of the link speed,
+# None when the speed isn't known
+NicRates = namedtuple(
+    "NicRates",
+    [
+        "interface",
+        "bytes_sent",
+        "bytes_recv",
+        "packets_sent",
+        "packets_recv",
+        "errors",
+        "drops",
+        "speed",
+        "isup",
+        "utilisation",
+    ]
+)
+
+# Loopback, container bridges and virtual ends that would count the
+# same traffic twice
+DEFAULT_EXCLUDE = ("lo", "lo0", "docker*", "br-*", "veth*", "virbr*",
+                   "vnet*", "cni*", "flannel*", "ifb*", "Loopback*")
+# Seconds between rereading link speeds with net_if_stats()
+STATS_SECONDS = 30
+
+
+def compile_patterns(patterns):
+    """
+        Join shell style patterns like "eth*" into one regular expression
+        :returns: Compiled expression, None if there are no patterns
+        :rtype: re.Pattern
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern)
+                               for pattern in patterns))
+
+
+class InterfaceFilter:
+    def __init__(self, include=None, exclude=DEFAULT_EXCLUDE):
+        """
+            Decide which interfaces to show, matching each name once
+            :param include: Patterns of interfaces to show, None for all
+            :param exclude: Patterns of interfaces to leave out
+        """
+        self.include = compile_patterns(include)
+        self.exclude = compile_patterns(exclude)
+        # {interface: True to show it}, names are only matched once
+        self.decisions = {}
+
+    def __call__(self, interface):
+        decision = self.decisions.get(interface)
+        if decision is None:
+            decision = (
+                (self.include is None or self.include.match(interface))
+                and not (self.exclude and self.exclude.match(interface))
+            )
+            decision = self.decisions[interface] = bool(decision)
+        return decision
+
+
+class NetIO:
+    def __init__(self, include=None, exclude=DEFAULT_EXCLUDE,
+                 rate_engine=None, provider=psutil):
+        """
+            Turn net_io_counters(pernic=True) into rates per interface
+            :param include: Patterns of interfaces to show, None for all
+            :param exclude: Patterns of interfaces to leave out
+            :param rate_engine: RateEngine to share with other counters
+            :param provider: Module with the psutil functions we call
+        """
+        self.filter = InterfaceFilter(include, exclude)
+        self.rate_engine = rate_engine if rate_engine is not None \
+            else RateEngine()
+        self.provider = provider
+
+        self.stats = {}
+        self._stats_time = None
+
+# ------------------------------ UPDATE ---------------------------------- #
+    def update(self, pernic, timestamp=None):
+        """
+            :param pernic: net_io_counters(pernic=True) from a snapshot
+            :param timestamp: time.monotonic_ns() of the snapshot
+            :returns: NicRates of every shown interface sorted by name
+            :rtype: list
+        """
+        stats = self.link_stats()
+        nics = []
+        for interface in sorted(pernic):
+            if not self.filter(interface):
+                continue
+
+            rates = self.rate_engine.update_counters(
+                f"net.{interface}", pernic[interface], timestamp)
+
+            speed = 0
+            isup = True
+            link = stats.get(interface)
+            if link is not None:
+                speed = link.speed
+                isup = link.isup
+
+            utilisation = None
+            if speed > 0:
+                # Bytes to bits * 8, Mbps to bits per second * 1,000,000
+                busiest = max(rates["bytes_sent"], rates["bytes_recv"]) * 8
+                utilisation = min(busiest / (speed * 1_000_000) * 100, 100.0)
+
+            nics.append(NicRates(
+                interface=interface,
+                bytes_sent=rates["bytes_sent"],
+                bytes_recv=rates["bytes_recv"],
+                packets_sent=rates["packets_sent"],
+                packets_recv=rates["packets_recv"],
+                errors=rates["errin"] + rates["errout"],
+                drops=rates["dropin"] + rates["dropout"],
+                speed=speed,
+                isup=isup,
+                utilisation=utilisation
+            ))
+        return nics
+
+# ---------------------------- LINK STATS -------------------------------- #
+    def link_stats(self):
+        """
+            net_if_stats() reread every STATS_SECONDS, link speeds
+            almost never change
+            :returns: {interface: snicstats}
+            :rtype: dict
+        """
+        now = time.monotonic()
+        if self._stats_time is None or \
+                now - self._stats_time >= STATS_SECONDS:
+            self._stats_time = now
+            self.stats = self.provider.net_if_stats()
+        return self.stats
+
+
+def link_utilisation(nics):
+    """
+        Traffic of every interface with a known speed as a percent of
+        their added up link speeds
+        :returns: Percent, None if no interface knows its speed
+        :rtype: float
+    """
+    bits = 0.0
+    capacity = 0
+    for nic in nics:
+        if nic.speed > 0 and nic.isup:
+            bits += max(nic.bytes_sent, nic.bytes_recv) * 8
+            capacity += nic.speed * 1_000_000
+    if capacity == 0:
+        return None
+    return min(bits / capacity * 100, 100.0)
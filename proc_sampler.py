@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+    Name: proc_sampler.py
+    Created: 10/18/26
+    Purpose: Linux sampler that reads /proc directly, fast enough to
+    sample at 100 Hz and more to catch short bursts
+
+    /proc/stat, /proc/meminfo, /proc/net/dev and /proc/diskstats stay
+    open and are read again with os.preadv() into buffers made once,
+    and only the fields the front ends show are parsed into one flat
+    array. sample() returns the same Snapshot as Sampler, use
+    make_sampler() to fall back to psutil on other systems
+"""
+import os
+import time
+from array import array
+# pip install psutil
+import psutil
+from system_sampler import Sampler, Snapshot, busy_percent
+
+PROC = "/proc"
+# Folders under sysfs, which is looked for next to proc
+CPU_ROOT = os.path.join("devices", "system", "cpu")
+BLOCK_ROOT = "block"
+# Seconds between cpu_freq() reads when there is no cpufreq in sysfs
+FREQ_SECONDS = 1.0
+# Bytes per sector in /proc/diskstats, whatever the disk uses
+SECTOR_SIZE = 512
+# Buffer size to start with, grown when a file doesn't fit
+BUFFER_SIZE = 16384
+# Bytes to read from a cpufreq file, it holds one number
+VALUE_SIZE = 64
+
+# Every value read() parses, in the order of the flat array
+FIELDS = (
+    # Clock ticks since boot, guest time is already in user time
+    "cpu_busy", "cpu_total",
+    "ctx_switches", "interrupts", "soft_interrupts",
+    # Bytes
+    "mem_total", "mem_free", "mem_available", "mem_buffers",
+    "mem_cached", "mem_shared", "mem_active", "mem_inactive", "mem_slab",
+    "mem_reclaimable", "swap_total", "swap_free",
+    # Every interface added up
+    "bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+    "errin", "errout", "dropin", "dropout",
+    # Every whole disk added up, times in milliseconds
+    "read_count", "write_count", "read_bytes", "write_bytes",
+    "read_time", "write_time", "read_merged_count", "write_merged_count",
+    "busy_time",
+)
+# Index of every field, for example values[INDEX["mem_total"]]
+INDEX = {field: i for i, field in enumerate(FIELDS)}
+MEMORY = INDEX["mem_total"]
+NET = INDEX["bytes_sent"]
+DISK = INDEX["read_count"]
+
+# /proc/meminfo labels in the order of the mem_ and swap_ fields
+MEMINFO = (b"MemTotal:", b"MemFree:", b"MemAvailable:", b"Buffers:",
+           b"Cached:", b"Shmem:", b"Active:", b"Inactive:", b"Slab:",
+           b"SReclaimable:", b"SwapTotal:", b"SwapFree:")
+
+
+class ProcFile:
+    def __init__(self, path, size=BUFFER_SIZE):
+        """
+            A /proc file kept open and read again from the start
+            :param size: Bytes to start with, small for one value files
+        """
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buffer = bytearray(size)
+
+    def read(self):
+        """
+            :returns: The whole file, in the same buffer every time
+            :rtype: bytearray
+        """
+        while True:
+            size = os.preadv(self.fd, [self.buffer], 0)
+            if size < len(self.buffer):
+                return self.buffer[:size]
+            # Didn't fit, /proc files are read in one go
+            self.buffer = bytearray(2 * len(self.buffer))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ProcSampler:
+    def __init__(self, mounts=("/",), percpu=False, perdisk=False,
+                 pernic=False, diskio=False, cpustats=False, root=PROC,
+                 sys_root=None, provider=psutil):
+        """
+            Same options as Sampler
+            :param root: Where proc is mounted
+            :param sys_root: Where sysfs is mounted, sys next to root
+            when None
+            :param provider: psutil, for the few values not read from
+            /proc and the types of the values returned
+        """
+        self.mounts = tuple(mounts)
+        self.percpu = percpu
+        self.perdisk = perdisk
+        self.pernic = pernic
+        self.diskio = diskio
+        self.cpustats = cpustats
+        self.provider = provider
+        if sys_root is None:
+            sys_root = os.path.join(
+                os.path.dirname(os.path.normpath(root)), "sys")
+        self.cpu_root = os.path.join(sys_root, CPU_ROOT)
+        self.block_root = os.path.join(sys_root, BLOCK_ROOT)
+
+        # Raises OSError off Linux, make_sampler() falls back to Sampler
+        self.stat = ProcFile(os.path.join(root, "stat"))
+        self.meminfo = ProcFile(os.path.join(root, "meminfo"))
+        self.net_dev = ProcFile(os.path.join(root, "net", "dev"))
+        self.diskstats = ProcFile(os.path.join(root, "diskstats"))
+
+        # psutil's own result types, so a snapshot looks the same
+        # whichever sampler took it
+        self.svmem = type(provider.virtual_memory())
+        self.sswap = type(provider.swap_memory())
+        self.snetio = type(provider.net_io_counters())
+        self.scpustats = type(provider.cpu_stats())
+        self.scputimes = type(provider.cpu_times())
+        self.sdiskio = None
+        disk_io = provider.disk_io_counters()
+        if disk_io is not None:
+            self.sdiskio = type(disk_io)
+
+        # {device: True if it is a whole disk}, partitions are already
+        # counted in their disk
+        self.disks = {}
+        self.values = array("d", bytes(8 * len(FIELDS)))
+        self.last_cpu = None
+        self.last_percpu = None
+
+        self.freq_files = self.open_freq_files()
+        self.freq = None
+        self.freq_time = None
+        self.read()
+        self.cpu_percent()
+        if percpu:
+            self.cpu_times_percpu()
+
+# ------------------------------- READ ----------------------------------- #
+    def read(self):
+        """
+            Read every file once and parse the fields into the flat array
+            :returns: values, indexed by INDEX, changed in place next read
+            :rtype: array
+        """
+        values = self.values
+        self.stat_data = stat = self.stat.read()
+
+        # cpu  user nice system idle iowait irq softirq steal guest guest_nice
+        times = [int(field) for field in stat[5:stat.find(b"\n")].split()]
+        # Guest time is counted in user and nice time on Linux
+        total = sum(times[:8])
+        values[0] = total - times[3] - times[4]
+        values[1] = total
+        values[2] = self.stat_number(stat, b"\nctxt ")
+        values[3] = self.stat_number(stat, b"\nintr ")
+        values[4] = self.stat_number(stat, b"\nsoftirq ")
+
+        meminfo = self.meminfo.read()
+        i = MEMORY
+        for label in MEMINFO:
+            start = meminfo.find(label)
+            if start < 0:
+                values[i] = 0
+            else:
+                start += len(label)
+                values[i] = int(meminfo[start:meminfo.find(b" kB", start)]) \
+                    * 1024
+            i += 1
+
+        self.nics = {}
+        net = array("d", bytes(8 * 8))
+        for line in self.net_dev.read().split(b"\n")[2:]:
+            colon = line.rfind(b":")
+            if colon < 0:
+                continue
+            fields = line[colon + 1:].split()
+            # recv bytes, packets, errs, drop, ... sent bytes, packets
+            nic = (int(fields[8]), int(fields[0]), int(fields[9]),
+                   int(fields[1]), int(fields[2]), int(fields[10]),
+                   int(fields[3]), int(fields[11]))
+            self.nics[line[:colon].strip().decode()] = nic
+            for j in range(8):
+                net[j] += nic[j]
+        values[NET:NET + 8] = net
+
+        self.disk_rows = {}
+        if not (self.diskio or self.perdisk):
+            # The longest file, only parsed when asked for
+            return values
+        disk = array("d", bytes(8 * 9))
+        for line in self.diskstats.read().split(b"\n"):
+            fields = line.split()
+            if len(fields) < 14:
+                continue
+            name = fields[2].decode()
+            # reads, merged, sectors, ms, writes, merged, sectors, ms,
+            # in flight, ms busy
+            row = (int(fields[3]), int(fields[7]),
+                   int(fields[5]) * SECTOR_SIZE, int(fields[9]) * SECTOR_SIZE,
+                   int(fields[6]), int(fields[10]), int(fields[4]),
+                   int(fields[8]), int(fields[12]))
+            self.disk_rows[name] = row
+            whole = self.disks.get(name)
+            if whole is None:
+                whole = self.disks[name] = os.path.exists(
+                    os.path.join(self.block_root, name.replace("/", "!")))
+            if whole:
+                for j in range(9):
+                    disk[j] += row[j]
+        values[DISK:DISK + 9] = disk
+        return values
+
+    @staticmethod
+    def stat_number(stat, label):
+        """
+            The first number after a label in /proc/stat
+        """
+        start = stat.find(label)
+        if start < 0:
+            return 0
+        start += len(label)
+        end = stat.find(b" ", start)
+        newline = stat.find(b"\n", start)
+        if end < 0 or 0 <= newline < end:
+            end = newline
+        return int(stat[start:end])
+
+# -------------------------------- CPU ----------------------------------- #
+    def cpu_percent(self):
+        """
+            Busy percent since the last call, like psutil.cpu_percent()
+            :rtype: float
+        """
+        busy, total = self.values[0], self.values[1]
+        last, self.last_cpu = self.last_cpu, (busy, total)
+        if last is None or total <= last[1]:
+            return 0.0
+        percent = (busy - last[0]) / (total - last[1]) * 100
+        return round(min(max(percent, 0.0), 100.0), 1)
+
+    def cpu_times_percpu(self):
+        """
+            Percent of every cpu time field of every core since the
+            last call, like psutil.cpu_times_percent(percpu=True)
+            :rtype: list
+        """
+        stat = self.stat_data
+        lines = stat[stat.find(b"\ncpu") + 1:stat.find(b"\nintr")].split(b"\n")
+        fields = len(self.scputimes._fields)
+        cores = [[int(field) for field in line.split()[1:fields + 1]]
+                 for line in lines if line.startswith(b"cpu")]
+
+        last, self.last_percpu = self.last_percpu, cores
+        if last is None or len(last) != len(cores):
+            last = cores
+        result = []
+        for now, before in zip(cores, last):
+            deltas = [a - b for a, b in zip(now, before)]
+            # Guest time is counted in user and nice time on Linux
+            scale = 100.0 / max(1, sum(deltas[:8]))
+            result.append(self.scputimes(*(
+                min(max(round(delta * scale, 1), 0.0), 100.0)
+                for delta in deltas)))
+        return result
+
+    def open_freq_files(self):
+        """
+            scaling_cur_freq of every core, empty when there is no
+            cpufreq, in a VM for example
+            :rtype: list
+        """
+        files = []
+        try:
+            names = sorted(os.listdir(self.cpu_root))
+        except OSError:
+            return files
+        for name in names:
+            path = os.path.join(
+                self.cpu_root, name, "cpufreq", "scaling_cur_freq")
+            if name[3:].isdigit() and os.path.exists(path):
+                files.append(ProcFile(path, VALUE_SIZE))
+        return files
+
+    def cpu_freq(self):
+        """
+            Average frequency of every core in MHz, like psutil.cpu_freq()
+        """
+        if not self.freq_files:
+            # Nothing cheap to read, psutil parses /proc/cpuinfo
+            now = time.monotonic()
+            if self.freq_time is None or now - self.freq_time >= FREQ_SECONDS:
+                self.freq = self.provider.cpu_freq()
+                self.freq_time = now
+            return self.freq
+
+        if self.freq is None:
+            self.freq = self.provider.cpu_freq()
+        # kHz in sysfs
+        current = sum(int(file.read()) for file in self.freq_files) \
+            / len(self.freq_files) / 1000
+        self.freq = self.freq._replace(current=current)
+        return self.freq
+
+# ------------------------------ SAMPLE ---------------------------------- #
+    def sample(self):
+        """
+            Read every metric exactly once
+            :returns: Snapshot of the system at this moment
+            :rtype: Snapshot
+        """
+        values = self.read()
+        timestamp = time.monotonic_ns()
+
+        cpu_percpu = cpu_times_percpu = None
+        if self.percpu:
+            cpu_times_percpu = self.cpu_times_percpu()
+            cpu_percpu = [busy_percent(times) for times in cpu_times_percpu]
+
+        net_io_pernic = None
+        if self.pernic:
+            net_io_pernic = {name: self.snetio(*nic)
+                             for name, nic in self.nics.items()}
+        disk_io = disk_io_perdisk = None
+        if self.sdiskio is not None:
+            if self.diskio:
+                disk_io = self.sdiskio(*map(int, values[DISK:DISK + 9]))
+            if self.perdisk:
+                disk_io_perdisk = {name: self.sdiskio(*row)
+                                   for name, row in self.disk_rows.items()}
+        cpu_stats = None
+        if self.cpustats:
+            cpu_stats = self.scpustats(
+                int(values[2]), int(values[3]), int(values[4]), 0)
+
+        return Snapshot(
+            timestamp=timestamp,
+            cpu_percent=self.cpu_percent(),
+            cpu_percpu=cpu_percpu,
+            cpu_times_percpu=cpu_times_percpu,
+            cpu_freq=self.cpu_freq(),
+            virtual_memory=self.virtual_memory(values),
+            swap_memory=self.swap_memory(values),
+            net_io=self.snetio(*map(int, values[NET:NET + 8])),
+            net_io_pernic=net_io_pernic,
+            disk_io=disk_io,
+            disk_io_perdisk=disk_io_perdisk,
+            cpu_stats=cpu_stats,
+            disk_usage={mount: self.provider.disk_usage(mount)
+                        for mount in self.mounts}
+        )
+
+    def virtual_memory(self, values):
+        """
+            Worked out the way psutil.virtual_memory() does on Linux
+        """
+        (total, free, available, buffers, cached, shared, active,
+         inactive, slab, reclaimable) = map(int, values[MEMORY:MEMORY + 10])
+        # free counts reclaimable slab as cache, so does psutil
+        cached += reclaimable
+        if available > total:
+            # Inside a container that shows the host's numbers
+            available = free
+        percent = round((total - available) / total * 100, 1) if total else 0.0
+        return self.svmem(
+            total, available, percent, total - available, free, active,
+            inactive, buffers, cached, shared, slab)
+
+    def swap_memory(self, values):
+        """
+            Swapped in and out bytes are left at 0, they are only in the
+            much longer /proc/vmstat and nothing shows them
+        """
+        total = int(values[INDEX["swap_total"]])
+        free = int(values[INDEX["swap_free"]])
+        used = total - free
+        percent = round(used / total * 100, 1) if total else 0.0
+        return self.sswap(total, used, free, percent, 0, 0)
+
+    def close(self):
+        for file in [self.stat, self.meminfo, self.net_dev, self.diskstats] \
+                + self.freq_files:
+            file.close()
+
+
+def make_sampler(**kwargs):
+    """
+        ProcSampler on Linux, Sampler anywhere else
+        :param kwargs: Options for the sampler, see Sampler
+        :rtype: ProcSampler or Sampler
+    """
+    try:
+        return ProcSampler(**kwargs)
+    except (OSError, AttributeError):
+        # No /proc, or no os.preadv() on this system
+        return Sampler(**kwargs)
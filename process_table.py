@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+    Name: process_table.py
+    Created: 10/18/26
+    Purpose: Top style list of the processes using the most CPU or RAM,
+    reading only the fields that can have changed from each process
+"""
+import heapq
+import time
+from collections import namedtuple
+# pip install psutil
+import psutil
+
+# One line of the process list
+# cpu_percent is like top, 100 % is one whole core
+# rss is resident memory in bytes
+ProcessRow = namedtuple(
+    "ProcessRow",
+    [
+        "pid",
+        "name",
+        "cpu_percent",
+        "rss",
+        "memory_percent",
+    ]
+)
+
+# Ticks between two reads of every process, the ticks in between only
+# read the processes near the top at the last full read
+FULL_SCAN_TICKS = 5
+# Processes kept an eye on between full reads, per line of the list
+WATCH_FACTOR = 4
+
+
+def cpu_percent(seconds, timestamp, previous):
+    """
+        :param previous: (CPU seconds, rss, timestamp) when the process
+        was last read, None for a new process
+        :returns: Percent of one core since the process was last read
+        :rtype: float
+    """
+    if previous is None:
+        # A process seen for the first time has no delta yet
+        return 0.0
+    elapsed = (timestamp - previous[2]) / 1_000_000_000
+    if elapsed <= 0:
+        return 0.0
+    return (seconds - previous[0]) / elapsed * 100
+
+
+class ProcessTable:
+    def __init__(self, count=10, sort="cpu", provider=psutil,
+                 full_scan_ticks=FULL_SCAN_TICKS):
+        """
+            :param count: Number of processes to list
+            :param sort: "cpu" or "memory", what to list the top of
+            :param provider: Module with the psutil functions we call
+            :param full_scan_ticks: Read every process this often, a
+            process that gets busy makes the list within as many ticks
+        """
+        self.count = count
+        self.sort = sort
+        self.provider = provider
+        self.full_scan_ticks = full_scan_ticks
+
+        # Process objects by pid, kept between ticks so only the fields
+        # that change are read again
+        self.processes = {}
+        # CPU seconds, resident memory and timestamp of every process
+        # when it was last read and its name, keyed by (pid, create_time)
+        # so a reused pid is a new process. psutil keeps create_time in
+        # the Process object, only a new Process reads it again
+        self.last = {}
+        self.names = {}
+        # (key, Process) of the processes read between full reads
+        self.watch = []
+        self.ticks = 0
+
+# ------------------------------ UPDATE ---------------------------------- #
+    def update(self, timestamp=None, ram_total=None):
+        """
+            Read the processes due this tick and pick the top ones
+            :param timestamp: time.monotonic_ns() of this tick
+            :param ram_total: Bytes of RAM, read from the system if None
+            :returns: The top count processes, busiest first
+            :rtype: list
+        """
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+        if ram_total is None:
+            ram_total = self.provider.virtual_memory().total
+
+        if self.ticks % self.full_scan_ticks == 0:
+            candidates = self.scan(timestamp)
+        else:
+            candidates = self.refresh(timestamp)
+        self.ticks += 1
+
+        return [
+            ProcessRow(
+                pid=key[0],
+                name=self.name(key, process),
+                cpu_percent=round(cpu_percent, 1),
+                rss=rss,
+                memory_percent=round(rss / ram_total * 100, 1)
+            )
+            for cpu_percent, rss, key, process in self.top(
+                candidates, self.count)
+        ]
+
+    def top(self, candidates, count):
+        """
+            Only keep the top count in a heap instead of sorting everything
+            :param candidates: (cpu percent, rss, key, Process) tuples
+            :rtype: list
+        """
+        if self.sort == "memory":
+            return heapq.nlargest(count, candidates, key=lambda row: row[1])
+        return heapq.nlargest(
+            count, candidates, key=lambda row: (row[0], row[1]))
+
+# ------------------------------- SCAN ----------------------------------- #
+    def scan(self, timestamp):
+        """
+            Read every process once, and pick the ones to keep reading
+            until the next full read
+            :returns: (cpu percent, rss, key, Process) of every process
+            :rtype: list
+        """
+        last = self.last
+        processes = {}
+        current = {}
+        candidates = []
+        for pid in self.provider.pids():
+            process = self.processes.get(pid)
+            try:
+                if process is None:
+                    process, seconds, rss = self.add(pid)
+                    previous = None
+                else:
+                    # One /proc/<pid>/stat read for a process we know
+                    cpu_times = process.cpu_times()
+                    seconds = cpu_times.user + cpu_times.system
+                    previous = last.get((pid, process.create_time()))
+                    if previous is not None and seconds == previous[0]:
+                        # Didn't run since it was last read, same memory
+                        rss = previous[1]
+                    else:
+                        # Ran since it was last read or the pid was
+                        # reused, a new Process tells which
+                        process, seconds, rss = self.add(pid)
+                        previous = last.get((pid, process.create_time()))
+            except psutil.Error:
+                # Exited or not ours to read
+                continue
+
+            key = (pid, process.create_time())
+            processes[pid] = process
+            current[key] = (seconds, rss, timestamp)
+            candidates.append((cpu_percent(seconds, timestamp, previous),
+                               rss, key, process))
+
+        # Processes that exited are dropped with the old dictionaries
+        self.processes = processes
+        self.last = current
+        self.watch = [(key, process) for cpu, rss, key, process
+                      in self.top(candidates, WATCH_FACTOR * self.count)]
+        return candidates
+
+# ------------------------------ REFRESH --------------------------------- #
+    def refresh(self, timestamp):
+        """
+            Read only the processes near the top at the last full read
+            :returns: (cpu percent, rss, key, Process) of those processes
+            :rtype: list
+        """
+        candidates = []
+        watch = []
+        for key, process in self.watch:
+            previous = self.last[key]
+            try:
+                cpu_times = process.cpu_times()
+                seconds = cpu_times.user + cpu_times.system
+                if seconds < previous[0]:
+                    # The pid was reused, the next full read adds it
+                    raise psutil.NoSuchProcess(key[0])
+                if seconds == previous[0]:
+                    rss = previous[1]
+                else:
+                    rss = process.memory_info().rss
+            except psutil.Error:
+                del self.last[key]
+                self.processes.pop(key[0], None)
+                continue
+
+            self.last[key] = (seconds, rss, timestamp)
+            candidates.append((cpu_percent(seconds, timestamp, previous),
+                               rss, key, process))
+            watch.append((key, process))
+        self.watch = watch
+        return candidates
+
+# -------------------------------- ADD ----------------------------------- #
+    def add(self, pid):
+        """
+            Start following a new process, reading everything it needs
+            in one go
+            :returns: (Process, CPU seconds, resident memory bytes)
+            :rtype: tuple
+        """
+        process = self.provider.Process(pid)
+        with process.oneshot():
+            cpu_times = process.cpu_times()
+            rss = process.memory_info().rss
+        return process, cpu_times.user + cpu_times.system, rss
+
+# ------------------------------- NAME ----------------------------------- #
+    def name(self, key, process):
+        """
+            Read a process name the first time it makes the top list
+            :rtype: str
+        """
+        name = self.names.get(key)
+        if name is None:
+            try:
+                name = process.name()
+            except psutil.Error:
+                name = "?"
+            self.names[key] = name
+
+        # Forget the names of processes that have exited
+        if len(self.names) > 4 * self.count:
+            self.names = {
+                key: name for key, name in self.names.items()
+                if key in self.last}
+        return name
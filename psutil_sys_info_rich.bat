@@ -1,10 +1,14 @@
 cd c:\temp
 
+rem startup.py shows the first frame, then imports the view the
+rem executable is named after
 python -m nuitka ^
     --onefile ^
     --windows-icon-from-ico=airplay.ico ^
     --mingw64 ^
     --lto=no ^
-    psutil_sys_info_rich.py
+    --include-module=psutil_sys_info_rich ^
+    --output-filename=psutil_sys_info_rich.exe ^
+    startup.py
 pause
 
@@ -7,81 +7,236 @@
     and RAM usage in Python with PsUtil.
 """
 
+import argparse
 import os
 import sys
+from datetime import datetime
 from time import sleep
-# pip install psutil
-import psutil
+from system_sampler import Sampler
+from host_facts import host_facts
+from rate_engine import RateEngine
+from net_io import NetIO
+from metrics_replay import ReplayPlayer, add_replay_arguments
+from live_diff import DiffLive
+from sensors import Sensors, temperature_rows
 # Windows: pip install rich
 # Linux: pip3 install rich
-# Import Console for console printing
-from rich.console import Console
+# Import Console for console printing, Group to stack renderables
+from rich.console import Console, Group
 # Import Panel for title displays
 from rich.panel import Panel
+# Import Text for lines changed in place
+from rich.text import Text
 
 # Initialize rich.console
 console = Console()
 
 
 class SystemInfo:
-    def __init__(self):
+    def __init__(self, replay=None, speed=1.0, start=None, live=False,
+                 refresh=1.0, source=None):
         os.system("cls" if os.name == "nt" else "clear")
         self.sent = 0
         self.recv = 0
+        # Play back a recording instead of sampling this system
+        self.player = None
+        if replay is not None:
+            self.player = ReplayPlayer(replay, speed, start)
+        # Core counts and RAM total don't change, read them once
+        self.facts = host_facts()
+        # Network rates over the real time between snapshots
+        self.rate_engine = RateEngine()
+        # Only real interfaces, loopback and bridges would count twice
+        self.net_io = NetIO(rate_engine=self.rate_engine)
+        # Snapshots and sensors shared by every view of launcher.py,
+        # None to read them here
+        self.source = source
+        if source is not None:
+            # launcher.py shows every snapshot it takes with show()
+            source.subscribe(self.show)
+            return
+        # Temperature sensors are found once, then read every tick
+        self.sensors = Sensors()
+        # Take one snapshot of the system per tick
+        self.sampler = Sampler(pernic=True)
+        self.snapshot = self.sampler.sample()
+        self.readings = self.sensors.read()
+        self.get_network_io(self.snapshot)
+        if live:
+            self.run_live(refresh)
+            return
         while True:
-            console.print(
-                Panel.fit(
-                    "     System Information     ",
-                    style="bold blue")
-            )
-            console.print(
-                f"           CPU: {psutil.cpu_count(logical=False)}              ")
-            console.print(f"   Logical CPU: {psutil.cpu_count()}    ")
+            self.print_info()
 
-            # Output current CPU usage as a percentage
-            console.print(f"     CPU usage: {self.get_cpu_usage_pct()} %    ")
+            # Stop at the end of the recording
+            if self.player is not None and self.player.finished():
+                break
 
-            # Output current CPU frequency in GHz
-            console.print(
-                f" CPU frequency: {(self.get_cpu_frequency()):,.2f} GHz    ")
+            sleep(1)
+            self.sample()
 
-            # Output total RAM in GB
-            console.print(
-                f"     RAM total: {self.get_ram_total():,.2f} GB    ")
+            console.clear()
 
-            # Output current RAM usage in GB
-            console.print(
-                f"     RAM usage: {self.get_ram_usage():,.2f} GB    ")
+    def print_info(self):
+        """
+            Print the title and every line for this tick
+        """
+        console.print(
+            Panel.fit(
+                "     System Information     ",
+                style="bold blue")
+        )
 
-            # Output current RAM usage as a percentage.
-            console.print(f"     RAM usage: {self.get_ram_usage_pct()} %    ")
+        rows = self.get_current_rows()
 
+        for description, value in rows:
+            console.print(self.format_row(description, value))
+
+    def show(self, snapshot):
+        """
+            Print a snapshot launcher.py took for every view
+        """
+        self.snapshot = snapshot
+        self.readings = self.source.sensors(snapshot)
+        self.sent, self.recv = self.get_network_io(snapshot)
+        console.clear()
+        self.print_info()
+
+    def run_live(self, refresh):
+        """
+            Keep one panel on the screen and only send the characters
+            that changed to the terminal
+            :param refresh: Updates per second
+        """
+        lines, panel = self.live_panel(self.get_current_rows())
+
+        with DiffLive(panel, console) as live:
+            while self.player is None or not self.player.finished():
+                sleep(1 / refresh)
+                self.sample()
+                rows = self.get_current_rows()
+
+                changed = False
+                if len(rows) != len(lines):
+                    # A sensor came or went, there is a line more or less
+                    lines, panel = self.live_panel(rows)
+                    live.replace(panel)
+                    changed = True
+                for text, (description, value) in zip(lines, rows):
+                    line = self.format_row(description, value)
+                    if text.plain != line:
+                        text.plain = line
+                        changed = True
+                if changed:
+                    live.update()
+
+    def live_panel(self, rows):
+        """
+            :returns: (one Text per line, panel of the lines), the Texts
+            are changed in place every tick
+            :rtype: tuple
+        """
+        lines = [Text(self.format_row(description, value))
+                 for description, value in rows]
+        panel = Group(
+            Panel.fit(
+                "     System Information     ",
+                style="bold blue"),
+            *lines
+        )
+        return lines, panel
+
+    def format_row(self, description, value):
+        return f"{description:>14}: {value}    "
+
+    def sample(self):
+        """
+            Read every metric once for the next tick, nothing to read
+            when playing back a recording
+        """
+        if self.player is None:
+            self.snapshot = self.sampler.sample()
+            self.readings = self.sensors.read()
+
+            # Get network io in Kbps over the real time since the last
+            # snapshot, which includes the time spent printing
+            self.sent, self.recv = self.get_network_io(self.snapshot)
+
+    def get_current_rows(self):
+        """
+            Get the rows for this tick, live or from the recording
+            :returns: List of (description, value) text
+            :rtype: list
+        """
+        if self.player is None:
+            return self.get_rows()
+        return self.get_replay_rows()
+
+    def get_rows(self):
+        """
+            Get the description and value of every line for this tick
+            :returns: List of (description, value) text
+            :rtype: list
+        """
+        rows = [
+            ("CPU", f"{self.facts.cpu_count}"),
+            ("Logical CPU", f"{self.facts.logical_cpu_count}"),
+            # Output current CPU usage as a percentage
+            ("CPU usage", f"{self.get_cpu_usage_pct()} %"),
+            # Output current CPU frequency in GHz
+            ("CPU frequency", f"{(self.get_cpu_frequency()):,.2f} GHz"),
+            # Output total RAM in GB
+            ("RAM total", f"{self.get_ram_total():,.2f} GB"),
+            # Output current RAM usage in GB
+            ("RAM usage", f"{self.get_ram_usage():,.2f} GB"),
+            # Output current RAM usage as a percentage.
+            ("RAM usage", f"{self.get_ram_usage_pct()} %"),
             # Display network io in Kilobits per second
-            console.print(f"   Net IO sent: {self.sent:,.1f} Kbps       ")
-            console.print(f"   Net IO recv: {self.recv:,.1f} Kbps        ")
+            ("Net IO sent", f"{self.sent:,.1f} Kbps"),
+            ("Net IO recv", f"{self.recv:,.1f} Kbps"),
+        ]
+        # CPU temperature, then every package with its cores
+        return rows + temperature_rows(self.readings)
 
-            # Get current network io statistics in Kbps
-            sent_1, recv_1 = self.get_network_io()
-            sleep(1)
-            # Get current network io statistics in Kbps
-            sent_2, recv_2 = self.get_network_io()
-            # Subtract first reading from second reading
-            # gives us how many kilobits were sent/recv per second
-            self.sent = sent_2 - sent_1
-            self.recv = recv_2 - recv_1
+    def get_replay_rows(self):
+        """
+            Get the lines for the recorded sample at the replay time
+            Physical cores and CPU frequency are not recorded
+            :returns: List of (description, value) text
+            :rtype: list
+        """
+        reader = self.player.reader
+        record = self.player.record()
+        ram_total = reader.ram_total / 1024 / 1024 / 1024
+        # Convert bytes to bits *8, convert bits to kilobits / 1024
+        sent = (record.net_sent * 8) / 1024
+        recv = (record.net_recv * 8) / 1024
 
-            console.clear()
+        return [
+            ("Time", f"{datetime.fromtimestamp(record.timestamp):%Y-%m-%d %H:%M:%S}"),
+            ("CPU", "-"),
+            ("Logical CPU", f"{reader.core_count}"),
+            ("CPU usage", f"{record.cpu_percent} %"),
+            ("CPU frequency", "-"),
+            ("RAM total", f"{ram_total:,.2f} GB"),
+            ("RAM usage", f"{ram_total * record.ram_percent / 100:,.2f} GB"),
+            ("RAM usage", f"{record.ram_percent} %"),
+            ("Net IO sent", f"{sent:,.1f} Kbps"),
+            ("Net IO recv", f"{recv:,.1f} Kbps"),
+            # Temperatures are not recorded
+            ("CPU temp", "-"),
+        ]
 
-    def get_network_io(self):
+    def get_network_io(self, snapshot):
         """
-            Get current net io counters statistics in bytes
-            convert to bits, then kb
+            Get net io rates in bytes per second over the real time
+            since the last snapshot of the real interfaces, convert to
+            bits, then kb
         """
-        sent = psutil.net_io_counters().bytes_sent
-        recv = psutil.net_io_counters().bytes_recv
+        nics = self.net_io.update(snapshot.net_io_pernic, snapshot.timestamp)
         # Convert bytes to bits *8, convert bits to kilobits / 1024
-        sent = (sent * 8) / 1024
-        recv = (recv * 8) / 1024
+        sent = (sum(nic.bytes_sent for nic in nics) * 8) / 1024
+        recv = (sum(nic.bytes_recv for nic in nics) * 8) / 1024
 
         return sent, recv
 
@@ -92,7 +247,7 @@ class SystemInfo:
             :returns: System CPU load as a percentage.
             :rtype: float
         """
-        return psutil.cpu_percent(interval=None)
+        return self.snapshot.cpu_percent
 
     def get_cpu_frequency(self):
         """
@@ -100,7 +255,7 @@ class SystemInfo:
             :returns: Current CPU frequency in BHz.
             :rtype: int
         """
-        return int(psutil.cpu_freq().current) / 1024
+        return int(self.snapshot.cpu_freq.current) / 1024
 
     def get_ram_usage(self):
         """
@@ -108,8 +263,8 @@ class SystemInfo:
             :returns: System RAM usage in Gigabytes.
             :rtype: int
         """
-        ram_useage = int(psutil.virtual_memory().total -
-                         psutil.virtual_memory().available)
+        virtual_memory = self.snapshot.virtual_memory
+        ram_useage = int(virtual_memory.total - virtual_memory.available)
         return ram_useage / 1024 / 1024 / 1024
 
     def get_ram_total(self):
@@ -118,8 +273,7 @@ class SystemInfo:
             :returns: Total system RAM in bytes.
             :rtype: int
         """
-        ram_total = int(psutil.virtual_memory().total)
-        return ram_total / 1024 / 1024 / 1024
+        return self.facts.ram_total / 1024 / 1024 / 1024
 
     def get_ram_usage_pct(self):
         """
@@ -127,11 +281,24 @@ class SystemInfo:
             :returns: System RAM usage as a percentage.
             :rtype: float
         """
-        return psutil.virtual_memory().percent
+        return self.snapshot.virtual_memory.percent
 
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Display system information")
+    add_replay_arguments(parser)
+    parser.add_argument("--live", action="store_true",
+                        help="repaint only what changed instead of "
+                        "clearing the screen every tick")
+    parser.add_argument("--refresh", type=float, default=1.0,
+                        help="updates per second with --live")
+    args = parser.parse_args()
     try:
-        system_info = SystemInfo()
+        SystemInfo(args.replay, args.speed, args.start, args.live,
+                   args.refresh)
     except KeyboardInterrupt:
         sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
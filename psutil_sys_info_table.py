@@ -4,100 +4,353 @@
     and RAM usage in Python with PsUtil
 """
 
+import argparse
 import os
 import sys
-import psutil
+from datetime import datetime
 from time import sleep
+from system_sampler import Sampler
+from host_facts import host_facts
+from rate_engine import RateEngine
+from net_io import NetIO
+from metrics_replay import ReplayPlayer, add_replay_arguments
+from live_diff import DiffLive
+from sensors import Sensors, temperature_rows
+from cpu_heatmap import CoreHistory, block_text
+from process_table import ProcessTable
+# pip install numpy
+import numpy as np
 # Windows: pip install rich
 # Linux: pip3 install rich
 # Import Console for console printing
-from rich.console import Console
+from rich.console import Console, Group
 # Import Panel for title displays
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
 # Initialize rich.console
 console = Console()
 
 
 class SystemInfo:
-    def __init__(self):
+    def __init__(self, replay=None, speed=1.0, start=None, live=False,
+                 refresh=1.0, source=None):
         os.system('cls' if os.name == 'nt' else 'clear')
         self._sent = 0
         self._recv = 0
+        # Play back a recording instead of sampling this system
+        self.player = None
+        if replay is not None:
+            self.player = ReplayPlayer(replay, speed, start)
+        # Core counts and RAM total don't change, read them once
+        self.facts = host_facts()
+        # Network rates over the real time between snapshots
+        self.rate_engine = RateEngine()
+        # Only real interfaces, loopback and bridges would count twice
+        self.net_io = NetIO(rate_engine=self.rate_engine)
+        # Snapshots, processes and sensors shared by every view of
+        # launcher.py, None to read them here
+        self.source = source
+        if source is not None:
+            self.core_history = CoreHistory(self.facts.logical_cpu_count)
+            # launcher.py shows every snapshot it takes with show()
+            source.subscribe(self.show)
+            return
+        # Temperature sensors are found once, then read every tick
+        self.sensors = Sensors()
+        # Take one snapshot of the system per tick, with every core
+        self.sampler = Sampler(percpu=True, pernic=True)
+        self.snapshot = self.sampler.sample()
+        self.readings = self.sensors.read()
+        self.get_network_io(self.snapshot)
+        # The last minute of every core, from the recording when replaying
+        if self.player is None:
+            core_count = len(self.snapshot.cpu_percpu)
+        else:
+            core_count = self.player.reader.core_count
+        self.core_history = CoreHistory(core_count)
+        self.update_cores()
+        # Busiest processes, only for this system, they aren't recorded
+        self.process_table = ProcessTable()
+        self.processes = self.process_table.update(
+            self.snapshot.timestamp, self.snapshot.virtual_memory.total)
+        if live:
+            self.run_live(refresh)
+            return
         while True:
-            table = Table(
-                title="\nSystem Information",
-                title_style="bold blue",
-                header_style="bold blue"
-            )
+            self.print_info()
 
-            table.add_column("Description", justify="right")
-            table.add_column("Value", min_width=20)
-            table.add_row("CPU", f"{psutil.cpu_count(logical=False)}")
-            table.add_row("Logical CPU", f"{psutil.cpu_count()}")
+            # Stop at the end of the recording
+            if self.player is not None and self.player.finished():
+                break
 
-            # Output current CPU usage as a percentage
-            table.add_row("CPU usage", f"{self.get_cpu_usage_pct()} %")
+            sleep(1)
+            self.sample()
 
-            # Output current CPU frequency in Ghz
-            table.add_row("CPU frequency",
-                          f"{(self.get_cpu_frequency()):,.2f} Ghz")
+            # Clear console
+            console.clear()
 
-            # Output total RAM in GB
-            table.add_row(
-                "RAM total", f"{self.get_ram_total():,.2f} GB")
+    def print_info(self):
+        """
+            Print the table, cores and processes for this tick
+        """
+        table = Table(
+            title="\nSystem Information",
+            title_style="bold blue",
+            header_style="bold blue"
+        )
 
-            # Output current RAM usage in GB
-            table.add_row(
-                "RAM usage",  f"{self.get_ram_usage():,.2f} GB")
+        table.add_column("Description", justify="right")
+        table.add_column("Value", min_width=20)
+
+        rows = self.get_current_rows()
+
+        for description, value in rows:
+            table.add_row(description, value)
+
+        # Print table to console
+        console.print(table)
+        console.print(self.get_core_text())
+        if self.player is None:
+            console.print(self.get_process_table())
+
+    def show(self, snapshot):
+        """
+            Print a snapshot launcher.py took for every view
+        """
+        self.snapshot = snapshot
+        self.readings = self.source.sensors(snapshot)
+        self._sent, self._recv = self.get_network_io(snapshot)
+        self.processes = self.source.processes(snapshot)
+        self.update_cores()
+        # Clear console
+        console.clear()
+        self.print_info()
+
+    def run_live(self, refresh):
+        """
+            Keep one table on the screen and only send the cells that
+            changed to the terminal
+            :param refresh: Updates per second
+        """
+        rows = self.get_current_rows()
+        descriptions = [description for description, value in rows]
+        values, table = self.live_table(rows)
+
+        # The heatmap and process list below the table are replaced
+        # every tick
+        screen = Group(table, self.get_core_text())
+        if self.player is None:
+            screen.renderables.append(self.get_process_table())
+
+        with DiffLive(screen, console) as live:
+            while self.player is None or not self.player.finished():
+                sleep(1 / refresh)
+                self.sample()
+                rows = self.get_current_rows()
+
+                if [description for description, value in rows] \
+                        != descriptions:
+                    # A sensor came or went, the rows are not the same
+                    descriptions = [description for description, value
+                                    in rows]
+                    values, screen.renderables[0] = self.live_table(rows)
+                for text, (description, value) in zip(values, rows):
+                    if text.plain != value:
+                        text.plain = value
+                screen.renderables[1] = self.get_core_text()
+                if self.player is None:
+                    screen.renderables[2] = self.get_process_table()
+                # Only the cells that changed are sent
+                live.update()
+
+    def live_table(self, rows):
+        """
+            :returns: (one Text per value cell, table of the rows), the
+            Texts are changed in place every tick
+            :rtype: tuple
+        """
+        table = Table(
+            title="\nSystem Information",
+            title_style="bold blue",
+            header_style="bold blue"
+        )
+        table.add_column("Description", justify="right")
+        table.add_column("Value", min_width=20)
+
+        values = []
+        for description, value in rows:
+            values.append(Text(value))
+            table.add_row(description, values[-1])
+        return values, table
+
+    def sample(self):
+        """
+            Read every metric once for the next tick, nothing to read
+            when playing back a recording
+        """
+        if self.player is None:
+            self.snapshot = self.sampler.sample()
+            self.readings = self.sensors.read()
+
+            # Get network io in Kbps over the real time since the last
+            # snapshot, which includes the time spent printing
+            self._sent, self._recv = self.get_network_io(self.snapshot)
+            self.processes = self.process_table.update(
+                self.snapshot.timestamp, self.snapshot.virtual_memory.total)
+        self.update_cores()
+
+    def update_cores(self):
+        """
+            Add this tick's per-core percents to the history
+        """
+        if self.player is None:
+            self.core_history.append(self.snapshot.cpu_percpu)
+        else:
+            self.core_history.append(self.player.record().cpu_percpu)
+
+    def get_core_text(self):
+        """
+            Draw every core as a colored block with the busiest core,
+            the min/max/p95 of every NUMA node over the last minute and
+            where the CPU time went
+            :rtype: rich.text.Text
+        """
+        history = self.core_history
+        minimum, maximum, p95 = history.core_stats()
+        busiest = int(p95.argmax())
 
+        text = Text()
+        text.append("\nCPU cores\n", style="bold blue")
+        text.append(block_text(history.latest()))
+        text.append(f"\nBusiest core: {busiest}  p95 {p95[busiest]:.0f} %  "
+                    f"max {maximum[busiest]:.0f} %")
+        for name, node_min, node_max, node_p95 in history.node_stats():
+            text.append(f"\n{name}: min {node_min:.0f} %  "
+                        f"max {node_max:.0f} %  p95 {node_p95:.0f} %")
+
+        # The breakdown is only sampled live, it is not recorded
+        if self.player is None:
+            times = self.snapshot.cpu_times_percpu
+            fields = ("user", "system", "iowait")
+            fields = [field for field in fields if hasattr(times[0], field)]
+            means = np.array(
+                [[getattr(core, field) for field in fields] for core in times]
+            ).mean(axis=0)
+            text.append("\nAverage core: " + "  ".join(
+                f"{field} {mean:.1f} %" for field, mean in zip(fields, means)))
+        return text
+
+    def get_current_rows(self):
+        """
+            Get the rows for this tick, live or from the recording
+            :returns: List of (description, value) text
+            :rtype: list
+        """
+        if self.player is None:
+            return self.get_rows()
+        return self.get_replay_rows()
+
+    def get_rows(self):
+        """
+            Get the description and value of every row for this tick
+            :returns: List of (description, value) text
+            :rtype: list
+        """
+        rows = [
+            ("CPU", f"{self.facts.cpu_count}"),
+            ("Logical CPU", f"{self.facts.logical_cpu_count}"),
+            # Output current CPU usage as a percentage
+            ("CPU usage", f"{self.get_cpu_usage_pct()} %"),
+            # Output current CPU frequency in Ghz
+            ("CPU frequency", f"{(self.get_cpu_frequency()):,.2f} Ghz"),
+            # Output total RAM in GB
+            ("RAM total", f"{self.get_ram_total():,.2f} GB"),
+            # Output current RAM usage in GB
+            ("RAM usage", f"{self.get_ram_usage():,.2f} GB"),
             # Output current RAM usage as a percentage
-            table.add_row("RAM usage pct", f"{self.get_ram_usage_pct()} %")
+            ("RAM usage pct", f"{self.get_ram_usage_pct()} %"),
 
             # # Output current Swap usage in GB
-            # table.add_row(
-            #     "Swap usage",  f"{get_swap_usage() / 1024 / 1024 /1024:,.2f} GB    ")
+            # ("Swap usage", f"{self.get_swap_usage():,.2f} GB"),
 
             # # Output total Swap in GB
-            # table.add_row(
-            #     "Swap total", f"{get_swap_total() / 1024 / 1024 / 1024:,.2f} GB    ")
+            # ("Swap total", f"{self.get_swap_total():,.2f} GB"),
 
             # # Output current Swap usage as a percentage
-            # table.add_row("Swap usage", f"{get_swap_usage_pct()} %")
+            # ("Swap usage", f"{self.get_swap_usage_pct()} %"),
 
             # Display network io in Kilobits per second
-            table.add_row(
-                "Net IO sent", f"{self._sent:,.1f} Kbps")
-            table.add_row(
-                "Net IO recv", f"{self._recv:,.1f} Kbps")
+            ("Net IO sent", f"{self._sent:,.1f} Kbps"),
+            ("Net IO recv", f"{self._recv:,.1f} Kbps"),
+        ]
+        # CPU temperature, then every package with its cores
+        return rows + temperature_rows(self.readings)
 
-            # Print table to console
-            console.print(table)
+    def get_replay_rows(self):
+        """
+            Get the rows for the recorded sample at the replay time
+            Physical cores and CPU frequency are not recorded
+            :returns: List of (description, value) text
+            :rtype: list
+        """
+        reader = self.player.reader
+        record = self.player.record()
+        ram_total = reader.ram_total / 1024 / 1024 / 1024
+        # Convert bytes to bits *8, convert bits to kilobits / 1024
+        sent = (record.net_sent * 8) / 1024
+        recv = (record.net_recv * 8) / 1024
 
-            # Get current network io statistics in Kbps
-            sent_1, recv_1 = self.get_network_io()
-            sleep(1)
-            # Get current network io statistics in Kbps
-            sent_2, recv_2 = self.get_network_io()
-            # Subtract first reading from second reading
-            # gives us how many kilobits were sent/recv per second
-            self._sent = sent_2 - sent_1
-            self._recv = recv_2 - recv_1
+        return [
+            ("Time", f"{datetime.fromtimestamp(record.timestamp):%Y-%m-%d %H:%M:%S}"),
+            ("CPU", "-"),
+            ("Logical CPU", f"{reader.core_count}"),
+            ("CPU usage", f"{record.cpu_percent} %"),
+            ("CPU frequency", "-"),
+            ("RAM total", f"{ram_total:,.2f} GB"),
+            ("RAM usage", f"{ram_total * record.ram_percent / 100:,.2f} GB"),
+            ("RAM usage pct", f"{record.ram_percent} %"),
+            ("Net IO sent", f"{sent:,.1f} Kbps"),
+            ("Net IO recv", f"{recv:,.1f} Kbps"),
+            # Temperatures are not recorded
+            ("CPU temp", "-"),
+        ]
 
-            # Clear console
-            console.clear()
+    def get_process_table(self):
+        """
+            Build the list of the busiest processes for this tick
+            :rtype: rich.table.Table
+        """
+        table = Table(
+            title="\nProcesses",
+            title_style="bold blue",
+            header_style="bold blue"
+        )
+        table.add_column("PID", justify="right")
+        table.add_column("Name", min_width=16)
+        table.add_column("CPU %", justify="right")
+        table.add_column("Memory", justify="right")
+
+        for row in self.processes:
+            table.add_row(
+                f"{row.pid}",
+                row.name,
+                f"{row.cpu_percent:.1f}",
+                f"{row.rss / 1024 / 1024:,.0f} MB"
+            )
+        return table
 
-    def get_network_io(self):
+    def get_network_io(self, snapshot):
         """
-            Get current net io counters statistics in bytes
-            convert to bits, then kb
+            Get net io rates in bytes per second over the real time
+            since the last snapshot of the real interfaces, convert to
+            bits, then kb
         """
-        sent = psutil.net_io_counters().bytes_sent
-        recv = psutil.net_io_counters().bytes_recv
+        nics = self.net_io.update(snapshot.net_io_pernic, snapshot.timestamp)
         # Convert bytes to bits *8, convert bits to kilobits / 1024
-        sent = (sent * 8) / 1024
-        recv = (recv * 8) / 1024
+        sent = (sum(nic.bytes_sent for nic in nics) * 8) / 1024
+        recv = (sum(nic.bytes_recv for nic in nics) * 8) / 1024
 
         return sent, recv
 
@@ -108,7 +361,7 @@ class SystemInfo:
             :returns: System CPU load as a percentage.
             :rtype: float
         """
-        return psutil.cpu_percent(interval=None)
+        return self.snapshot.cpu_percent
 
     def get_cpu_frequency(self):
         """
@@ -116,7 +369,7 @@ class SystemInfo:
             :returns: Current CPU frequency in BHz.
             :rtype: int
         """
-        return int(psutil.cpu_freq().current) / 1024
+        return int(self.snapshot.cpu_freq.current) / 1024
 
     def get_ram_total(self):
         """
@@ -124,8 +377,7 @@ class SystemInfo:
             :returns: Total system RAM in bytes.
             :rtype: int
         """
-        ram_total = int(psutil.virtual_memory().total)
-        return ram_total / 1024 / 1024 / 1024
+        return self.facts.ram_total / 1024 / 1024 / 1024
 
     def get_ram_usage(self):
         """
@@ -133,8 +385,8 @@ class SystemInfo:
             :returns: System RAM usage in Gigabytes.
             :rtype: int
         """
-        ram_useage = int(psutil.virtual_memory().total -
-                         psutil.virtual_memory().available)
+        virtual_memory = self.snapshot.virtual_memory
+        ram_useage = int(virtual_memory.total - virtual_memory.available)
         return ram_useage / 1024 / 1024 / 1024
 
     def get_ram_usage_pct(self):
@@ -143,7 +395,7 @@ class SystemInfo:
             :returns: System RAM usage as a percentage.
             :rtype: float
         """
-        return psutil.virtual_memory().percent
+        return self.snapshot.virtual_memory.percent
 
     def get_swap_total(self):
         """
@@ -152,7 +404,7 @@ class SystemInfo:
             :rtype: int
         """
         # Bytes
-        swap_total = int(psutil.swap_memory().total)
+        swap_total = int(self.snapshot.swap_memory.total)
         return swap_total / 1024 / 1024 / 1024
 
     def get_swap_usage(self):
@@ -162,7 +414,7 @@ class SystemInfo:
             :rtype: int
         """
         # Bytes
-        swap_useage = int(psutil.swap_memory().used)
+        swap_useage = int(self.snapshot.swap_memory.used)
         return swap_useage / 1024 / 1024 / 1024
 
     def get_swap_usage_pct(self):
@@ -171,11 +423,24 @@ class SystemInfo:
             :returns: System Swap usage as a percentage.
             :rtype: float
         """
-        return psutil.swap_memory().percent
+        return self.snapshot.swap_memory.percent
 
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Display system information")
+    add_replay_arguments(parser)
+    parser.add_argument("--live", action="store_true",
+                        help="repaint only what changed instead of "
+                        "clearing the screen every tick")
+    parser.add_argument("--refresh", type=float, default=1.0,
+                        help="updates per second with --live")
+    args = parser.parse_args()
     try:
-        system_info = SystemInfo()
+        SystemInfo(args.replay, args.speed, args.start, args.live,
+                   args.refresh)
     except KeyboardInterrupt:
         sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,11 @@ Test program with functions for monitoring CPU
 and RAM usage in Python with PsUtil.
 """
 
-import os
 import psutil
+from sensors import Sensors, cpu_temperature
+
+# Found the first time a temperature is asked for, then kept open
+_sensors = None
 
 
 def main():
@@ -50,17 +53,14 @@ def get_cpu_temp():
     :returns: Current value of the CPU temperature if successful, zero value otherwise.
     :rtype: float
     """
-    # Initialize the result.
-    result = 0.0
-    # The first line in this file holds the CPU temperature as an integer times 1000.
-    # Read the first line and remove the newline character at the end of the string.
-    if os.path.isfile('/sys/class/thermal/thermal_zone0/temp'):
-        with open('/sys/class/thermal/thermal_zone0/temp') as f:
-            line = f.readline().strip()
-        # Test if the string is an integer as expected.
-        if line.isdigit():
-            # Convert the string with the CPU temperature to a float in degrees Celsius.
-            result = float(line) / 1000
+    global _sensors
+    # Look for the sensors once instead of checking the file every call
+    if _sensors is None:
+        _sensors = Sensors()
+    # The hottest CPU package, or the first thermal zone with no CPU sensor
+    result = cpu_temperature(_sensors.read())
+    if result is None:
+        result = 0.0
     # Give the result back to the caller.
     return result
 
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+    Name: rate_engine.py
+    Created: 10/18/26
+    Purpose: Turn ever increasing psutil counters into per second rates
+    using the real time between readings instead of assuming 1 second
+"""
+import time
+
+# Largest value a 32 bit counter can hold before it wraps to 0
+COUNTER_32_BIT = 2 ** 32
+COUNTER_64_BIT = 2 ** 64
+
+
+class RateEngine:
+    def __init__(self):
+        # {key: (value, timestamp in ns)} for the last reading of each counter
+        self._last = {}
+        # {key: rate per second} from the last update of each counter
+        self._rates = {}
+
+# ------------------------------ UPDATE ---------------------------------- #
+    def update(self, key, value, timestamp=None):
+        """
+            Store a new counter reading and calculate its rate
+            :param key: Name of the counter, for example "net.bytes_sent"
+            :param value: Current counter value
+            :param timestamp: time.monotonic_ns() when value was read
+            :returns: Counter change per second, 0.0 on the first reading
+            :rtype: float
+        """
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+
+        last = self._last.get(key)
+        self._last[key] = (value, timestamp)
+
+        # First reading, nothing to compare against yet
+        if last is None:
+            self._rates[key] = 0.0
+            return 0.0
+
+        last_value, last_timestamp = last
+        elapsed = (timestamp - last_timestamp) / 1_000_000_000
+
+        # Two readings at the same moment, keep the last rate
+        if elapsed <= 0:
+            return self._rates[key]
+
+        delta = value - last_value
+        if delta < 0:
+            delta = self.counter_delta(last_value, value)
+
+        rate = delta / elapsed
+        self._rates[key] = rate
+        return rate
+
+# -------------------------- UPDATE COUNTERS ----------------------------- #
+    def update_counters(self, prefix, counters, timestamp=None):
+        """
+            Update every field of a psutil counters namedtuple at once
+            :param prefix: Name of the group, for example "net"
+            :param counters: psutil namedtuple like net_io_counters()
+            :param timestamp: time.monotonic_ns() when counters were read
+            :returns: {field: change per second}
+            :rtype: dict
+        """
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+
+        rates = {}
+        for field, value in counters._asdict().items():
+            rates[field] = self.update(f"{prefix}.{field}", value, timestamp)
+        return rates
+
+# ------------------------------- RATE ----------------------------------- #
+    def rate(self, key):
+        """
+            Get the last calculated rate of a counter
+            :returns: Counter change per second, 0.0 if never updated
+            :rtype: float
+        """
+        return self._rates.get(key, 0.0)
+
+# -------------------------- COUNTER DELTA ------------------------------- #
+    @staticmethod
+    def counter_delta(last_value, value):
+        """
+            Work out how much a counter grew when it went backwards
+            It either wrapped past its largest value or was reset to 0,
+            for example when a NIC is reset or a disk is removed
+            :returns: Amount the counter grew
+            :rtype: int
+        """
+        if last_value < COUNTER_32_BIT:
+            modulus = COUNTER_32_BIT
+        else:
+            modulus = COUNTER_64_BIT
+
+        wrapped = value + modulus - last_value
+        # A real wrap only moves a small part of the counter range,
+        # a huge jump means the counter was reset and started over from 0
+        if wrapped < modulus // 2:
+            return wrapped
+        return value
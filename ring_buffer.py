@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+    Name: ring_buffer.py
+    Created: 10/18/26
+    Purpose: Fixed memory history of float samples, the oldest sample
+    is overwritten once the buffer is full
+"""
+from array import array
+
+
+class RingBuffer:
+    def __init__(self, capacity):
+        """
+            Preallocate room for capacity samples
+            :param capacity: Number of samples to keep, for example
+            3600 for 1 hour at 1 second resolution
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+
+        # Every sample is written twice, at index and index + capacity,
+        # so the newest capacity samples are always one contiguous slice
+        self._data = array("d", bytes(8 * 2 * capacity))
+        self._memory = memoryview(self._data)
+        # Index the next sample is written to
+        self._head = 0
+        # Number of samples currently stored
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+# ------------------------------ APPEND ---------------------------------- #
+    def append(self, value):
+        """
+            Add a sample, overwriting the oldest one when full
+        """
+        head = self._head
+        self._data[head] = value
+        self._data[head + self.capacity] = value
+
+        self._head = (head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+# ------------------------------- VIEW ----------------------------------- #
+    def view(self):
+        """
+            Get the stored samples from oldest to newest without copying
+            The view is only valid until the next append
+            :returns: Samples from oldest to newest
+            :rtype: memoryview
+        """
+        start = (self._head - self._count) % self.capacity
+        return self._memory[start:start + self._count]
+
+# ------------------------------- LAST ----------------------------------- #
+    def last(self):
+        """
+            Get the newest sample
+            :returns: Newest sample, 0.0 if the buffer is empty
+            :rtype: float
+        """
+        if self._count == 0:
+            return 0.0
+        return self._data[(self._head - 1) % self.capacity]
+
+# ------------------------------- CLEAR ---------------------------------- #
+    def clear(self):
+        """
+            Forget every sample without releasing the memory
+        """
+        self._head = 0
+        self._count = 0
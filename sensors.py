@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+    Name: sensors.py
+    Created: 10/18/26
+    Purpose: CPU temperatures and fan speeds from the thermal zones and
+    hwmon chips in sysfs, found once and read in one pass every tick
+
+    Finding the sensors means listing directories and reading a label
+    file for every input, so it is done once at startup. Every input
+    stays open and is read again from the start with os.preadv(), the
+    same way proc_sampler.py reads /proc
+
+    Example: python sensors.py --root /tmp/fake_sys_class
+"""
+import argparse
+import glob
+import os
+import re
+from collections import namedtuple
+from proc_sampler import ProcFile
+
+# Where the kernel puts the thermal and hwmon classes, point it at a
+# copy of the tree to test without the hardware
+SYS_CLASS = "/sys/class"
+# Bytes to read from a sensor file, they hold one number
+SENSOR_SIZE = 64
+# hwmon chips that measure the CPU
+CPU_CHIPS = ("coretemp", "k10temp", "zenpower", "cpu_thermal")
+# Thermal zones that are the CPU, used when there is no CPU chip
+CPU_ZONES = ("x86_pkg_temp", "cpu-thermal", "cpu_thermal", "soc_thermal",
+             "cpu")
+# Labels of a whole package, best first. Intel shows Package id,
+# AMD Tdie and Tctl with Tctl offset on some models
+PACKAGE_LABELS = ("Package id", "Physical id", "Tdie", "Tctl")
+# Labels of one core, or of one core complex die on AMD
+CORE_LABELS = ("Core ", "Tccd")
+
+# Degrees Celsius, high and critical are None when the chip has none
+Temperature = namedtuple(
+    "Temperature", "chip label current high critical")
+# Revolutions per minute
+Fan = namedtuple("Fan", "chip label current")
+# One CPU package, current is the hottest core when the chip has no
+# package sensor
+CpuPackage = namedtuple("CpuPackage", "label current cores")
+SensorReadings = namedtuple("SensorReadings", "temperatures fans packages")
+
+
+def natural_key(path):
+    """
+        Sort hwmon10 after hwmon2 and temp10_input after temp2_input
+    """
+    return [int(part) if part.isdigit() else part
+            for part in re.split(r"(\d+)", path)]
+
+
+def read_text(path, default=None):
+    """
+        :returns: The stripped text of a small file, default if it
+        can't be read
+        :rtype: str
+    """
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return default
+
+
+def read_number(file):
+    """
+        :param file: Open ProcFile
+        :returns: The number in the file, None when the sensor fails
+        :rtype: int
+    """
+    try:
+        return int(file.read())
+    except (OSError, ValueError):
+        return None
+
+
+def millidegrees(path):
+    """
+        A limit read once, None if the chip has none
+        :rtype: float
+    """
+    value = read_text(path)
+    if value is None or not value.lstrip("-").isdigit():
+        return None
+    return int(value) / 1000
+
+
+class Sensors:
+    def __init__(self, root=SYS_CLASS):
+        """
+            Find every thermal zone, hwmon temperature and fan and open
+            their inputs
+            :param root: Directory with the thermal and hwmon classes
+        """
+        self.root = root
+        # Temperature and Fan with current None, in the order they are
+        # read, with the open input of each
+        self.temperature_info = []
+        self.temperature_files = []
+        self.fan_info = []
+        self.fan_files = []
+        # Temperature indexes of every hwmon chip of a CPU, each is one
+        # package
+        self.cpu_chips = []
+        self.discover_thermal_zones()
+        self.discover_hwmon()
+        # [(label, package index or None, [core indexes])] into the
+        # temperatures
+        self.packages = self.find_packages()
+
+# ------------------------------ DISCOVER -------------------------------- #
+    def open(self, path):
+        """
+            :returns: The input kept open, None if it can't be read now
+            :rtype: ProcFile
+        """
+        try:
+            file = ProcFile(path, SENSOR_SIZE)
+        except OSError:
+            return None
+        # Some chips list inputs that always fail, leave them out
+        if read_number(file) is None:
+            file.close()
+            return None
+        return file
+
+    def discover_thermal_zones(self):
+        pattern = os.path.join(self.root, "thermal", "thermal_zone*")
+        for zone in sorted(glob.glob(pattern), key=natural_key):
+            file = self.open(os.path.join(zone, "temp"))
+            if file is None:
+                continue
+            chip = os.path.basename(zone)
+            self.temperature_info.append(Temperature(
+                chip, read_text(os.path.join(zone, "type"), chip),
+                None, None, None))
+            self.temperature_files.append(file)
+
+    def discover_hwmon(self):
+        pattern = os.path.join(self.root, "hwmon", "hwmon*")
+        for hwmon in sorted(glob.glob(pattern), key=natural_key):
+            # Older kernels put the inputs in the device directory
+            directory = hwmon
+            if not os.path.exists(os.path.join(hwmon, "name")):
+                directory = os.path.join(hwmon, "device")
+            chip = read_text(os.path.join(directory, "name"),
+                             os.path.basename(hwmon))
+            first = len(self.temperature_info)
+
+            for path in sorted(glob.glob(
+                    os.path.join(directory, "temp*_input")), key=natural_key):
+                file = self.open(path)
+                if file is None:
+                    continue
+                prefix = path[:-len("_input")]
+                self.temperature_info.append(Temperature(
+                    chip,
+                    read_text(prefix + "_label", os.path.basename(prefix)),
+                    None,
+                    millidegrees(prefix + "_max"),
+                    millidegrees(prefix + "_crit")))
+                self.temperature_files.append(file)
+            if chip in CPU_CHIPS and len(self.temperature_info) > first:
+                self.cpu_chips.append(
+                    list(range(first, len(self.temperature_info))))
+
+            for path in sorted(glob.glob(
+                    os.path.join(directory, "fan*_input")), key=natural_key):
+                file = self.open(path)
+                if file is None:
+                    continue
+                prefix = path[:-len("_input")]
+                self.fan_info.append(Fan(
+                    chip,
+                    read_text(prefix + "_label", os.path.basename(prefix)),
+                    None))
+                self.fan_files.append(file)
+
+    def find_packages(self):
+        """
+            Group the CPU temperatures by package, once, so a tick only
+            picks them out by index
+            :returns: [(label, package index or None, [core indexes])]
+            :rtype: list
+        """
+        packages = []
+        for indexes in self.cpu_chips:
+            labels = [self.temperature_info[i].label for i in indexes]
+            cores = [i for i, label in zip(indexes, labels)
+                     if label.startswith(CORE_LABELS)]
+            package = None
+            for prefix in PACKAGE_LABELS:
+                package = next((i for i, label in zip(indexes, labels)
+                                if label.startswith(prefix)), None)
+                if package is not None:
+                    break
+            if package is None:
+                # A chip with one unlabelled input, like a Raspberry Pi
+                package = next((i for i in indexes if i not in cores), None)
+            if package is None:
+                label = self.temperature_info[indexes[0]].chip
+            else:
+                label = self.temperature_info[package].label
+            packages.append((label, package, cores))
+
+        if not packages:
+            # No CPU chip, use the CPU thermal zones, or the first zone
+            # like reading thermal_zone0 always did
+            zones = [i for i, info in enumerate(self.temperature_info)
+                     if info.chip.startswith("thermal_zone")]
+            cpu_zones = [i for i in zones
+                         if self.temperature_info[i].label in CPU_ZONES]
+            for i in cpu_zones or zones[:1]:
+                packages.append((self.temperature_info[i].label, i, []))
+        return packages
+
+# -------------------------------- READ ---------------------------------- #
+    def read(self):
+        """
+            Read every sensor once
+            :rtype: SensorReadings
+        """
+        temperatures = []
+        for info, file in zip(self.temperature_info, self.temperature_files):
+            value = read_number(file)
+            if value is not None:
+                # Millidegrees
+                value /= 1000
+            temperatures.append(Temperature(
+                info.chip, info.label, value, info.high, info.critical))
+
+        fans = [Fan(info.chip, info.label, read_number(file))
+                for info, file in zip(self.fan_info, self.fan_files)]
+
+        packages = []
+        for label, package, cores in self.packages:
+            cores = tuple(temperatures[i] for i in cores)
+            if package is None:
+                current = hottest(cores)
+            else:
+                current = temperatures[package].current
+            packages.append(CpuPackage(label, current, cores))
+        return SensorReadings(temperatures, fans, packages)
+
+    def close(self):
+        for file in self.temperature_files + self.fan_files:
+            file.close()
+        self.temperature_files = []
+        self.fan_files = []
+
+
+# ------------------------------- FORMAT --------------------------------- #
+def hottest(temperatures):
+    """
+        :returns: The highest current of temperatures, None if none of
+        them could be read
+        :rtype: float
+    """
+    values = [temperature.current for temperature in temperatures
+              if temperature.current is not None]
+    return max(values, default=None)
+
+
+def cpu_temperature(readings):
+    """
+        :returns: The hottest CPU package, None when there is no sensor
+        :rtype: float
+    """
+    return hottest(readings.packages)
+
+
+def format_temperature(value):
+    """
+        :rtype: str
+    """
+    if value is None:
+        return "-"
+    return f"{value:.1f} °C"
+
+
+def format_cores(package):
+    """
+        The temperature of every core of a package on one line
+        :rtype: str
+    """
+    return "  ".join(
+        "-" if core.current is None else f"{core.current:.0f}"
+        for core in package.cores) + " °C"
+
+
+def temperature_rows(readings):
+    """
+        The hottest package, then every package with its cores
+        :returns: List of (description, value) text
+        :rtype: list
+    """
+    rows = [("CPU temp", format_temperature(cpu_temperature(readings)))]
+    for package in readings.packages:
+        value = format_temperature(package.current)
+        if package.cores:
+            value += f"  cores {format_cores(package)}"
+        rows.append((package.label, value))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List the temperature and fan sensors found")
+    parser.add_argument("--root", default=SYS_CLASS,
+                        help="directory with the thermal and hwmon classes")
+    args = parser.parse_args()
+
+    sensors = Sensors(args.root)
+    readings = sensors.read()
+    for temperature in readings.temperatures:
+        print(f"{temperature.chip:>16} {temperature.label:<16} "
+              f"{format_temperature(temperature.current)}")
+    for fan in readings.fans:
+        print(f"{fan.chip:>16} {fan.label:<16} {fan.current} RPM")
+    for description, value in temperature_rows(readings):
+        print(f"{description}: {value}")
+    if not readings.temperatures and not readings.fans:
+        print(f"No sensors under {args.root}")
+    sensors.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+    Name: startup.py
+    Created: 10/18/26
+    Purpose: One entry point for every view that shows a first frame
+    from the host facts saved by the last run before it imports
+    anything heavy
+
+    psutil, numpy, matplotlib, rich and sv_ttk are only imported once
+    the first frame is on the screen, and only the ones the chosen view
+    uses. The view is picked by name, or by the name of the executable
+    so one Nuitka build per view needs no arguments
+
+    Example: python startup.py gui --startup-stats
+             python startup.py rich --live
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+from collections import namedtuple
+
+# Taken before anything else, for when the process start can't be read
+SCRIPT_START = time.perf_counter()
+
+# module is imported only when the view is picked and started with
+# module.main(), tk views are shown in the window of the first frame
+# with module.main(root)
+View = namedtuple("View", "module kind")
+VIEWS = {
+    "gui": View("system_info_gui", "tk"),
+    "theme": View("system_info_gui_theme", "tk"),
+    "gauges": View("system_info_gui_gauges_5", "tk"),
+    "chart": View("system_info_gui_chart_1", "tk"),
+    "rich": View("psutil_sys_info_rich", "console"),
+    "table": View("psutil_sys_info_table", "console"),
+}
+DEFAULT_VIEW = "gui"
+# Host facts of the last run, shown in the first frame
+FACTS_FILE = "host_facts.json"
+
+
+# ------------------------------- CLOCK ---------------------------------- #
+def process_age():
+    """
+        :returns: Seconds since this process started, None where the
+        start time can't be read
+        :rtype: float
+    """
+    try:
+        with open("/proc/self/stat") as file:
+            # Fields after the command name, which may hold spaces
+            fields = file.read().rsplit(")", 1)[1].split()
+        # starttime, clock ticks after boot
+        start = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - start
+    except (OSError, AttributeError, ValueError, IndexError):
+        return None
+
+
+class StartupClock:
+    def __init__(self):
+        """
+            Times from the start of the process on Linux, from the
+            start of this script elsewhere
+        """
+        age = process_age()
+        if age is None:
+            self.origin = SCRIPT_START
+            self.origin_name = "script start"
+        else:
+            # Clock ticks are 10 ms, so is this
+            self.origin = time.perf_counter() - age
+            self.origin_name = "process start"
+        self.marks = [("script start", SCRIPT_START)]
+        # (module, microseconds, modules loaded)
+        self.imports = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def load(self, module):
+        """
+            Import a module and time it the way -X importtime does
+            :returns: The module
+        """
+        before = len(sys.modules)
+        start = time.perf_counter()
+        loaded = importlib.import_module(module)
+        self.imports.append((
+            module, int((time.perf_counter() - start) * 1e6),
+            len(sys.modules) - before))
+        return loaded
+
+    def report(self, file=sys.stderr):
+        print(f"startup: times from {self.origin_name}", file=file)
+        for name, at in self.marks:
+            print(f"startup: {name:<20} {(at - self.origin) * 1000:8.1f} ms",
+                  file=file)
+        print("import time: cumulative [us] | modules | imported package",
+              file=file)
+        for module, microseconds, count in self.imports:
+            print(f"import time: {microseconds:>15} | {count:>7} | {module}",
+                  file=file)
+
+
+# ---------------------------- CACHED FACTS ------------------------------ #
+def facts_path():
+    """
+        :returns: Where the host facts are saved between runs
+        :rtype: str
+    """
+    if os.name == "nt":
+        cache = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        cache = os.environ.get(
+            "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache, "system_info", FACTS_FILE)
+
+
+def load_facts(path=None):
+    """
+        The facts saved by the last run on this host, only read as JSON
+        so the first frame doesn't wait on psutil or platform
+        :returns: {field: value}, None if there are none for this host
+        :rtype: dict
+    """
+    try:
+        with open(path or facts_path()) as file:
+            facts = json.load(file)
+    except (OSError, ValueError):
+        return None
+    # A home directory shared between hosts
+    if not isinstance(facts, dict) or \
+            facts.get("host_name") != platform.node():
+        return None
+    return facts
+
+
+def save_facts(facts, path=None):
+    """
+        Save HostFacts for the first frame of the next run
+    """
+    from dataclasses import asdict
+
+    path = path or facts_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written aside and moved so a second view never reads half
+        with open(path + ".tmp", "w") as file:
+            json.dump(asdict(facts), file)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        # Only costs the next first frame its facts
+        pass
+
+
+def fact_rows(facts):
+    """
+        :returns: List of (description, value) text for the first frame
+        :rtype: list
+    """
+    if facts is None:
+        return [("System", "Loading ...")]
+    return [
+        ("Host", facts["host_name"]),
+        ("OS", facts["os_version"]),
+        ("CPU", f"{facts['cpu_count']}"),
+        ("Logical CPU", f"{facts['logical_cpu_count']}"),
+        ("RAM total", f"{facts['ram_total'] / 1024 ** 3:,.2f} GB"),
+    ]
+
+
+# ----------------------------- FIRST FRAME ------------------------------ #
+def paint_tk(rows):
+    """
+        Show the facts in a new window and draw it now
+        :returns: (root, frame to remove once the view is built)
+    """
+    import tkinter as tk
+    from tkinter import ttk
+
+    root = tk.Tk()
+    root.title("System Info")
+    root.geometry("+100+100")
+    frame = ttk.LabelFrame(root, text="System Info")
+    frame.pack(padx=20, pady=20)
+    for row, (description, value) in enumerate(rows):
+        ttk.Label(frame, text=f"{description}:").grid(
+            row=row, column=0, sticky=tk.E, padx=5, pady=5)
+        ttk.Label(frame, text=value).grid(
+            row=row, column=1, sticky=tk.W, padx=5, pady=5)
+    # Map the window and draw it without waiting for mainloop()
+    root.update()
+    return root, frame
+
+
+def paint_console(rows):
+    for description, value in rows:
+        print(f"{description:>14}: {value}")
+    sys.stdout.flush()
+
+
+# -------------------------------- RUN ----------------------------------- #
+def view_name(argv0):
+    """
+        :returns: The view an executable named after a view module or
+        a view runs, None for any other name
+        :rtype: str
+    """
+    name = os.path.splitext(os.path.basename(argv0))[0].lower()
+    for key, view in VIEWS.items():
+        if name in (key, view.module):
+            return key
+    return None
+
+
+def main():
+    clock = StartupClock()
+    default = view_name(sys.argv[0]) or DEFAULT_VIEW
+    parser = argparse.ArgumentParser(
+        description="Start a view with its first frame shown right away, "
+        "other arguments are passed to the view")
+    parser.add_argument("view", nargs="?", choices=tuple(VIEWS),
+                        default=default, help=f"view to show, {default} "
+                        "if left out")
+    parser.add_argument("--startup-stats", action="store_true",
+                        help="print the startup times and imports to stderr")
+    parser.add_argument("--exit-when-ready", action="store_true",
+                        help="quit as soon as the view is ready, to time "
+                        "the startup")
+    args, view_args = parser.parse_known_args()
+    view = VIEWS[args.view]
+    # The view parses its own arguments
+    sys.argv = [view.module + ".py"] + view_args
+
+    rows = fact_rows(load_facts())
+    if view.kind == "tk":
+        root, frame = paint_tk(rows)
+    else:
+        paint_console(rows)
+    clock.mark("first paint")
+
+    module = clock.load(view.module)
+    host_facts = clock.load("host_facts")
+    save_facts(host_facts.host_facts())
+    clock.mark("view imported")
+
+    if view.kind == "console":
+        if args.startup_stats:
+            clock.report()
+        if not args.exit_when_ready:
+            module.main()
+        return
+
+    def ready():
+        clock.mark("view ready")
+        if args.startup_stats:
+            clock.report()
+        if args.exit_when_ready:
+            root.destroy()
+
+    # Runs after the idle callbacks the view queued while it was built,
+    # which is when its first update has been drawn
+    root.after_idle(lambda: root.after_idle(ready))
+    frame.destroy()
+    module.main(root)
+
+
+if __name__ == "__main__":
+    main()
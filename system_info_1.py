@@ -8,25 +8,15 @@
 """
 # pip install psutil
 import psutil
-# importing module
-import platform
+from host_facts import host_facts
 
-# system name
-system_name = platform.system()
-# platform details
-platform_details = platform.platform()
+# OS, processor and host name are read once with the core counts
+facts = host_facts()
 
-# processor name
-processor_name = platform.processor()
-
-# architectural detail
-architecture_details = platform.architecture()
-network_name = platform.node()
-
-print(f"            OS: {system_name}")
-print(f"    OS Version: {platform_details}")
-print(f"     Processor: {processor_name}")
-print(f"     Host Name: {network_name}")
+print(f"            OS: {facts.system}")
+print(f"    OS Version: {facts.os_version}")
+print(f"     Processor: {facts.processor}")
+print(f"     Host Name: {facts.host_name}")
 
 """
     Obtains the system's average CPU load as measured 
@@ -49,8 +39,7 @@ cpu_freq = int(psutil.cpu_freq().current) / 1024
     :returns: System RAM usage in Gigabytes.
     :rtype: int
 """
-ram_useage = int(psutil.virtual_memory().total -
-                 psutil.virtual_memory().available)
+ram_useage = int(facts.ram_total - psutil.virtual_memory().available)
 ram_useage = ram_useage / 1024 / 1024 / 1024
 
 
@@ -59,8 +48,7 @@ ram_useage = ram_useage / 1024 / 1024 / 1024
     :returns: Total system RAM in bytes.
     :rtype: int
 """
-ram_total = int(psutil.virtual_memory().total)
-ram_total = ram_total / 1024 / 1024 / 1024
+ram_total = facts.ram_total / 1024 / 1024 / 1024
 
 
 """
@@ -72,8 +60,8 @@ virtual_memory = psutil.virtual_memory().percent
 
 
 print(
-    f"           CPU: {psutil.cpu_count(logical=False)}")
-print(f"   Logical CPU: {psutil.cpu_count()}")
+    f"           CPU: {facts.cpu_count}")
+print(f"   Logical CPU: {facts.logical_cpu_count}")
 
 # Output current CPU usage as a percentage
 print(f"     CPU usage: {cpu_percent} %")
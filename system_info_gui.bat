@@ -1,5 +1,7 @@
 cd c:\temp
 
+rem startup.py shows the first frame, then imports the view the
+rem executable is named after
 python -m nuitka ^
     --onefile ^
     --enable-plugin=tk-inter ^
@@ -7,5 +9,7 @@ python -m nuitka ^
     --lto=no ^
     --windows-console-mode=disable ^
     --windows-icon-from-ico=airplay.ico ^
-    system_info_gui.py
+    --include-module=system_info_gui ^
+    --output-filename=system_info_gui.exe ^
+    startup.py
 pause
\ No newline at end of file
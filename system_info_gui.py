@@ -5,94 +5,299 @@
     Created: 07/31/22
     Purpose: Display psutil info with Tkinter
 """
+import argparse
+import time
 # Import the tkinter module with tk standard widgets
 import tkinter as tk
 # Override tk widgets with themed ttk widgets if available
 from tkinter import ttk
-import psutil
+from proc_sampler import make_sampler
+from host_facts import host_facts
+from rate_engine import RateEngine
+from net_io import NetIO
+from metrics_replay import ReplayPlayer, add_replay_arguments
+from cpu_heatmap import CoreHistory, TkHeatmap
+from process_table import ProcessTable
+from sensors import Sensors, temperature_rows
+from tk_binding import TkBinding
+
+# Milliseconds between updates when playing back a recording
+REPLAY_MS = 200
+# Number of processes in the process list
+PROCESS_COUNT = 10
 
 
 class SystemInfo:
 
-    def __init__(self):
-        self.sent_1 = 0
-        self.recv_1 = 0
-        self.sent_2 = 0
-        self.recv_2 = 0
-
-        self.root = tk.Tk()
+    def __init__(self, replay=None, speed=1.0, start=None, tcl_stats=False,
+                 root=None, source=None):
+        # Snapshots, processes and sensors shared by every view of
+        # launcher.py, None to read them here
+        self.source = source
+        # Play back a recording instead of sampling this system
+        self.player = None
+        if replay is not None:
+            self.player = ReplayPlayer(replay, speed, start)
+
+        # Take one snapshot of the system per tick, with every core,
+        # straight from /proc on Linux
+        self.sampler = None
+        if source is None:
+            self.sampler = make_sampler(percpu=True, pernic=True)
+        # Network rates over the real time between snapshots
+        self.rate_engine = RateEngine()
+        # Only real interfaces, loopback and bridges would count twice
+        self.net_io = NetIO(rate_engine=self.rate_engine)
+
+        # Core counts and RAM total don't change, read them once
+        self.facts = host_facts()
+        # Temperature sensors are found once, then read every tick
+        self.sensors = None
+        if self.player is None and source is None:
+            self.sensors = Sensors()
+
+        # The last minute of every core, from the recording when replaying
+        if self.player is None:
+            core_count = self.facts.logical_cpu_count
+        else:
+            core_count = self.player.reader.core_count
+        self.core_history = CoreHistory(core_count)
+        self.core_timestamp = None
+        # Busiest processes, only for this system, they aren't recorded
+        self.process_table = None
+        if source is None:
+            self.process_table = ProcessTable(PROCESS_COUNT)
+
+        # A window already shown by startup.py, or a new one
+        self.root = tk.Tk() if root is None else root
         self.root.title("System Info")
         self.root.geometry("+100+100")
         self.root.iconbitmap("airplay.ico")
         self.root.resizable(False, False)
+        # Labels are only configured when their text changes, all in
+        # one idle callback per tick
+        self.binding = TkBinding(self.root, tcl_stats)
 
         # Call method to create all the widgets
         self.create_widgets()
-        self.get_cpu_info()
+        if self.player is None:
+            self.create_process_widgets()
+        else:
+            self.create_replay_widgets()
+        self.bind_widgets()
+        self.display_facts()
+        if source is not None:
+            # launcher.py runs the Tk loop for every view
+            source.subscribe(self.get_cpu_info, self.root)
+            return
+        self.update_info()
         # Start GUI
         self.root.mainloop()
 
+# ------------------------- UPDATE INFO ---------------------------------- #
+    def update_info(self):
+        if self.player is None:
+            self.get_cpu_info()
+            # Schedule after in 1 second
+            self.root.after(1000, self.update_info)
+        else:
+            self.get_replay_info()
+            self.root.after(REPLAY_MS, self.update_info)
+
 # ------------------------- GET CPU INFO --------------------------------- #
-    def get_cpu_info(self):
-        # Get current network io statistics in Kbps
-        self.sent_2 = self.sent_1
-        self.recv_2 = self.recv_1
-        self.sent_1, self.recv_1 = self.get_network_io()
+    def get_cpu_info(self, snapshot=None):
+        """
+            Show a snapshot, taken here if launcher.py didn't pass one
+        """
+        # Read every metric once for this tick
+        if snapshot is None:
+            snapshot = self.sampler.sample()
+        virtual_memory = snapshot.virtual_memory
 
-        # Subtract first reading from second reading
-        # gives us how many kilobits were sent/recv per second
-        sent = self.sent_1 - self.sent_2
-        recv = self.recv_1 - self.recv_2
+        # Get current network io statistics in Kbps
+        sent, recv = self.get_network_io(snapshot)
 
         # Get information
-        cpu_count = psutil.cpu_count(logical=False)
-        logical_cpu_count = psutil.cpu_count()
-        cpu_useage_pct = psutil.cpu_percent(interval=None)
+        cpu_useage_pct = snapshot.cpu_percent
         # CPU frequence in Mhz, convert to Ghz
-        cpu_frequency = psutil.cpu_freq().current / 1024
-        # RAM total in bytes, convert to GB
-        ram_total = psutil.virtual_memory().total / 1024 / 1024 / 1024
+        cpu_frequency = snapshot.cpu_freq.current / 1024
         # RAM useage in bytes, convert to GB
         ram_useage = int(
-            psutil.virtual_memory().total -
-            psutil.virtual_memory().available) / 1024 / 1024 / 1024
-        ram_useage_pct = psutil.virtual_memory().percent
+            virtual_memory.total -
+            virtual_memory.available) / 1024 / 1024 / 1024
+        ram_useage_pct = virtual_memory.percent
+
+        self.display_info(
+            cpu_useage_pct,
+            f" {cpu_frequency:,.2f} Ghz",
+            ram_useage,
+            ram_useage_pct,
+            sent,
+            recv
+        )
+        self.core_history.append(snapshot.cpu_percpu)
+        self.display_cores()
+        if self.source is None:
+            self.display_temperatures(self.sensors.read())
+            self.display_processes(self.process_table.update(
+                snapshot.timestamp, virtual_memory.total))
+        else:
+            self.display_temperatures(self.source.sensors(snapshot))
+            self.display_processes(self.source.processes(snapshot))
+
+# ------------------------- GET REPLAY INFO ------------------------------ #
+    def get_replay_info(self):
+        """
+            Show the recorded sample for the current replay time
+        """
+        reader = self.player.reader
+        record = self.player.record()
 
-        # Display CPU info
-        self.cpu_label_value.configure(text=f" {cpu_count}")
-        self.logical_cpu_label_value.configure(text=f" {logical_cpu_count}")
-        self.cpu_percent_label_value.configure(text=f" {cpu_useage_pct} %")
-        self.cpu_frequency_label_value.configure(
-            text=f" {cpu_frequency:,.2f} Ghz")
+        # RAM total in bytes, convert to GB
+        ram_total = reader.ram_total / 1024 / 1024 / 1024
+        ram_useage = ram_total * record.ram_percent / 100
+
+        # Frequency is not recorded
+        self.display_info(
+            record.cpu_percent,
+            " -",
+            ram_useage,
+            record.ram_percent,
+            # Convert bytes to bits *8, convert bits to kilobits / 1024
+            (record.net_sent * 8) / 1024,
+            (record.net_recv * 8) / 1024
+        )
 
-        # Display RAM info
+        # Several replay ticks can land on the same record
+        if record.timestamp != self.core_timestamp:
+            self.core_timestamp = record.timestamp
+            self.core_history.append(record.cpu_percpu)
+            self.display_cores()
+        # Temperatures are not recorded
+        self.binding.set("cpu_temp", " -")
+
+        # Move the slider along without triggering a seek
+        current_time = self.player.current_time()
+        self.scrubbing = True
+        self.replay_scale.set(current_time)
+        self.scrubbing = False
+        self.binding.set(
+            "replay_time",
+            time.strftime(" %Y-%m-%d %H:%M:%S", time.localtime(current_time)))
+
+# ------------------------- BIND WIDGETS --------------------------------- #
+    def bind_widgets(self):
+        """
+            Give every label that changes a key to set it with
+        """
+        binding = self.binding
+        binding.bind("cpu_percent", self.cpu_percent_label_value)
+        binding.bind("cpu_frequency", self.cpu_frequency_label_value)
+        binding.bind("ram_useage", self.ram_useage_label_value)
+        binding.bind("ram_useage_pct", self.ram_useage_pct_label_value)
+        binding.bind("net_sent", self.net_sent_label_value)
+        binding.bind("net_recv", self.net_recv_label_value)
+        binding.bind("core_stats", self.core_stats_label)
+        binding.bind("cpu_temp", self.cpu_temp_label_value)
+        binding.bind("core_temps", self.core_temps_label)
+        if self.player is None:
+            for i, item in enumerate(self.process_items):
+                binding.bind_function(
+                    ("process", i),
+                    lambda values, item=item: self.process_tree.item(
+                        item, values=values))
+        else:
+            binding.bind("replay_time", self.replay_time_label_value)
+
+# ------------------------- DISPLAY FACTS -------------------------------- #
+    def display_facts(self):
+        """
+            Fill the labels that never change, once
+        """
+        if self.player is None:
+            cpu_count = f" {self.facts.cpu_count}"
+            logical_cpu_count = self.facts.logical_cpu_count
+            ram_total = self.facts.ram_total
+        else:
+            # Physical cores are not recorded
+            cpu_count = " -"
+            logical_cpu_count = self.player.reader.core_count
+            ram_total = self.player.reader.ram_total
+        self.cpu_label_value.configure(text=cpu_count)
+        self.logical_cpu_label_value.configure(text=f" {logical_cpu_count}")
+        # RAM total in bytes, convert to GB
         self.ram_total_label_value.configure(
-            text=f" {ram_total:,.2f} GB")
-        self.ram_useage_label_value.configure(
-            text=f" {ram_useage:,.2f} GB")
-        self.ram_useage_pct_label_value.configure(
-            text=f" {ram_useage_pct} %")
-
-        # Display Network IO
-        self.net_sent_label_value.configure(
-            text=f" {sent:,.1f} Kbps")
-        self.net_recv_label_value.configure(
-            text=f" {recv:,.1f} Kbps")
+            text=f" {ram_total / 1024 / 1024 / 1024:,.2f} GB")
+
+# ------------------------- DISPLAY INFO --------------------------------- #
+    def display_info(self, cpu_useage_pct, cpu_frequency, ram_useage,
+                     ram_useage_pct, sent, recv):
+        self.binding.update({
+            # CPU info
+            "cpu_percent": f" {cpu_useage_pct} %",
+            "cpu_frequency": cpu_frequency,
+            # RAM info
+            "ram_useage": f" {ram_useage:,.2f} GB",
+            "ram_useage_pct": f" {ram_useage_pct} %",
+            # Network IO
+            "net_sent": f" {sent:,.1f} Kbps",
+            "net_recv": f" {recv:,.1f} Kbps",
+        })
+
+# ------------------------- DISPLAY CORES -------------------------------- #
+    def display_cores(self):
+        """
+            Redraw the per-core heatmap and the busiest core and node
+        """
+        self.heatmap.update()
+
+        minimum, maximum, p95 = self.core_history.core_stats()
+        busiest = int(p95.argmax())
+        lines = [f"Busiest core: {busiest}  p95 {p95[busiest]:.0f} %  "
+                 f"max {maximum[busiest]:.0f} %"]
+        for name, node_min, node_max, node_p95 in \
+                self.core_history.node_stats():
+            lines.append(f"{name}: min {node_min:.0f} %  "
+                         f"max {node_max:.0f} %  p95 {node_p95:.0f} %")
+        self.binding.set("core_stats", "\n".join(lines))
+
+# ---------------------- DISPLAY TEMPERATURES ---------------------------- #
+    def display_temperatures(self, readings):
+        """
+            Show the hottest package and every core of every package
+        """
+        rows = temperature_rows(readings)
+        self.binding.set("cpu_temp", f" {rows[0][1]}")
+        self.binding.set("core_temps", "\n".join(
+            f"{description}: {value}" for description, value in rows[1:]))
 
-        # Schedule after in 1 second
-        self.root.after(1000, self.get_cpu_info)
+# ----------------------- DISPLAY PROCESSES ------------------------------ #
+    def display_processes(self, rows):
+        """
+            Show the busiest processes in the rows made at startup
+        """
+        for i, row in enumerate(rows):
+            self.binding.set(("process", i), (
+                row.pid,
+                row.name,
+                f"{row.cpu_percent:.1f}",
+                f"{row.rss / 1024 / 1024:,.0f} MB"
+            ))
+        # Fewer processes than rows, blank the rest
+        for i in range(len(rows), PROCESS_COUNT):
+            self.binding.set(("process", i), ("", "", "", ""))
 
 # ------------------------ GET NETWORK IO -------------------------------- #
-    def get_network_io(self):
+    def get_network_io(self, snapshot):
         """
-            Get current net io counters statistics in bytes
-            convert to bits, then kb
+            Get net io rates in bytes per second over the real time
+            since the last snapshot of the real interfaces, convert to
+            bits, then kb
         """
-        sent = psutil.net_io_counters().bytes_sent
-        recv = psutil.net_io_counters().bytes_recv
+        nics = self.net_io.update(snapshot.net_io_pernic, snapshot.timestamp)
         # Convert bytes to bits *8, convert bits to kilobits / 1024
-        sent = (sent * 8) / 1024
-        recv = (recv * 8) / 1024
+        sent = (sum(nic.bytes_sent for nic in nics) * 8) / 1024
+        recv = (sum(nic.bytes_recv for nic in nics) * 8) / 1024
 
         return sent, recv
 
@@ -209,6 +414,17 @@ class SystemInfo:
             relief=tk.GROOVE
         )
 
+        self.cpu_temp_label = tk.Label(
+            self.main_frame,
+            text="CPU temp:"
+        )
+        self.cpu_temp_label_value = tk.Label(
+            self.main_frame,
+            anchor=tk.W,
+            width=15,
+            relief=tk.GROOVE
+        )
+
         # Grid Spin labelframe
         self.cpu_label.grid(row=0, column=0, sticky=tk.E)
         self.cpu_label_value.grid(row=0, column=1)
@@ -229,6 +445,8 @@ class SystemInfo:
         self.net_sent_label_value.grid(row=7, column=1)
         self.net_recv_label.grid(row=8, column=0, sticky=tk.E)
         self.net_recv_label_value.grid(row=8, column=1)
+        self.cpu_temp_label.grid(row=9, column=0, sticky=tk.E)
+        self.cpu_temp_label_value.grid(row=9, column=1)
 
         # Set padding between frame and window
         self.main_frame.pack_configure(padx=20, pady=20)
@@ -237,14 +455,134 @@ class SystemInfo:
         for child in self.main_frame.winfo_children():
             child.grid_configure(padx=5, pady=5)
 
+        # One image for every core, oldest sample on the left
+        self.cores_frame = ttk.LabelFrame(
+            self.root,
+            text="CPU Cores",
+            relief=tk.GROOVE
+        )
+        self.cores_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
+
+        self.heatmap = TkHeatmap(self.cores_frame, self.core_history)
+        self.core_stats_label = tk.Label(
+            self.cores_frame,
+            anchor=tk.W,
+            justify=tk.LEFT
+        )
+        # One line of core temperatures per CPU package
+        self.core_temps_label = tk.Label(
+            self.cores_frame,
+            anchor=tk.W,
+            justify=tk.LEFT,
+            wraplength=self.heatmap.cell_width * self.core_history.length
+        )
+        self.heatmap.label.pack(padx=5, pady=5)
+        self.core_stats_label.pack(fill=tk.X, padx=5, pady=(0, 5))
+        self.core_temps_label.pack(fill=tk.X, padx=5, pady=(0, 5))
+
         # Bind escape key to quit program
         self.root.bind('<Escape>', self.quit)
 
+# ----------------------- CREATE PROCESS WIDGETS ------------------------- #
+    def create_process_widgets(self):
+        """
+            Process list with a fixed number of rows that are
+            changed in place every tick
+        """
+        self.process_frame = ttk.LabelFrame(
+            self.root,
+            text="Processes",
+            relief=tk.GROOVE
+        )
+        self.process_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
+
+        columns = ("pid", "name", "cpu", "memory")
+        self.process_tree = ttk.Treeview(
+            self.process_frame,
+            columns=columns,
+            show="headings",
+            height=PROCESS_COUNT,
+            selectmode=tk.NONE
+        )
+        for column, heading, width in zip(
+                columns, ("PID", "Name", "CPU %", "Memory"),
+                (60, 140, 60, 80)):
+            self.process_tree.heading(column, text=heading)
+            self.process_tree.column(column, width=width, anchor=tk.E)
+        self.process_tree.column("name", anchor=tk.W)
+
+        self.process_items = [
+            self.process_tree.insert("", tk.END, values=("", "", "", ""))
+            for i in range(PROCESS_COUNT)
+        ]
+        self.process_tree.pack(padx=5, pady=5)
+
+# ------------------------ CREATE REPLAY WIDGETS ------------------------- #
+    def create_replay_widgets(self):
+        """
+            Slider to scrub through the recording and the time played
+        """
+        reader = self.player.reader
+        self.scrubbing = False
+
+        self.replay_frame = ttk.LabelFrame(
+            self.root,
+            text="Replay",
+            relief=tk.GROOVE
+        )
+        self.replay_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
+
+        self.replay_time_label = tk.Label(
+            self.replay_frame,
+            text="Time:"
+        )
+        self.replay_time_label_value = tk.Label(
+            self.replay_frame,
+            anchor=tk.W,
+            width=20,
+            relief=tk.GROOVE
+        )
+        self.replay_scale = ttk.Scale(
+            self.replay_frame,
+            from_=reader.start,
+            to=reader.end,
+            orient=tk.HORIZONTAL,
+            command=self.scrub
+        )
+
+        self.replay_time_label.grid(row=0, column=0, sticky=tk.E)
+        self.replay_time_label_value.grid(row=0, column=1)
+        self.replay_scale.grid(row=1, column=0, columnspan=2, sticky=tk.EW)
+
+        for child in self.replay_frame.winfo_children():
+            child.grid_configure(padx=5, pady=5)
+
+# ------------------------------- SCRUB ---------------------------------- #
+    def scrub(self, value):
+        """
+            Seek the replay when the slider is dragged
+        """
+        if not self.scrubbing:
+            self.player.seek(float(value))
+
 # ---------------------------- QUIT PROGRAM ------------------------------ #
     def quit(self, *args):
         self.root.destroy()
 
 
 # ------------------------- RUN PROGRAM ---------------------------------- #
-"""Create program object to start the program"""
-system_info = SystemInfo()
+def main(root=None):
+    """
+        Create program object to start the program
+        :param root: Tk window to show the program in, a new one if None
+    """
+    parser = argparse.ArgumentParser(description="Display system information")
+    add_replay_arguments(parser)
+    parser.add_argument("--tcl-stats", action="store_true",
+                        help="print the Tcl calls of every update to stderr")
+    args = parser.parse_args()
+    SystemInfo(args.replay, args.speed, args.start, args.tcl_stats, root)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,46 @@
 import tkinter as tk
 from tkinter import ttk
-import psutil
-import threading
+from collector_engine import CollectorEngine, default_groups
+from rate_engine import RateEngine
+from ring_buffer import RingBuffer
 import atexit
 import time
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.patches import Polygon
+
+# Seconds of network history the chart keeps, 1 hour at 1 second resolution
+HISTORY_SECONDS = 3600
+# Seconds of empty space kept on the right so the x-axis only has to be
+# rescaled about once a minute instead of on every new sample
+TIME_HEADROOM = 60
+
+
+def min_max(times, values, columns):
+    """
+        The lowest and highest sample of every pixel column, so a frame
+        draws one point per column however long the history is
+        :param columns: Pixel width of the axes
+        :returns: (times, lowest, highest) numpy arrays, None when the
+        samples already fit in 2 points a column
+    """
+    count = len(values)
+    if columns < 1 or count <= 2 * columns:
+        return None
+
+    # Whole buckets end at the newest sample, the few oldest samples
+    # left over are kept as they are
+    size = -(-count // columns)
+    start = count % size
+    buckets = values[start:].reshape(-1, size)
+    return (np.concatenate((times[:start], times[start + size - 1::size])),
+            np.concatenate((values[:start], buckets.min(axis=1))),
+            np.concatenate((values[:start], buckets.max(axis=1))))
+
 
 class SystemMonitorApp:
-    def __init__(self, root):
+    def __init__(self, root, history_seconds=HISTORY_SECONDS, source=None):
         self.root = root
         self.root.title("System Monitor")
 
@@ -24,14 +56,20 @@ class SystemMonitorApp:
         self.download_label = ttk.Label(self.container, text="Download: 0 KB/s")
         self.download_label.pack()
 
-        self.is_running = True
-        self.upload_data = []  # Store network upload data
-        self.download_data = []  # Store network download data
-        self.network_time = []  # Store time data for the x-axis (network)
-        self.prev_upload = psutil.net_io_counters().bytes_sent
-        self.prev_download = psutil.net_io_counters().bytes_recv
-        self.update_thread = threading.Thread(target=self.update_gauges_thread)
-        self.update_thread.start()
+        # Fixed size history, the oldest samples are dropped once full
+        self.upload_data = RingBuffer(history_seconds)  # Store network upload data
+        self.download_data = RingBuffer(history_seconds)  # Store network download data
+        self.network_time = RingBuffer(history_seconds)  # Store time data for the x-axis (network)
+        self.rate_engine = RateEngine()  # Rates over the real elapsed time
+        if source is None:
+            # Read the network on its own schedule off the Tk thread
+            self.engine = CollectorEngine(default_groups(("net",)))
+            self.engine.start()
+            self.engine.schedule(self.root, {"net": self.update_gauges})
+        else:
+            # Shown from the snapshots launcher.py takes for every view
+            self.engine = None
+            source.subscribe_groups({"net": self.update_gauges}, self.root)
 
         # Create Matplotlib figures and canvases for the line charts
         self.figure_cpu = plt.figure(figsize=(6, 3), tight_layout=True)
@@ -43,30 +81,19 @@ class SystemMonitorApp:
         self.network_ax = self.figure_network.add_subplot(111)
         self.canvas_network = FigureCanvasTkAgg(self.figure_network, master=root)
         self.canvas_network.get_tk_widget().pack()
+        self.create_network_chart()
 
         # Register cleanup function to stop threads on exit
         atexit.register(self.cleanup)
 
     def cleanup(self):
-        self.is_running = False
-        self.update_thread.join()
-
-    def update_gauges_thread(self):
-        while self.is_running:
-            network_stats = psutil.net_io_counters()
-
-            self.root.after(0, self.update_gauges, network_stats)
-            time.sleep(1)  # Add a small delay to prevent busy-waiting
+        self.stop()
 
-    def update_gauges(self, network_stats):
-        current_upload = network_stats.bytes_sent
-        current_download = network_stats.bytes_recv
-
-        upload_speed = (current_upload - self.prev_upload) / 1024
-        download_speed = (current_download - self.prev_download) / 1024
-
-        self.prev_upload = current_upload
-        self.prev_download = current_download
+    def update_gauges(self, reading):
+        network_rates = self.rate_engine.update_counters(
+            "net", reading.value, reading.timestamp)
+        upload_speed = network_rates["bytes_sent"] / 1024
+        download_speed = network_rates["bytes_recv"] / 1024
 
         # Update network data for the line chart
         self.upload_data.append(upload_speed)
@@ -80,22 +107,106 @@ class SystemMonitorApp:
         self.upload_label.config(text=f"Upload: {upload_speed:.1f} KB/s")
         self.download_label.config(text=f"Download: {download_speed:.1f} KB/s")
 
-    def update_line_charts(self):
-        self.network_ax.clear()
-        self.network_ax.plot(self.network_time, self.upload_data, marker='o', linestyle='-', color='green', label='Upload')
-        self.network_ax.plot(self.network_time, self.download_data, marker='o', linestyle='-', color='blue', label='Download')
+    def create_network_chart(self):
+        # Labels, legend and grid are drawn once, only the lines change
         self.network_ax.set_xlabel('Time')
         self.network_ax.set_ylabel('Network Speed (KB/s)')
         self.network_ax.set_title('Network Bandwidth Over Time')
-        self.network_ax.legend()
         self.network_ax.grid(True)
-        self.canvas_network.draw()
+
+        # Animated lines are left out of full redraws and blitted on top
+        self.upload_line, = self.network_ax.plot([], [], linestyle='-', color='green', label='Upload', animated=True)
+        self.download_line, = self.network_ax.plot([], [], linestyle='-', color='blue', label='Download', animated=True)
+        self.network_ax.legend()
+        # Once there are more samples than pixels, the range of every pixel
+        # column is filled in under the line of the highest samples
+        self.upload_band = self.network_ax.add_patch(Polygon([[0, 0]], closed=True, facecolor='green', linewidth=0, visible=False, animated=True))
+        self.download_band = self.network_ax.add_patch(Polygon([[0, 0]], closed=True, facecolor='blue', linewidth=0, visible=False, animated=True))
+
+        # Start with an empty 0-1 KB/s range, grown as data arrives
+        self.network_ax.set_ylim(0, 1)
+        now = time.time()
+        self.network_ax.set_xlim(now, now + TIME_HEADROOM)
+
+        # Save a copy of the chart without the lines after every full redraw
+        self.network_background = None
+        self.canvas_network.mpl_connect('draw_event', self.on_network_draw)
+
+    def on_network_draw(self, event):
+        self.network_background = self.canvas_network.copy_from_bbox(self.figure_network.bbox)
+        self.draw_network_lines()
+
+    def draw_network_lines(self):
+        self.network_ax.draw_artist(self.upload_band)
+        self.network_ax.draw_artist(self.download_band)
+        self.network_ax.draw_artist(self.upload_line)
+        self.network_ax.draw_artist(self.download_line)
+
+    def update_line_charts(self):
+        # Wrap the ring buffer views in numpy arrays without copying
+        network_time = np.asarray(self.network_time.view())
+        upload_data = np.asarray(self.upload_data.view())
+        download_data = np.asarray(self.download_data.view())
+        # The axes show the whole history, only draw what its pixels can show
+        columns = int(self.network_ax.bbox.width)
+        self.set_network_line(self.upload_line, self.upload_band, network_time, upload_data, columns)
+        self.set_network_line(self.download_line, self.download_band, network_time, download_data, columns)
+
+        # Rescale only when the newest data leaves the current limits,
+        # a full redraw then saves a new background for blitting
+        if self.rescale_network_chart(network_time, upload_data, download_data):
+            self.canvas_network.draw()
+            return
+
+        if self.network_background is None or not self.canvas_network.supports_blit:
+            self.canvas_network.draw_idle()
+            return
+
+        # Restore the saved chart, draw the lines on top and copy only the axes to the screen
+        self.canvas_network.restore_region(self.network_background)
+        self.draw_network_lines()
+        self.canvas_network.blit(self.network_ax.bbox)
+
+    def set_network_line(self, line, band, network_time, data, columns):
+        columns_data = min_max(network_time, data, columns)
+        if columns_data is None:
+            line.set_data(network_time, data)
+            band.set_visible(False)
+            return
+
+        # A line zigzagging between the lowest and highest sample of every
+        # column fills the same pixels as this band, but takes far longer to draw
+        times, lowest, highest = columns_data
+        line.set_data(times, highest)
+        band.set_xy(np.concatenate((np.column_stack((times, highest)), np.column_stack((times[::-1], lowest[::-1])))))
+        band.set_visible(True)
+
+    def rescale_network_chart(self, network_time, upload_data, download_data):
+        left, right = self.network_ax.get_xlim()
+        if network_time[-1] > right or network_time[0] > left + TIME_HEADROOM:
+            self.network_ax.set_xlim(network_time[0], network_time[-1] + TIME_HEADROOM)
+            # Fit the y-axis to the whole history, a spike may have scrolled off
+            highest = max(upload_data.max(), download_data.max())
+            self.network_ax.set_ylim(0, max(highest * 1.25, 1))
+            return True
+
+        # Grow the y-axis with headroom so small increases don't rescale again
+        bottom, top = self.network_ax.get_ylim()
+        highest = max(upload_data[-1], download_data[-1])
+        if highest > top:
+            self.network_ax.set_ylim(0, highest * 1.25)
+            return True
+
+        return False
 
     def stop(self):
-        self.is_running = False
+        if self.engine is not None:
+            self.engine.stop()
 
-def main():
-    root = tk.Tk()
+def main(root=None):
+    # A window already shown by startup.py, or a new one
+    if root is None:
+        root = tk.Tk()
     app = SystemMonitorApp(root)
 
     def on_closing():
@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
-import psutil
+from collector import Collector
 
 class SystemMonitorApp:
     def __init__(self, root):
@@ -19,20 +19,30 @@ class SystemMonitorApp:
         self.memory_gauge = ttk.Progressbar(root, orient="horizontal", length=300, mode="determinate")
         self.memory_gauge.pack()
 
-        self.update_gauges()
+        # Sample on a background thread, the Tk loop only reads snapshots
+        self.collector = Collector()
+        self.collector.start()
+        self.collector.schedule(self.root, self.update_gauges)
         
-    def update_gauges(self):
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory_percent = psutil.virtual_memory().percent
+    def update_gauges(self, snapshot):
+        cpu_percent = snapshot.cpu_percent
+        memory_percent = snapshot.virtual_memory.percent
 
         self.cpu_gauge["value"] = cpu_percent
         self.memory_gauge["value"] = memory_percent
 
-        self.root.after(1000, self.update_gauges)
+    def stop(self):
+        self.collector.stop()
 
 def main():
     root = tk.Tk()
     app = SystemMonitorApp(root)
+
+    def on_closing():
+        app.stop()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_closing)
     root.mainloop()
 
 if __name__ == "__main__":
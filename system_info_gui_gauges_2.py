@@ -1,13 +1,12 @@
 import tkinter as tk
 from tkinter import ttk
-import psutil
-import threading
+from collector_engine import CollectorEngine, default_groups
+from rate_engine import RateEngine
 import atexit
-import time
 
 
 class SystemMonitorApp:
-    def __init__(self, root):
+    def __init__(self, root, source=None):
         self.root = root
         self.root.title("System Monitor")
 
@@ -54,43 +53,63 @@ class SystemMonitorApp:
         self.network_percent_label = ttk.Label(self.container, text="0 KB/s")
         self.network_percent_label.pack()
 
-        self.is_running = True
-        self.update_thread = threading.Thread(target=self.update_gauges_thread)
-        self.update_thread.start()
+        # Network rates over the real time between snapshots
+        self.rate_engine = RateEngine()
+
+        callbacks = {
+            "cpu": self.update_cpu,
+            "mem": self.update_memory,
+            "disk": self.update_disk,
+            "net": self.update_network,
+        }
+        if source is None:
+            # Every group is read on its own schedule off the Tk thread,
+            # the Tk loop only shows the newest readings
+            self.engine = CollectorEngine(default_groups(("cpu", "mem", "disk", "net")))
+            self.engine.start()
+            self.engine.schedule(self.root, callbacks)
+        else:
+            # Shown from the snapshots launcher.py takes for every view
+            self.engine = None
+            source.subscribe_groups(callbacks, self.root)
 
         # Register cleanup function to stop threads on exit
         atexit.register(self.cleanup)
 
     def cleanup(self):
-        self.is_running = False
-        self.update_thread.join()
+        self.stop()
 
-    def update_gauges_thread(self):
-        while self.is_running:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory_percent = psutil.virtual_memory().percent
-            disk_percent = psutil.disk_usage('/').percent
-            network_percent = psutil.net_io_counters().bytes_sent / 1024
-
-            self.root.after(0, self.update_gauges, cpu_percent,
-                            memory_percent, disk_percent, network_percent)
-            time.sleep(1)  # Add a small delay to prevent busy-waiting
-
-    def update_gauges(self, cpu_percent, memory_percent, disk_percent, network_percent):
+    def update_cpu(self, reading):
+        cpu_percent = reading.value
         self.cpu_gauge["value"] = cpu_percent
         self.cpu_percent_label.config(text=f"{cpu_percent:.1f}%")
 
+    def update_memory(self, reading):
+        memory_percent = reading.value.percent
         self.memory_gauge["value"] = memory_percent
         self.memory_percent_label.config(text=f"{memory_percent:.1f}%")
 
+    def update_disk(self, reading):
+        disk_percent = reading.value['/'].percent
         self.disk_gauge["value"] = disk_percent
         self.disk_percent_label.config(text=f"{disk_percent:.1f}%")
 
-        self.network_gauge["value"] = network_percent
-        self.network_percent_label.config(text=f"{network_percent:.1f} KB/s")
+    def update_network(self, reading):
+        # Rates over the real time between the two net readings
+        network_stats = self.rate_engine.update_counters(
+            "net", reading.value, reading.timestamp)
+        upload_speed = network_stats["bytes_sent"] / 1024
+        download_speed = network_stats["bytes_recv"] / 1024
+
+        # One bar for both directions, show the busier one
+        self.network_gauge["value"] = max(upload_speed, download_speed) / 100
+        self.network_percent_label.config(
+            text=f"Upload: {upload_speed:.1f} KB/s  "
+                 f"Download: {download_speed:.1f} KB/s")
 
     def stop(self):
-        self.is_running = False
+        if self.engine is not None:
+            self.engine.stop()
 
 
 def main():
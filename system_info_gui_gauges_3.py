@@ -1,13 +1,13 @@
 import tkinter as tk
 from tkinter import ttk
-import psutil
-import threading
+from collector_engine import CollectorEngine, default_groups
+from rate_engine import RateEngine
+from circular_gauge import CircularGauge
 import atexit
-import time
 
 
 class SystemMonitorApp:
-    def __init__(self, root):
+    def __init__(self, root, source=None):
         self.root = root
         self.root.title("System Monitor")
 
@@ -19,6 +19,7 @@ class SystemMonitorApp:
 
         self.cpu_canvas = tk.Canvas(self.container, width=150, height=150)
         self.cpu_canvas.pack()
+        self.cpu_gauge = CircularGauge(self.cpu_canvas)
 
         self.cpu_percent_label = ttk.Label(self.container, text="0%")
         self.cpu_percent_label.pack()
@@ -28,6 +29,7 @@ class SystemMonitorApp:
 
         self.memory_canvas = tk.Canvas(self.container, width=150, height=150)
         self.memory_canvas.pack()
+        self.memory_gauge = CircularGauge(self.memory_canvas)
 
         self.memory_percent_label = ttk.Label(self.container, text="0%")
         self.memory_percent_label.pack()
@@ -37,6 +39,7 @@ class SystemMonitorApp:
 
         self.network_canvas = tk.Canvas(self.container, width=150, height=150)
         self.network_canvas.pack()
+        self.network_gauge = CircularGauge(self.network_canvas)
 
         self.network_upload_label = ttk.Label(
             self.container, text="Upload: 0 KB/s")
@@ -46,59 +49,59 @@ class SystemMonitorApp:
             self.container, text="Download: 0 KB/s")
         self.network_download_label.pack()
 
-        self.is_running = True
-        self.update_thread = threading.Thread(target=self.update_gauges_thread)
-        self.update_thread.start()
+        # Network rates over the real time between snapshots
+        self.rate_engine = RateEngine()
+
+        callbacks = {
+            "cpu": self.update_cpu,
+            "mem": self.update_memory,
+            "net": self.update_network,
+        }
+        if source is None:
+            # Every group is read on its own schedule off the Tk thread,
+            # the Tk loop only shows the newest readings
+            self.engine = CollectorEngine(default_groups(("cpu", "mem", "net")))
+            self.engine.start()
+            self.engine.schedule(self.root, callbacks)
+        else:
+            # Shown from the snapshots launcher.py takes for every view
+            self.engine = None
+            source.subscribe_groups(callbacks, self.root)
 
         # Register cleanup function to stop threads on exit
         atexit.register(self.cleanup)
 
     def cleanup(self):
-        self.is_running = False
-        self.update_thread.join()
-
-    def draw_circular_gauge(self, canvas, percent):
-        x = y = 75
-        radius = 60
-        start_angle = 90  # Start from top (12 o'clock)
-        extent = -360 * percent / 100  # Calculate extent in degrees
-
-        canvas.create_arc(
-            x - radius, y - radius, x + radius, y + radius,
-            start=start_angle, extent=extent,
-            fill="green", outline=''
-        )
-
-    def update_gauges_thread(self):
-        while self.is_running:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory_percent = psutil.virtual_memory().percent
-            network_stats = psutil.net_io_counters()
-
-            self.root.after(0, self.update_gauges, cpu_percent,
-                            memory_percent, network_stats)
-            time.sleep(1)  # Add a small delay to prevent busy-waiting
-
-    def update_gauges(self, cpu_percent, memory_percent, network_stats):
-        self.draw_circular_gauge(self.cpu_canvas, cpu_percent)
+        self.stop()
+
+    def update_cpu(self, reading):
+        cpu_percent = reading.value
+        self.cpu_gauge.set(cpu_percent)
         self.cpu_percent_label.config(text=f"{cpu_percent:.1f}%")
 
-        self.draw_circular_gauge(self.memory_canvas, memory_percent)
+    def update_memory(self, reading):
+        memory_percent = reading.value.percent
+        self.memory_gauge.set(memory_percent)
         self.memory_percent_label.config(text=f"{memory_percent:.1f}%")
 
-        upload_speed = network_stats.bytes_sent / 1024
-        download_speed = network_stats.bytes_recv / 1024
+    def update_network(self, reading):
+        # Rates over the real time between the two net readings
+        network_stats = self.rate_engine.update_counters(
+            "net", reading.value, reading.timestamp)
+        upload_speed = network_stats["bytes_sent"] / 1024
+        download_speed = network_stats["bytes_recv"] / 1024
 
-        self.draw_circular_gauge(self.network_canvas, upload_speed / 100)
+        # One gauge for both directions, show the busier one
+        self.network_gauge.set(max(upload_speed, download_speed) / 100)
         self.network_upload_label.config(
             text=f"Upload: {upload_speed:.1f} KB/s")
 
-        self.draw_circular_gauge(self.network_canvas, download_speed / 100)
         self.network_download_label.config(
             text=f"Download: {download_speed:.1f} KB/s")
 
     def stop(self):
-        self.is_running = False
+        if self.engine is not None:
+            self.engine.stop()
 
 
 def main():
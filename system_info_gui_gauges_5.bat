@@ -1,5 +1,7 @@
 cd c:\temp
 
+rem startup.py shows the first frame, then imports the view the
+rem executable is named after
 python -m nuitka ^
     --mingw64 ^
     --lto=no ^
@@ -7,7 +9,9 @@ python -m nuitka ^
     --enable-plugin=tk-inter ^
     --windows-console-mode=disable ^
     --windows-icon-from-ico=airplay.ico ^
-    system_info_gui_gauges_5.py
+    --include-module=system_info_gui_gauges_5 ^
+    --output-filename=system_info_gui_gauges_5.exe ^
+    startup.py
 pause
 
 rem     --windows-disable-console ^
\ No newline at end of file
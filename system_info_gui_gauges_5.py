@@ -6,60 +6,86 @@
     Purpose: Test program with functions for monitoring CPU
     and RAM usage in Python with PsUtil.
 """
-import psutil
-import threading
 import tkinter as tk
 import tkinter.ttk as ttk
+from collector import Collector
+from proc_sampler import make_sampler
+from disk_io import DiskIO, MountProber
+from net_io import NetIO, link_utilisation
+from tk_binding import TkBinding
 
 
 class App:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.geometry("600x170")
+    def __init__(self, root=None, source=None):
+        # Snapshots shared by every view of launcher.py, None to sample
+        # here
+        self.source = source
+        # A window already shown by startup.py, or a new one
+        self.root = tk.Tk() if root is None else root
+        self.root.geometry("600x590")
         self.root.title("System Info")
+        # Widgets are only changed when their value changes, all in
+        # one idle callback per snapshot
+        self.binding = TkBinding(self.root)
         self.create_widgets()
+        self.bind_widgets()
         self.root.iconbitmap("airplay.ico")
 
-        # Initialize initial network usage counters
-        net_io = psutil.net_io_counters()
-        self.initial_bytes_sent = net_io.bytes_sent
-        self.initial_bytes_recv = net_io.bytes_recv
+        # Sample on a background thread, the Tk loop only reads snapshots
+        self.collector = None
+        if source is None:
+            self.collector = Collector(
+                make_sampler(perdisk=True, pernic=True))
+
+        # Rates of every disk, and usage of every mount probed on
+        # worker threads so a dead network mount can't stall the window
+        self.disk_io = DiskIO()
+        self.mount_prober = MountProber()
+        # {device or mount: Treeview item} so rows are changed in place
+        self.disk_items = {}
+        self.mount_items = {}
+
+        # Rates of every real interface, loopback and bridges left out
+        self.net_io = NetIO()
+        self.nic_items = {}
 
 # -------------------------- UPDATE PROGRESS BARS ------------------------ #
-    def update_progressbars(self):
+    def update_progressbars(self, snapshot):
         """
         Updates the CPU, memory, and disk usage progress bars and their labels.
 
-        This method retrieves the current CPU, memory, and disk usage statistics
+        This method takes the newest snapshot from the collector thread
         and updates the associated progress bars and text labels in the UI.
-        This method is called every 1000 milliseconds to provide real-time updates.
+        It runs on the Tk main thread each time the collector takes a snapshot.
         """
+        virtual_memory = snapshot.virtual_memory
+        disk_usage = snapshot.disk_usage['/']
 
         # Get current CPU usage percentage
-        cpu_percent = psutil.cpu_percent()
+        cpu_percent = snapshot.cpu_percent
 
         # Get current memory usage percentage
-        memory_percent = psutil.virtual_memory().percent
+        memory_percent = virtual_memory.percent
 
         # Get current disk usage percentage for the root directory
-        disk_percent = psutil.disk_usage('/').percent
+        disk_percent = disk_usage.percent
 
         # Calculate total and used memory in gigabytes, rounded to two decimal places
-        memory_total = round(psutil.virtual_memory().total / (1024.0 ** 3), 2)
-        memory_used = round(psutil.virtual_memory().used / (1024.0 ** 3), 2)
+        memory_total = round(virtual_memory.total / (1024.0 ** 3), 2)
+        memory_used = round(virtual_memory.used / (1024.0 ** 3), 2)
 
         # Calculate total and used disk space in gigabytes, rounded to two decimal places
-        disk_total = round(psutil.disk_usage('/').total / (1024.0 ** 3), 2)
-        disk_used = round(psutil.disk_usage('/').used / (1024.0 ** 3), 2)
+        disk_total = round(disk_usage.total / (1024.0 ** 3), 2)
+        disk_used = round(disk_usage.used / (1024.0 ** 3), 2)
 
         # Update CPU progress bar with current CPU usage
-        self.cpu_progressbar['value'] = cpu_percent
+        self.binding.set("cpu_bar", cpu_percent)
 
         # Update memory progress bar with current memory usage
-        self.memory_progressbar['value'] = memory_percent
+        self.binding.set("memory_bar", memory_percent)
 
         # Update disk progress bar with current disk usage
-        self.disk_progressbar['value'] = disk_percent
+        self.binding.set("disk_bar", disk_percent)
 
         # Format the CPU usage text
         cpu_text_str = f"CPU Usage: {cpu_percent}%"
@@ -73,32 +99,109 @@ class App:
             disk_used}GB/{disk_total}GB ({disk_percent}%)"
 
         # Update the CPU usage text label in the UI
-        self.cpu_text.config(text=cpu_text_str)
+        self.binding.set("cpu_text", cpu_text_str)
 
         # Update the memory usage text label in the UI
-        self.memory_text.config(text=memory_text_str)
+        self.binding.set("memory_text", memory_text_str)
 
         # Update the disk usage text label in the UI
-        self.disk_text.config(text=disk_text_str)
+        self.binding.set("disk_text", disk_text_str)
+
+        # Get the rates of every interface and how busy their links are
+        nics = self.net_io.update(snapshot.net_io_pernic, snapshot.timestamp)
+        # Convert bytes to bits * 8, bits to megabits / 1,000,000
+        sent = round(sum(nic.bytes_sent for nic in nics) * 8 / 1e6, 2)
+        recv = round(sum(nic.bytes_recv for nic in nics) * 8 / 1e6, 2)
+        utilisation = link_utilisation(nics)
 
-        # Get network usage data (in bytes) and calculate the MB usage
-        net_io = psutil.net_io_counters()
-        bytes_sent = round(
-            # Convert to MB
-            (net_io.bytes_sent - self.initial_bytes_sent) / (1024 ** 2), 2)
-        bytes_recv = round(
-            # Convert to MB
-            (net_io.bytes_recv - self.initial_bytes_recv) / (1024 ** 2), 2)
+        # Update network progress bar with the share of link capacity used
+        self.binding.set("network_bar", utilisation or 0)
 
         # Format the network usage text
-        network_text_str = f"Sent: {
-            bytes_sent} MB / Received: {bytes_recv} MB"
+        network_text_str = f"Sent: {sent} Mbps / Received: {recv} Mbps"
+        if utilisation is not None:
+            network_text_str += f" ({utilisation:.1f}%)"
 
         # Update the network usage text label in the UI
-        self.network_text.config(text=network_text_str)
+        self.binding.set("network_text", network_text_str)
 
-        # Schedule the next update of the progress bars after 1000 milliseconds
-        self.root.after(1000, self.update_progressbars)
+        self.update_nic_tree(nics)
+        self.update_disk_trees(snapshot)
+
+# -------------------------- UPDATE NIC TREE ----------------------------- #
+    def update_nic_tree(self, nics):
+        """
+        Updates the traffic, errors and drops of every interface.
+        """
+        nic_rows = {}
+        for nic in nics:
+            # Link speed when the driver knows it, otherwise up or down
+            link = "up" if nic.isup else "down"
+            if nic.speed:
+                link = f"{nic.speed} Mb"
+            nic_rows[nic.interface] = (
+                nic.interface,
+                f"{nic.bytes_sent * 8 / 1e6:,.2f}",
+                f"{nic.bytes_recv * 8 / 1e6:,.2f}",
+                f"{nic.packets_sent + nic.packets_recv:,.0f}",
+                f"{nic.errors:,.0f}",
+                f"{nic.drops:,.0f}",
+                link
+            )
+        self.fill_tree(self.nic_tree, self.nic_items, nic_rows)
+
+# -------------------------- UPDATE DISK TREES --------------------------- #
+    def update_disk_trees(self, snapshot):
+        """
+        Updates the throughput of every disk and the usage of every mount.
+        """
+        disk_rows = {}
+        for disk in self.disk_io.update(
+                snapshot.disk_io_perdisk, snapshot.timestamp):
+            disk_rows[disk.device] = (
+                disk.device,
+                f"{disk.read_bytes / (1024 ** 2):,.1f}",
+                f"{disk.write_bytes / (1024 ** 2):,.1f}",
+                f"{disk.read_iops + disk.write_iops:,.0f}",
+                f"{disk.service_ms:,.1f}",
+                f"{disk.busy_percent:.0f}%"
+            )
+        self.fill_tree(self.disk_tree, self.disk_items, disk_rows)
+
+        mount_rows = {}
+        for mount in self.mount_prober.probe():
+            if mount.usage is None:
+                used = total = ""
+                percent = mount.state
+            else:
+                used = f"{mount.usage.used / (1024.0 ** 3):,.1f}"
+                total = f"{mount.usage.total / (1024.0 ** 3):,.1f}"
+                percent = f"{mount.usage.percent}%"
+                if mount.state != "ok":
+                    # Last known usage of a mount that stopped answering
+                    percent = f"{percent} ({mount.state})"
+            mount_rows[mount.mount] = (
+                mount.mount, mount.fstype, used, total, percent)
+        self.fill_tree(self.mount_tree, self.mount_items, mount_rows)
+
+# ------------------------------ FILL TREE ------------------------------- #
+    def fill_tree(self, tree, items, rows):
+        """
+        Changes the rows of a Treeview in place, adding rows for new
+        keys and removing the rows of keys that are gone. Rows whose
+        values are the same as last time are left alone.
+        """
+        for key in list(items):
+            if key not in rows:
+                tree.delete(items.pop(key))
+                self.binding.unbind((str(tree), key))
+        for key, values in rows.items():
+            if key not in items:
+                item = items[key] = tree.insert("", tk.END)
+                self.binding.bind_function(
+                    (str(tree), key),
+                    lambda values, item=item: tree.item(item, values=values))
+            self.binding.set((str(tree), key), values)
 
 # -------------------------- CREATE WIDGETS ------------------------------ #
     def create_widgets(self):
@@ -155,13 +258,74 @@ class App:
         self.network_text = tk.Label(self.root, text="")
         self.network_text.grid(row=3, column=2, sticky="w", padx=10, pady=5)
 
+        # Create and position the throughput of every disk
+        self.disk_tree = self.create_tree(
+            4,
+            ("Device", "Read MB/s", "Write MB/s", "IOPS", "Await ms", "Busy"),
+            (90, 80, 80, 70, 80, 60)
+        )
+
+        # Create and position the usage of every mount
+        self.mount_tree = self.create_tree(
+            5,
+            ("Mount", "Type", "Used GB", "Total GB", "Usage"),
+            (160, 70, 80, 80, 110)
+        )
+
+        # Create and position the traffic of every interface
+        self.nic_tree = self.create_tree(
+            6,
+            ("Interface", "Sent Mb/s", "Recv Mb/s", "Packets/s", "Errors/s",
+             "Drops/s", "Link"),
+            (90, 80, 80, 70, 70, 70, 70)
+        )
+
+# -------------------------- BIND WIDGETS -------------------------------- #
+    def bind_widgets(self):
+        """
+        Gives every bar and text label a key to set it with.
+        """
+        for name in ("cpu", "memory", "disk", "network"):
+            self.binding.bind(
+                f"{name}_bar", getattr(self, f"{name}_progressbar"), "value")
+            self.binding.bind(f"{name}_text", getattr(self, f"{name}_text"))
+
+# -------------------------- CREATE TREE --------------------------------- #
+    def create_tree(self, row, headings, widths):
+        """
+        Creates a Treeview across the window with one column per heading.
+        """
+        tree = ttk.Treeview(
+            self.root, columns=headings, show="headings", height=4,
+            selectmode=tk.NONE)
+        for heading, width in zip(headings, widths):
+            tree.heading(heading, text=heading)
+            tree.column(heading, width=width, anchor=tk.E)
+        tree.column(headings[0], anchor=tk.W)
+        tree.grid(row=row, column=0, columnspan=3, padx=10, pady=5)
+        return tree
+
 # -------------------------- START APP ----------------------------------- #
     def start(self):
-        thread = threading.Thread(target=self.update_progressbars)
-        thread.start()
+        if self.source is not None:
+            # launcher.py samples and runs the Tk loop for every view
+            self.source.subscribe(self.update_progressbars, self.root)
+            return
+        # Sample every second, the Tk loop polls for the newest snapshot
+        self.collector.start()
+        self.collector.schedule(self.root, self.update_progressbars)
 
         self.root.mainloop()
+        self.collector.stop()
+
+
+def main(root=None):
+    """
+        :param root: Tk window to show the app in, a new one if None
+    """
+    app = App(root)
+    app.start()
 
 
-app = App()
-app.start()
+if __name__ == "__main__":
+    main()
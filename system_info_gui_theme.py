@@ -11,18 +11,32 @@ import sv_ttk
 import tkinter as tk
 # Override tk widgets with themed ttk widgets if available
 from tkinter import ttk
-import psutil
+from system_sampler import Sampler
+from host_facts import host_facts
+from rate_engine import RateEngine
+from net_io import NetIO
+from tk_binding import TkBinding
 
 
 class SystemInfo:
 
-    def __init__(self):
-        self.sent_1 = 0
-        self.recv_1 = 0
-        self.sent_2 = 0
-        self.recv_2 = 0
-
-        self.root = tk.Tk()
+    def __init__(self, root=None, source=None):
+        # Snapshots shared by every view of launcher.py, None to sample
+        # here
+        self.source = source
+        # Core counts and RAM total don't change, read them once
+        self.facts = host_facts()
+        # Take one snapshot of the system per tick
+        self.sampler = None
+        if source is None:
+            self.sampler = Sampler(pernic=True)
+        # Network rates over the real time between snapshots
+        self.rate_engine = RateEngine()
+        # Only real interfaces, loopback and bridges would count twice
+        self.net_io = NetIO(rate_engine=self.rate_engine)
+
+        # A window already shown by startup.py, or a new one
+        self.root = tk.Tk() if root is None else root
         # self.root.title("System Info")
         self.root.geometry("+100+100")
         self.root.iconbitmap("airplay.ico")
@@ -30,75 +44,102 @@ class SystemInfo:
         # Create transparent window
         self.root.attributes('-alpha', 0.9)
         # Set the theme you want with the set_theme procedure
-        sv_ttk.set_theme("dark")
+        # The theme is for the whole Tk interpreter, next to other
+        # views in launcher.py it would restyle theirs too
+        if source is None:
+            sv_ttk.set_theme("dark")
         self.root.overrideredirect(True)
+        # Labels are only configured when their text changes, all in
+        # one idle callback per tick
+        self.binding = TkBinding(self.root)
 
         # Call method to create all the widgets
         self.create_widgets()
+        self.bind_widgets()
+        self.display_facts()
+        if source is not None:
+            # launcher.py runs the Tk loop for every view
+            source.subscribe(self.get_cpu_info, self.root)
+            return
         self.get_cpu_info()
         # Start GUI
         self.root.mainloop()
 
 # --------------------------- GET CPU INFO --------------------------------#
-    def get_cpu_info(self):
-        # Get current network io statistics in Kbps
-        self.sent_2 = self.sent_1
-        self.recv_2 = self.recv_1
-        self.sent_1, self.recv_1 = self.get_network_io()
+    def get_cpu_info(self, snapshot=None):
+        """
+            Show a snapshot, taken here if launcher.py didn't pass one
+        """
+        # Read every metric once for this tick
+        if snapshot is None:
+            snapshot = self.sampler.sample()
+        virtual_memory = snapshot.virtual_memory
 
-        # Subtract first reading from second reading
-        # gives us how many kilobits were sent/recv per second
-        sent = self.sent_1 - self.sent_2
-        recv = self.recv_1 - self.recv_2
+        # Get current network io statistics in Kbps
+        sent, recv = self.get_network_io(snapshot)
 
         # Get information
-        cpu_count = psutil.cpu_count(logical=False)
-        logical_cpu_count = psutil.cpu_count()
-        cpu_useage_pct = psutil.cpu_percent(interval=None)
+        cpu_useage_pct = snapshot.cpu_percent
         # CPU frequence in Mhz, convert to Ghz
-        cpu_frequency = psutil.cpu_freq().current / 1024
-        # RAM total in bytes, convert to GB
-        ram_total = psutil.virtual_memory().total / 1024 / 1024 / 1024
+        cpu_frequency = snapshot.cpu_freq.current / 1024
         # RAM useage in bytes, convert to GB
         ram_useage = int(
-            psutil.virtual_memory().total -
-            psutil.virtual_memory().available) / 1024 / 1024 / 1024
-        ram_useage_pct = psutil.virtual_memory().percent
-
-        # Display CPU info
-        self.cpu_label_value.configure(text=f" {cpu_count}")
-        self.logical_cpu_label_value.configure(text=f" {logical_cpu_count}")
-        self.cpu_percent_label_value.configure(text=f" {cpu_useage_pct} %")
-        self.cpu_frequency_label_value.configure(
-            text=f" {cpu_frequency:,.2f} Ghz")
-
-        # Display RAM info
-        self.ram_total_label_value.configure(
-            text=f" {ram_total:,.2f} GB")
-        self.ram_useage_label_value.configure(
-            text=f" {ram_useage:,.2f} GB")
-        self.ram_useage_pct_label_value.configure(
-            text=f" {ram_useage_pct} %")
-
-        # Display Network IO
-        self.net_sent_label_value.configure(
-            text=f" {sent:,.1f} Kbps")
-        self.net_recv_label_value.configure(
-            text=f" {recv:,.1f} Kbps")
-
-        # Schedule after in 1 second
-        self.root.after(1000, self.get_cpu_info)
+            virtual_memory.total -
+            virtual_memory.available) / 1024 / 1024 / 1024
+        ram_useage_pct = virtual_memory.percent
+
+        self.binding.update({
+            # CPU info
+            "cpu_percent": f" {cpu_useage_pct} %",
+            "cpu_frequency": f" {cpu_frequency:,.2f} Ghz",
+            # RAM info
+            "ram_useage": f" {ram_useage:,.2f} GB",
+            "ram_useage_pct": f" {ram_useage_pct} %",
+            # Network IO
+            "net_sent": f" {sent:,.1f} Kbps",
+            "net_recv": f" {recv:,.1f} Kbps",
+        })
+
+        # Schedule after in 1 second, launcher.py calls us with its own
+        if self.source is None:
+            self.root.after(1000, self.get_cpu_info)
+
+# --------------------------- BIND WIDGETS --------------------------------#
+    def bind_widgets(self):
+        """
+            Give every label that changes a key to set it with
+        """
+        binding = self.binding
+        binding.bind("cpu_percent", self.cpu_percent_label_value)
+        binding.bind("cpu_frequency", self.cpu_frequency_label_value)
+        binding.bind("ram_useage", self.ram_useage_label_value)
+        binding.bind("ram_useage_pct", self.ram_useage_pct_label_value)
+        binding.bind("net_sent", self.net_sent_label_value)
+        binding.bind("net_recv", self.net_recv_label_value)
+
+# --------------------------- DISPLAY FACTS -------------------------------#
+    def display_facts(self):
+        """
+            Fill the labels that never change, once
+        """
+        self.cpu_label_value.configure(text=f" {self.facts.cpu_count}")
+        self.logical_cpu_label_value.configure(
+            text=f" {self.facts.logical_cpu_count}")
+        # RAM total in bytes, convert to GB
+        ram_total = self.facts.ram_total / 1024 / 1024 / 1024
+        self.ram_total_label_value.configure(text=f" {ram_total:,.2f} GB")
 
 # ------------------------- GET NETWORK IO --------------------------------#
-    def get_network_io(self):
-        """Get current net io counters statistics in bytes
-            convert to bits, then kb
+    def get_network_io(self, snapshot):
         """
-        sent = psutil.net_io_counters().bytes_sent
-        recv = psutil.net_io_counters().bytes_recv
+            Get net io rates in bytes per second over the real time
+            since the last snapshot of the real interfaces, convert to
+            bits, then kb
+        """
+        nics = self.net_io.update(snapshot.net_io_pernic, snapshot.timestamp)
         # Convert bytes to bits *8, convert bits to kilobits / 1024
-        sent = (sent * 8) / 1024
-        recv = (recv * 8) / 1024
+        sent = (sum(nic.bytes_sent for nic in nics) * 8) / 1024
+        recv = (sum(nic.bytes_recv for nic in nics) * 8) / 1024
 
         return sent, recv
 
@@ -266,5 +307,13 @@ class SystemInfo:
 
 
 # -------------------------- RUN PROGRAM ----------------------------------#
-"""Create program object to start the program"""
-system_info = SystemInfo()
+def main(root=None):
+    """
+        Create program object to start the program
+        :param root: Tk window to show the program in, a new one if None
+    """
+    SystemInfo(root)
+
+
+if __name__ == "__main__":
+    main()
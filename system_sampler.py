@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+    Name: system_sampler.py
+    Created: 10/18/26
+    Purpose: Take one consistent psutil snapshot per tick so every
+    front end reads its numbers from the same moment
+"""
+import time
+from collections import namedtuple
+# pip install psutil
+import psutil
+
+# One reading of everything the front ends display
+# timestamp is time.monotonic_ns() when the snapshot was taken
+# cpu_percpu is a list with one busy percent per core and
+# cpu_times_percpu the user/system/idle... percents of every core,
+# both None unless asked for
+# disk_io_perdisk is a dict of {device: disk_io_counters} and
+# net_io_pernic a dict of {interface: net_io_counters}, None unless asked for
+# disk_io and cpu_stats are None unless asked for, only a few readers
+# use them and they cost as much to read as everything a view shows
+# net_io, disk_io and cpu_stats are raw counters, use RateEngine for rates
+# disk_usage is a dict of {mount: psutil disk_usage namedtuple}
+Snapshot = namedtuple(
+    "Snapshot",
+    [
+        "timestamp",
+        "cpu_percent",
+        "cpu_percpu",
+        "cpu_times_percpu",
+        "cpu_freq",
+        "virtual_memory",
+        "swap_memory",
+        "net_io",
+        "net_io_pernic",
+        "disk_io",
+        "disk_io_perdisk",
+        "cpu_stats",
+        "disk_usage",
+    ]
+)
+
+
+def busy_percent(times):
+    """
+        Work out how busy a core was from its cpu_times_percent(),
+        the same way psutil.cpu_percent() does, idle and iowait are
+        the only times the core is not busy
+        Over short intervals the times don't always add up to 100,
+        so busy is taken as a share of what they do add up to
+        :rtype: float
+    """
+    fields = times._asdict()
+    # guest time is already counted in user time on Linux
+    total = sum(fields.values()) - fields.get("guest", 0.0) \
+        - fields.get("guest_nice", 0.0)
+    if total <= 0:
+        return 0.0
+    idle = times.idle + getattr(times, "iowait", 0.0)
+    busy = (total - idle) / total * 100
+    return round(min(max(busy, 0.0), 100.0), 1)
+
+
+class Sampler:
+    def __init__(self, mounts=("/",), percpu=False, perdisk=False,
+                 pernic=False, diskio=False, cpustats=False,
+                 provider=psutil):
+        """
+            Sample the system once per tick
+            :param mounts: Mount points to read disk usage for
+            :param percpu: Also read the CPU percents of every core
+            :param perdisk: Also read the I/O counters of every disk
+            :param pernic: Also read the counters of every interface
+            :param diskio: Also read the I/O counters of all disks
+            :param cpustats: Also read the context switch and interrupt
+            counters
+            :param provider: Module with the psutil functions we call
+        """
+        self.mounts = tuple(mounts)
+        self.percpu = percpu
+        self.perdisk = perdisk
+        self.pernic = pernic
+        self.diskio = diskio
+        self.cpustats = cpustats
+        self.provider = provider
+
+        # The first cpu_percent(interval=None) call always returns 0.0,
+        # prime it so the first snapshot compares against this moment
+        self.provider.cpu_percent(interval=None)
+        if percpu:
+            self.provider.cpu_times_percent(interval=None, percpu=True)
+
+# ------------------------------ SAMPLE ---------------------------------- #
+    def sample(self):
+        """
+            Read every metric exactly once
+            :returns: Snapshot of the system at this moment
+            :rtype: Snapshot
+        """
+        provider = self.provider
+
+        # One disk_usage call per mount
+        disk_usage = {}
+        for mount in self.mounts:
+            disk_usage[mount] = provider.disk_usage(mount)
+
+        cpu_percpu = None
+        cpu_times_percpu = None
+        if self.percpu:
+            # One read gives both the busy percent and the
+            # user/system/iowait breakdown of every core
+            cpu_times_percpu = provider.cpu_times_percent(
+                interval=None, percpu=True)
+            cpu_percpu = [busy_percent(times) for times in cpu_times_percpu]
+
+        disk_io = disk_io_perdisk = None
+        if self.diskio:
+            disk_io = provider.disk_io_counters()
+        if self.perdisk:
+            disk_io_perdisk = provider.disk_io_counters(perdisk=True)
+        net_io_pernic = None
+        if self.pernic:
+            net_io_pernic = provider.net_io_counters(pernic=True)
+        cpu_stats = None
+        if self.cpustats:
+            cpu_stats = provider.cpu_stats()
+
+        return Snapshot(
+            timestamp=time.monotonic_ns(),
+            cpu_percent=provider.cpu_percent(interval=None),
+            cpu_percpu=cpu_percpu,
+            cpu_times_percpu=cpu_times_percpu,
+            cpu_freq=provider.cpu_freq(),
+            virtual_memory=provider.virtual_memory(),
+            swap_memory=provider.swap_memory(),
+            net_io=provider.net_io_counters(),
+            net_io_pernic=net_io_pernic,
+            disk_io=disk_io,
+            disk_io_perdisk=disk_io_perdisk,
+            cpu_stats=cpu_stats,
+            disk_usage=disk_usage
+        )
@@ -0,0 +1,11 @@
+"""
+    Name: conftest.py
+    Created: 10/18/26
+    Purpose: Import the modules at the top of the repository from the
+    tests, they are scripts and not an installed package
+"""
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS))
@@ -0,0 +1,156 @@
+"""
+    Name: test_adaptive_sampler.py
+    Created: 10/18/26
+    Purpose: Groups back off while the host is idle and go back to fast
+    readings as soon as a value moves or crosses a threshold
+"""
+import types
+import numpy as np
+import pytest
+import adaptive_sampler
+from adaptive_sampler import AdaptiveSampler, MetricGroup, FAST_SECONDS, \
+    SLOW_SECONDS
+from fake_psutil import FakeSystem, ScriptedTrace
+
+# Sample the step happens at, well after every group has backed off
+STEP = 200
+
+
+class Clock:
+    """
+        time.monotonic() that only moves when the test moves it
+    """
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def monotonic_ns(self):
+        return int(self.now * 1e9)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(adaptive_sampler, "time", types.SimpleNamespace(
+        monotonic=clock.monotonic, monotonic_ns=clock.monotonic_ns))
+    return clock
+
+
+def make_sampler(functions):
+    # Nothing moves unless the test scripts it
+    flat = {"cpu_percent": lambda seconds: 20.0,
+            "ram_percent": lambda seconds: 50.0,
+            "net_sent": lambda seconds: 0.0,
+            "net_recv": lambda seconds: 0.0}
+    trace = ScriptedTrace(4, functions=dict(flat, **functions))
+    return AdaptiveSampler(provider=FakeSystem(trace=trace))
+
+
+def run(sampler, clock, count):
+    """
+        Sample count times, sleeping until the next group is due
+    """
+    for i in range(count):
+        clock.now += sampler.next_delay()
+        sampler.sample()
+
+
+def test_flat_trace_backs_off(clock):
+    sampler = make_sampler({})
+    run(sampler, clock, 100)
+    assert set(sampler.periods().values()) == {SLOW_SECONDS}
+    assert sampler.next_delay() <= SLOW_SECONDS
+
+
+def test_periods_double_while_idle(clock):
+    group = MetricGroup("cpu", lambda: 20.0, lambda value: value, change=5.0)
+    periods = []
+    for i in range(10):
+        group.update(clock.now)
+        periods.append(group.period)
+        clock.now = group.due
+    assert periods == [min(FAST_SECONDS * 2 ** i, SLOW_SECONDS)
+                       for i in range(10)]
+
+
+def test_step_change_goes_back_to_fast(clock):
+    step = STEP * FakeSystem().interval
+    sampler = make_sampler({
+        "cpu_percent": lambda seconds: np.where(seconds < step, 20.0, 60.0),
+        "ram_percent": lambda seconds: np.where(seconds < step, 50.0, 70.0),
+    })
+    provider = sampler.provider
+    # The counters are read at every sample, one trace step each
+    while provider.index < STEP - 1:
+        run(sampler, clock, 1)
+    assert sampler.periods()["cpu"] == SLOW_SECONDS
+    assert sampler.periods()["memory"] == SLOW_SECONDS
+
+    run(sampler, clock, 1)
+    assert sampler.periods()["cpu"] == FAST_SECONDS
+    assert sampler.next_delay() <= FAST_SECONDS
+    # Memory is only read when it is due, then it goes fast too
+    run(sampler, clock, int(SLOW_SECONDS / FAST_SECONDS) + 1)
+    assert sampler.by_name["memory"].value.percent == 70.0
+    # And backs off again once the new level holds
+    run(sampler, clock, 100)
+    assert sampler.periods()["cpu"] == SLOW_SECONDS
+
+
+def test_memory_goes_fast_when_read_after_step(clock):
+    levels = iter([50.0, 50.0, 50.0, 70.0])
+    group = MetricGroup("memory", lambda: next(levels), lambda value: value,
+                        change=2.0)
+    for i in range(3):
+        group.update(clock.now)
+        clock.now = group.due
+    assert group.period == FAST_SECONDS * 4
+    group.update(clock.now)
+    assert group.period == FAST_SECONDS
+
+
+@pytest.mark.parametrize("old, new, fast", [
+    # Absolute change
+    (20.0, 24.0, False),
+    (20.0, 25.0, True),
+    # Crossing a threshold, even by a little
+    (79.0, 81.0, True),
+    (81.0, 79.0, True),
+    # Staying above the last threshold
+    (96.0, 96.5, True),
+])
+def test_absolute_change_and_thresholds(clock, old, new, fast):
+    levels = iter([old, old, new])
+    group = MetricGroup("cpu", lambda: next(levels), lambda value: value,
+                        change=5.0, thresholds=(80.0, 95.0))
+    for i in range(2):
+        group.update(clock.now)
+        clock.now = group.due
+    group.update(clock.now)
+    assert (group.period == FAST_SECONDS) == fast
+
+
+@pytest.mark.parametrize("rate, fast", [
+    # Under both the absolute change and a quarter of the last rate
+    (1_150_000, False),
+    # A quarter more than the last rate
+    (1_250_000, True),
+])
+def test_relative_change_of_counter_rate(clock, rate, fast):
+    counter = [0]
+
+    def read():
+        return counter[0]
+
+    group = MetricGroup("net", read, lambda value: value, change=10_000,
+                        relative=0.25, counter=True)
+    for i in range(6):
+        group.update(clock.now)
+        clock.now += 1.0
+        counter[0] += 1_000_000
+    assert group.period > FAST_SECONDS
+    counter[0] += rate - 1_000_000
+    group.update(clock.now)
+    assert (group.period == FAST_SECONDS) == fast
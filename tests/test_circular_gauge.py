@@ -0,0 +1,85 @@
+"""
+    Name: test_circular_gauge.py
+    Created: 10/18/26
+    Purpose: A gauge keeps the same canvas items however often it is set
+"""
+import tkinter as tk
+import pytest
+from circular_gauge import CircularGauge
+
+UPDATES = 10_000
+
+
+class StubCanvas:
+    """
+        The tk.Canvas calls a gauge makes, items are kept in a dict
+    """
+    def __init__(self):
+        self.items = {}
+
+    def create(self, kind, coords, options):
+        item = len(self.items) + 1
+        self.items[item] = {"kind": kind, "coords": coords, **options}
+        return item
+
+    def create_oval(self, *coords, **options):
+        return self.create("oval", coords, options)
+
+    def create_arc(self, *coords, **options):
+        return self.create("arc", coords, options)
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def coords(self, item, *coords):
+        self.items[item]["coords"] = coords
+
+    def find_all(self):
+        return tuple(self.items)
+
+
+def set_many(gauge):
+    for update in range(UPDATES):
+        # Every value from 0 to 100, some repeated
+        gauge.set(update % 101)
+
+
+def test_item_count_constant_stub():
+    canvas = StubCanvas()
+    gauge = CircularGauge(canvas)
+    before = len(canvas.find_all())
+    set_many(gauge)
+    assert len(canvas.find_all()) == before
+
+
+def test_item_count_constant_tk():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display for Tk")
+    try:
+        canvas = tk.Canvas(root, width=150, height=150)
+        gauge = CircularGauge(canvas)
+        before = len(canvas.find_all())
+        set_many(gauge)
+        assert len(canvas.find_all()) == before
+    finally:
+        root.destroy()
+
+
+def test_no_center_text():
+    canvas = StubCanvas()
+    CircularGauge(canvas).set(50)
+    # The percent label under the gauge shows the value
+    assert [item["kind"] for item in canvas.items.values()] == \
+        ["oval", "arc"]
+
+
+def test_arc_hidden_at_zero_and_clamped():
+    canvas = StubCanvas()
+    gauge = CircularGauge(canvas)
+    gauge.set(150)
+    assert canvas.items[gauge.arc]["extent"] == -360
+    assert canvas.items[gauge.arc]["state"] == tk.NORMAL
+    gauge.set(-5)
+    assert canvas.items[gauge.arc]["state"] == tk.HIDDEN
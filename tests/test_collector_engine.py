@@ -0,0 +1,81 @@
+"""
+    Name: test_collector_engine.py
+    Created: 10/18/26
+    Purpose: Groups keep to their deadline grid, a slow or failing group
+    never holds up the others and stop() never waits on a hung read
+"""
+import threading
+import time
+from collector_engine import CollectorEngine, CollectorGroup
+
+PERIOD = 0.05
+
+
+def run_for(engine, seconds):
+    readings = []
+    engine.subscribe(readings.append)
+    engine.start()
+    time.sleep(seconds)
+    engine.stop()
+    return readings
+
+
+def test_grid_does_not_drift():
+    # Every read takes most of a period, that time must not add up
+    group = CollectorGroup("cpu", lambda: time.sleep(PERIOD * 0.6),
+                           PERIOD, jitter=0)
+    readings = run_for(CollectorEngine([group], seed=1), 1.0)
+
+    first = readings[0].timestamp
+    for reading in readings:
+        ticks = (reading.timestamp - first) / 1e9 / PERIOD
+        assert abs(ticks - round(ticks)) < 0.4
+    # One read per period, none lost to drift
+    ticks = round((readings[-1].timestamp - first) / 1e9 / PERIOD)
+    assert ticks == len(readings) - 1
+    assert len(readings) >= 1.0 / PERIOD - 3
+    assert group.overruns == 0
+
+
+def test_slow_group_does_not_hold_up_others():
+    slow = CollectorGroup("disk", lambda: time.sleep(0.5), PERIOD, jitter=0)
+    fast = CollectorGroup("cpu", lambda: 1, PERIOD, jitter=0)
+    run_for(CollectorEngine([slow, fast], seed=1), 1.0)
+    assert slow.runs <= 2
+    assert slow.overruns > 0
+    assert fast.runs >= 1.0 / PERIOD - 3
+
+
+def test_failing_subscriber_does_not_stop_its_group():
+    a = CollectorGroup("a", lambda: 1, PERIOD, jitter=0)
+    b = CollectorGroup("b", lambda: 2, PERIOD, jitter=0)
+    engine = CollectorEngine([a, b], seed=1)
+
+    def subscriber(reading):
+        if reading.name == "a":
+            raise ValueError("broken subscriber")
+
+    engine.subscribe(subscriber)
+    readings = run_for(engine, 0.5)
+    assert a.runs >= 0.5 / PERIOD - 3
+    assert abs(a.runs - b.runs) <= 1
+    assert a.errors == a.runs
+    assert b.errors == 0
+    # Subscribers after the failing one still get every reading
+    assert sum(reading.name == "a" for reading in readings) == a.runs
+
+
+def test_stop_does_not_wait_for_hung_read():
+    release = threading.Event()
+    hung = CollectorGroup("disk", lambda: release.wait(10), PERIOD, jitter=0)
+    fast = CollectorGroup("cpu", lambda: 1, PERIOD, jitter=0)
+    engine = CollectorEngine([hung, fast], seed=1)
+    engine.start()
+    time.sleep(0.2)
+    try:
+        start = time.monotonic()
+        engine.stop()
+        assert time.monotonic() - start < 1.5
+    finally:
+        release.set()
+    assert fast.runs >= 2
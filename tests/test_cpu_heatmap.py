@@ -0,0 +1,89 @@
+"""
+    Name: test_cpu_heatmap.py
+    Created: 10/18/26
+    Purpose: Per-core history keeps the last samples in order and its
+    stats per core and per NUMA node are right
+"""
+import numpy as np
+import pytest
+from cpu_heatmap import CoreHistory, parse_cpu_list, read_numa_nodes
+
+NODES = [("node0", np.array([0, 1])), ("node1", np.array([2, 3]))]
+
+
+@pytest.mark.parametrize("text, cores", [
+    ("0-3,8,10-11", [0, 1, 2, 3, 8, 10, 11]),
+    ("0\n", [0]),
+    ("4-5", [4, 5]),
+    ("", []),
+])
+def test_parse_cpu_list(text, cores):
+    assert parse_cpu_list(text) == cores
+
+
+def test_read_numa_nodes(tmp_path):
+    for node, cores in (("node0", "0-3\n"), ("node1", "4-7,16\n"),
+                        ("node2", "\n")):
+        (tmp_path / node).mkdir()
+        (tmp_path / node / "cpulist").write_text(cores)
+    nodes = read_numa_nodes(8, str(tmp_path))
+    # Cores past core_count and empty nodes are left out
+    assert [(name, cores.tolist()) for name, cores in nodes] \
+        == [("node0", [0, 1, 2, 3]), ("node1", [4, 5, 6, 7])]
+
+
+def test_without_numa_one_node(tmp_path):
+    nodes = read_numa_nodes(4, str(tmp_path))
+    assert [(name, cores.tolist()) for name, cores in nodes] \
+        == [("node0", [0, 1, 2, 3])]
+
+
+def test_window_wraps_in_order():
+    history = CoreHistory(4, length=5, nodes=NODES)
+    assert history.view().shape == (4, 0)
+    for i in range(12):
+        history.append([i, i + 100, 0, 50])
+    assert len(history) == 5
+    view = history.view()
+    assert view[0].tolist() == [7, 8, 9, 10, 11]
+    assert view[1].tolist() == [107, 108, 109, 110, 111]
+    assert history.latest().tolist() == [11, 111, 0, 50]
+    # Always one slice of the doubled buffer, never a copy
+    assert np.shares_memory(view, history._data)
+
+
+def test_core_stats():
+    history = CoreHistory(2, length=100, nodes=NODES[:1])
+    zeros = history.core_stats()
+    assert [values.tolist() for values in zeros] == [[0, 0]] * 3
+    for i in range(150):
+        # Core 0 holds the last 100 of 0..149, core 1 is flat
+        history.append([i, 25])
+    lowest, highest, p95 = history.core_stats()
+    assert lowest.tolist() == [50, 25]
+    assert highest.tolist() == [149, 25]
+    assert p95.tolist() == pytest.approx([np.percentile(
+        np.arange(50, 150), 95), 25])
+
+
+def test_node_stats():
+    history = CoreHistory(4, length=10, nodes=NODES)
+    for i in range(10):
+        history.append([10, 20, 30 + i, 40])
+    (name0, low0, high0, p950), (name1, low1, high1, p951) = \
+        history.node_stats()
+    assert (name0, low0, high0) == ("node0", 10.0, 20.0)
+    assert p950 == pytest.approx(20.0)
+    assert (name1, low1, high1) == ("node1", 30.0, 40.0)
+    assert p951 == pytest.approx(np.percentile(
+        [30 + i for i in range(10)] + [40] * 10, 95))
+
+
+def test_photo_rows():
+    history = CoreHistory(2, length=3, nodes=NODES[:1])
+    history.append([0, 100])
+    history.append([0, 100])
+    rows = history.photo_rows(cell_width=2, cell_height=1)
+    green, red = "#00963c", "#dc0000"
+    assert rows == f"{{{green} {green} {green} {green}}} " \
+        f"{{{red} {red} {red} {red}}}"
@@ -0,0 +1,68 @@
+"""
+    Name: test_disk_io.py
+    Created: 10/18/26
+    Purpose: A hung mount is reported as hung, and mounts stuck in the
+    queue behind it stop reporting their old usage as ok
+"""
+from collections import namedtuple
+import threading
+import time
+from disk_io import MountProber
+
+Partition = namedtuple("Partition", ["device", "mountpoint", "fstype"])
+Usage = namedtuple("Usage", ["total", "used", "free", "percent"])
+
+TIMEOUT = 0.05
+
+
+class HangingProvider:
+    """
+        Mounts whose disk_usage blocks until released, like dead NFS
+    """
+    def __init__(self, mounts):
+        self.mounts = mounts
+        self.hang = set()
+        self.release = threading.Event()
+
+    def disk_partitions(self, all=False):
+        return [Partition("/dev/" + mount.strip("/"), mount, "ext4")
+                for mount in self.mounts] if not all else []
+
+    def disk_usage(self, mount):
+        if mount in self.hang:
+            self.release.wait(5)
+        return Usage(100, 50, 50, 50.0)
+
+
+def probe_until(prober, done, seconds=2.0):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        states = {mount.mount: mount.state for mount in prober.probe()}
+        if done(states):
+            return states
+        time.sleep(TIMEOUT / 5)
+    return states
+
+
+def test_mounts_answer_ok():
+    prober = MountProber(timeout=TIMEOUT, provider=HangingProvider(["/a"]))
+    states = probe_until(prober, lambda states: states["/a"] == "ok")
+    assert states == {"/a": "ok"}
+
+
+def test_queued_probe_times_out():
+    provider = HangingProvider(["/a", "/b"])
+    prober = MountProber(timeout=TIMEOUT, workers=1, provider=provider)
+    try:
+        probe_until(prober, lambda states: states == {"/a": "ok", "/b": "ok"})
+        # /a hangs the only worker, so the next probe of /b never starts
+        provider.hang.add("/a")
+        time.sleep(TIMEOUT * 2)
+        states = probe_until(
+            prober, lambda states: states == {"/a": "hung", "/b": "waiting"})
+        assert states == {"/a": "hung", "/b": "waiting"}
+        assert prober.pending["/b"][1] is None
+    finally:
+        provider.release.set()
+    states = probe_until(prober, lambda states: states == {"/a": "ok", "/b": "ok"})
+    assert states == {"/a": "ok", "/b": "ok"}
@@ -0,0 +1,167 @@
+"""
+    Name: test_launcher.py
+    Created: 10/18/26
+    Purpose: Views opened by the launcher share one collector, and
+    processes and sensors are read once per snapshot however many
+    views show them
+"""
+import os
+import sys
+import types
+import tkinter as tk
+import pytest
+import launcher
+from fake_psutil import FakeSystem
+from launcher import SharedCollector, View, group_readings, open_views
+from system_sampler import Sampler
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def snapshot():
+    return Sampler(provider=FakeSystem()).sample()
+
+
+class FakeWindow:
+    """
+        Keeps the <Destroy> handlers bound to it
+    """
+    def __init__(self, name=".!toplevel"):
+        self.name = name
+        self.handlers = []
+
+    def __str__(self):
+        return self.name
+
+    def bind(self, sequence, handler, add=None):
+        assert sequence == "<Destroy>"
+        self.handlers.append(handler)
+
+    def destroy(self, widget=None):
+        event = types.SimpleNamespace(widget=widget or self)
+        for handler in self.handlers:
+            handler(event)
+
+
+class Counting:
+    """
+        Stands in for ProcessTable and Sensors, counting the reads
+    """
+    def __init__(self):
+        self.reads = 0
+
+    def update(self, timestamp, ram_total):
+        self.reads += 1
+        return [timestamp]
+
+    def read(self):
+        self.reads += 1
+        return self.reads
+
+
+def test_group_readings(snapshot):
+    readings = group_readings(snapshot)
+    assert set(readings) == {"cpu", "mem", "net", "disk"}
+    assert readings["cpu"].value == snapshot.cpu_percent
+    assert readings["mem"].value is snapshot.virtual_memory
+    assert all(reading.timestamp == snapshot.timestamp
+               for reading in readings.values())
+
+
+def test_publish_to_every_view(snapshot):
+    source = SharedCollector()
+    seen = []
+    groups = []
+    source.subscribe(seen.append)
+    source.subscribe_groups(
+        {"cpu": groups.append, "unknown": groups.append})
+    source.publish(snapshot)
+    assert seen == [snapshot]
+    assert [reading.name for reading in groups] == ["cpu"]
+    assert source.snapshots == 1
+
+
+def test_closed_window_stops_getting_snapshots(snapshot):
+    source = SharedCollector()
+    window = FakeWindow()
+    seen = []
+    source.subscribe(seen.append, window)
+    # A widget inside the window going away is not the window closing
+    window.destroy(FakeWindow(".!toplevel.!label"))
+    source.publish(snapshot)
+    window.destroy()
+    source.publish(snapshot)
+    assert seen == [snapshot]
+    assert source.subscribers == []
+
+
+def test_view_closing_while_shown(snapshot):
+    source = SharedCollector()
+    window = FakeWindow()
+    seen = []
+    source.subscribe(lambda snapshot: window.destroy(), window)
+    source.subscribe(seen.append)
+    source.publish(snapshot)
+    # The view after the closed one still got the snapshot
+    assert seen == [snapshot]
+
+
+def test_processes_and_sensors_read_once_per_snapshot(snapshot):
+    source = SharedCollector()
+    source.process_table = Counting()
+    source.sensor_source = Counting()
+    for view in range(3):
+        source.processes(snapshot)
+        source.sensors(snapshot)
+    assert source.process_table.reads == 1
+    assert source.sensor_source.reads == 1
+    source.processes(snapshot._replace(timestamp=snapshot.timestamp + 1))
+    assert source.process_table.reads == 2
+
+
+def test_console_view_gets_the_source(monkeypatch):
+    module = types.ModuleType("fake_console_view")
+    opened = []
+    module.SystemInfo = lambda source: opened.append(source)
+    monkeypatch.setitem(sys.modules, "fake_console_view", module)
+    monkeypatch.setitem(launcher.VIEWS, "fake",
+                        View("fake_console_view", "console"))
+
+    source = SharedCollector()
+    # No Tk root for console views
+    assert open_views(["fake"], source) is None
+    assert opened == [source]
+
+
+def test_theme_left_alone_next_to_other_views(monkeypatch, snapshot):
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display for Tk")
+    root.destroy()
+    themes = []
+    monkeypatch.setitem(sys.modules, "sv_ttk", types.SimpleNamespace(
+        set_theme=themes.append))
+    # The theme view loads its icon from the working folder
+    monkeypatch.chdir(os.path.dirname(TESTS))
+
+    source = SharedCollector()
+    root = open_views(["labels", "theme"], source)
+    try:
+        source.publish(snapshot)
+        assert themes == []
+        windows = [child for child in root.winfo_children()
+                   if child.winfo_class() == "Toplevel"]
+        assert len(windows) == 2
+        # The hidden root goes once the last view window is closed
+        windows[0].destroy()
+        assert root.winfo_exists()
+        windows[1].destroy()
+        with pytest.raises(tk.TclError):
+            root.winfo_exists()
+    finally:
+        try:
+            root.destroy()
+        except tk.TclError:
+            pass
@@ -0,0 +1,53 @@
+"""
+    Name: test_live_rows.py
+    Created: 10/18/26
+    Purpose: The live console views show every row when a sensor comes
+    or goes after they started
+"""
+import pytest
+from rich.text import Text
+import psutil_sys_info_rich
+import psutil_sys_info_table
+
+TICKS = [
+    [("CPU", "1"), ("CPU temp", "40.0 °C")],
+    [("CPU", "1"), ("CPU temp", "41.0 °C"), ("Package id 0", "41.0 °C")],
+    [("CPU", "2")],
+]
+
+
+class Player:
+    """
+        A recording that ends after the ticks
+    """
+    def __init__(self, ticks):
+        self.ticks = ticks
+
+    def finished(self):
+        self.ticks -= 1
+        return self.ticks < 0
+
+
+@pytest.mark.parametrize(
+    "module", [psutil_sys_info_rich, psutil_sys_info_table])
+def test_rows_added_and_removed(module, monkeypatch):
+    app = module.SystemInfo.__new__(module.SystemInfo)
+    app.player = Player(len(TICKS))
+    # The rows the live view starts with, then one list per tick
+    ticks = iter([TICKS[0]] + TICKS)
+    app.sample = lambda: None
+    app.get_current_rows = lambda: next(ticks)
+    app.get_core_text = lambda: Text("")
+    monkeypatch.setattr(module, "sleep", lambda seconds: None)
+
+    console = module.console
+    with console.capture() as capture:
+        app.run_live(100)
+    frames = capture.get()
+
+    # Not a terminal, every update prints the whole frame
+    shown = frames.split("System Information")
+    assert any("Package id 0" in frame and "41.0" in frame
+               for frame in shown)
+    assert "CPU temp" not in shown[-1]
+    assert "2" in shown[-1]
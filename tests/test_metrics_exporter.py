@@ -0,0 +1,98 @@
+"""
+    Name: test_metrics_exporter.py
+    Created: 10/18/26
+    Purpose: The exposition is valid Prometheus and OpenMetrics text,
+    label values are escaped and slow clients are dropped
+"""
+import asyncio
+import gzip
+import pytest
+import metrics_exporter
+from metrics_exporter import MetricsExporter, label
+
+FAMILIES = [
+    ("sysinfo_cpu_usage_percent", "gauge", "CPU usage", [("", 12.5)]),
+    ("sysinfo_network_sent_bytes", "counter", "Bytes sent", [
+        ('{interface="eth0"}', 100)]),
+]
+
+
+@pytest.fixture(scope="module")
+def exporter():
+    return MetricsExporter()
+
+
+def body(exporter, openmetrics=False, use_gzip=False):
+    data = exporter.responses[openmetrics, use_gzip]
+    data = data[data.index(b"\r\n\r\n") + 4:]
+    return (gzip.decompress(data) if use_gzip else data).decode()
+
+
+def test_prometheus_text():
+    text = MetricsExporter.exposition(FAMILIES, openmetrics=False).decode()
+    assert text == (
+        "# HELP sysinfo_cpu_usage_percent CPU usage\n"
+        "# TYPE sysinfo_cpu_usage_percent gauge\n"
+        "sysinfo_cpu_usage_percent 12.5\n"
+        "# HELP sysinfo_network_sent_bytes_total Bytes sent\n"
+        "# TYPE sysinfo_network_sent_bytes_total counter\n"
+        'sysinfo_network_sent_bytes_total{interface="eth0"} 100\n')
+
+
+def test_openmetrics_text():
+    text = MetricsExporter.exposition(FAMILIES, openmetrics=True).decode()
+    # Counter families drop _total, their samples keep it
+    assert "# TYPE sysinfo_network_sent_bytes counter\n" in text
+    assert 'sysinfo_network_sent_bytes_total{interface="eth0"} 100\n' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_label_escaping():
+    assert label("mount", "/") == '{mount="/"}'
+    assert label("mount", "C:\\") == '{mount="C:\\\\"}'
+    assert label("interface", 'say "hi"') == '{interface="say \\"hi\\""}'
+    assert label("mount", "/mnt/a\nb") == '{mount="/mnt/a\\nb"}'
+
+
+def test_rendered_mount_is_escaped(exporter):
+    snapshot = exporter.collector.sampler.sample()
+    usage = next(iter(snapshot.disk_usage.values()))
+    exporter.render(snapshot._replace(disk_usage={'C:\\ "x"\n': usage}))
+    for openmetrics in (False, True):
+        for use_gzip in (False, True):
+            text = body(exporter, openmetrics, use_gzip)
+            assert 'sysinfo_disk_total_bytes{mount="C:\\\\ \\"x\\"\\n"} ' \
+                in text
+            # Every line is a comment or one sample, nothing split
+            for line in text.splitlines():
+                assert line.startswith("#") or line.startswith("sysinfo_")
+
+
+def test_every_family_has_help_and_type(exporter):
+    exporter.render(exporter.collector.sampler.sample())
+    lines = body(exporter).splitlines()
+    helps = [line.split()[2] for line in lines if line.startswith("# HELP")]
+    types = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+    assert helps == types
+    assert "sysinfo_cpu_context_switches_total" in types
+    for line in lines:
+        if not line.startswith("#"):
+            assert line.split("{")[0].split()[0] in helps
+
+
+def test_slow_headers_are_dropped(exporter, monkeypatch):
+    monkeypatch.setattr(metrics_exporter, "IDLE_SECONDS", 0.1)
+
+    async def run():
+        server = await asyncio.start_server(exporter.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            # The request line, then headers that never finish
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n")
+            await writer.drain()
+            data = await asyncio.wait_for(reader.read(), 2)
+            writer.close()
+            return data
+
+    assert asyncio.run(run()) == b""
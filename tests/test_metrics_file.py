@@ -0,0 +1,144 @@
+"""
+    Name: test_metrics_file.py
+    Created: 10/18/26
+    Purpose: Records read back the way they were written, and files that
+    are not whole segments are refused with a clear error
+"""
+import os
+import pytest
+from metrics_file import HEADER, MetricsReader, MetricsWriter, Record, \
+    Segment
+
+START = 1_700_000_000.0
+CORES = 4
+
+
+def make_record(i):
+    return Record(
+        timestamp=START + i / 10,
+        cpu_percent=(i * 7) % 100 + 0.25,
+        ram_percent=41.5,
+        swap_percent=0.0,
+        disk_percent=63.12,
+        net_sent=float(1_000 * i),
+        net_recv=2_048.0,
+        disk_read=0.0,
+        disk_write=float(4_096 * (i % 3)),
+        cpu_percpu=tuple((i + core) % 101 for core in range(CORES)),
+    )
+
+
+def write(directory, count, rotate_seconds=3600, core_seconds=0,
+          records=None):
+    writer = MetricsWriter(str(directory), CORES, 8 * 1024 ** 3,
+                           1024 ** 3, 500 * 1024 ** 3, rotate_seconds,
+                           core_seconds=core_seconds)
+    if records is None:
+        records = [make_record(i) for i in range(count)]
+    for record in records:
+        writer.write(record)
+    writer.close()
+    return records
+
+
+def assert_same(read, written):
+    assert read.timestamp == pytest.approx(written.timestamp, abs=0.001)
+    assert read.cpu_percent == pytest.approx(written.cpu_percent, abs=0.01)
+    assert read.ram_percent == pytest.approx(written.ram_percent, abs=0.01)
+    assert read.disk_percent == pytest.approx(written.disk_percent, abs=0.01)
+    for field in ("net_sent", "net_recv", "disk_read", "disk_write"):
+        assert getattr(read, field) == pytest.approx(
+            getattr(written, field), abs=1)
+    assert tuple(read.cpu_percpu) == written.cpu_percpu
+
+
+def test_round_trip(tmp_path):
+    written = write(tmp_path, 5_000)
+    reader = MetricsReader(str(tmp_path))
+    assert len(reader) == len(written)
+    assert reader.core_count == CORES
+    assert reader.ram_total == 8 * 1024 ** 3
+    for record in written[::37] + written[-1:]:
+        assert_same(reader.at(record.timestamp), record)
+    reader.close()
+
+
+def test_round_trip_across_segments(tmp_path):
+    # 100 records per segment
+    written = write(tmp_path, 1_000, rotate_seconds=10)
+    reader = MetricsReader(str(tmp_path))
+    assert len(reader.segments) == 10
+    assert len(reader) == len(written)
+    assert_same(reader.at(written[555].timestamp + 0.05), written[555])
+    # Before the first record gives the first
+    assert_same(reader.at(START - 60), written[0])
+    reader.close()
+
+
+def test_core_percents_are_means_of_each_second(tmp_path):
+    # Samples at 10 Hz from the start of a second
+    written = write(tmp_path, 30, core_seconds=1.0)
+    reader = MetricsReader(str(tmp_path))
+    for second in range(3):
+        samples = written[second * 10:second * 10 + 10]
+        means = tuple(
+            round(sum(record.cpu_percpu[core] for record in samples) / 10)
+            for core in range(CORES))
+        for record in samples:
+            read = reader.at(record.timestamp)
+            assert tuple(read.cpu_percpu) == means
+            # Everything else is kept at the full rate
+            assert read.cpu_percent == pytest.approx(record.cpu_percent,
+                                                     abs=0.01)
+    reader.close()
+
+
+def test_quiet_host_takes_few_bytes(tmp_path):
+    # A quiet 128 core host at 10 Hz
+    cores = 128
+    writer = MetricsWriter(str(tmp_path), cores, 1, 1, 1)
+    count = 36_000
+    for i in range(count):
+        writer.write(make_record(0)._replace(
+            timestamp=START + i / 10, cpu_percent=2.0 + i % 3,
+            net_sent=1_500.0 + i % 7,
+            cpu_percpu=tuple((i + core) % 3 for core in range(cores))))
+    writer.close()
+    size = sum(os.path.getsize(tmp_path / name)
+               for name in os.listdir(tmp_path))
+    assert size / count * 10 * 86_400 < 3 * 1024 ** 2
+
+
+def test_unfinished_block_is_skipped_and_cut_off(tmp_path):
+    written = write(tmp_path, 5)
+    path = tmp_path / os.listdir(tmp_path)[0]
+    whole = path.stat().st_size
+    # A recorder killed while writing its next block
+    with open(path, "ab") as file:
+        file.write(b"\xff" * 20)
+    reader = MetricsReader(str(tmp_path))
+    assert len(reader) == len(written)
+    reader.close()
+
+    # Started again in the same second, the half block is cut off
+    write(tmp_path, 0, records=[make_record(9)])
+    assert path.stat().st_size > whole
+    reader = MetricsReader(str(tmp_path))
+    assert len(reader) == len(written) + 1
+    assert_same(reader.at(START + 0.95), make_record(9))
+    reader.close()
+
+
+@pytest.mark.parametrize("size", [0, 10, HEADER.size - 1])
+def test_short_file_is_refused(tmp_path, size):
+    path = tmp_path / "metrics-short.bin"
+    path.write_bytes(b"\0" * size)
+    with pytest.raises(ValueError, match="too short"):
+        Segment(str(path))
+
+
+def test_not_a_metrics_file(tmp_path):
+    path = tmp_path / "metrics-other.bin"
+    path.write_bytes(b"x" * 200)
+    with pytest.raises(ValueError, match="not a version"):
+        Segment(str(path))
@@ -0,0 +1,113 @@
+"""
+    Name: test_metrics_hub.py
+    Created: 10/18/26
+    Purpose: A batch of packets lands in the right host histories, and
+    the fleet views pick the right hosts
+"""
+import numpy as np
+import pytest
+from hub_protocol import encode
+from metrics_hub import FleetStore, PACKET_DTYPE, STALE_SECONDS, METRICS, \
+    CPU, RAM
+
+
+def packets(*hosts, ram=50.0, start=0):
+    """
+        One packet per host name, with CPU percent start, start + 1, ...
+        unless a host is given as (name, cpu)
+    """
+    rows = np.zeros(len(hosts), dtype=PACKET_DTYPE)
+    for i, host in enumerate(hosts):
+        cpu = start + i
+        if isinstance(host, tuple):
+            host, cpu = host
+        rows[i] = np.frombuffer(encode(
+            host, 0.0, cpu, ram, 0.0, 60.0, 1000.0, 2000.0,
+            16 * 1024 ** 3, 8), dtype=PACKET_DTYPE)[0]
+    return rows
+
+
+def test_ingest_stores_every_field():
+    store = FleetStore(history=4)
+    assert store.ingest(packets("a", "b", start=10), now=5.0) == 2
+    assert store.names == ["a", "b"]
+    assert store.host_history("b").tolist() \
+        == [[11.0, 50.0, 0.0, 60.0, 1000.0, 2000.0]]
+    assert store.latest.shape[1] == len(METRICS)
+    assert store.ram_total[1] == 16 * 1024 ** 3
+    assert store.core_count[1] == 8
+    assert store.last_seen[0] == 5.0
+
+
+def test_bad_magic_is_rejected():
+    batch = packets("a", "b")
+    batch["magic"][0] = b"XXXX"
+    store = FleetStore()
+    assert store.ingest(batch) == 1
+    assert store.names == ["b"]
+
+
+def test_newest_packet_of_a_host_kept():
+    store = FleetStore(history=4)
+    stored = store.ingest(packets(("a", 1.0), ("b", 2.0), ("a", 3.0),
+                                  ("a", 4.0)))
+    assert stored == 2
+    # One sample per host per batch, the last one sent
+    assert store.host_history("a")[:, CPU].tolist() == [4.0]
+    assert store.host_history("b")[:, CPU].tolist() == [2.0]
+
+
+def test_grows_past_capacity():
+    store = FleetStore(history=3, capacity=2)
+    store.ingest(packets("a", "b"))
+    store.ingest(packets(*[f"host{i}" for i in range(5)], start=100))
+    assert len(store) == 7
+    assert len(store.heads) >= 7
+    # Rows that were there before growing keep their history
+    assert store.host_history("a")[:, CPU].tolist() == [0.0]
+    assert store.host_history("host4")[:, CPU].tolist() == [104.0]
+
+
+def test_history_wraps_around():
+    store = FleetStore(history=3)
+    for cpu in range(7):
+        store.ingest(packets(("a", float(cpu))))
+    history = store.host_history("a")
+    assert history[:, CPU].tolist() == [4.0, 5.0, 6.0]
+    # A view of the doubled buffer, one contiguous slice
+    assert history.base is not None
+
+
+def test_top_cpu():
+    store = FleetStore()
+    cpus = [37.0, 5.0, 99.0, 12.0, 64.0, 81.0, 3.0, 50.0]
+    store.ingest(packets(*[(f"h{i}", cpu) for i, cpu in enumerate(cpus)]),
+                 now=0.0)
+    rows = store.online(now=1.0)
+    top = store.top_cpu(3, rows)
+    assert [(host, cpu) for host, cpu, ram in top] \
+        == [("h2", 99.0), ("h5", 81.0), ("h4", 64.0)]
+    assert top[0][2] == 50.0
+    # Fewer hosts than asked for, every one sorted
+    assert [cpu for host, cpu, ram in store.top_cpu(20, rows)] \
+        == sorted(cpus, reverse=True)
+
+
+def test_online_drops_stale_hosts():
+    store = FleetStore()
+    store.ingest(packets("old"), now=0.0)
+    store.ingest(packets("new"), now=STALE_SECONDS)
+    assert store.online(now=STALE_SECONDS).tolist() == [0, 1]
+    assert store.online(now=STALE_SECONDS + 1).tolist() == [1]
+    assert store.top_cpu(rows=store.online(now=10 * STALE_SECONDS)) == []
+
+
+def test_memory_percentiles():
+    store = FleetStore()
+    assert store.memory_percentiles(rows=np.array([], dtype=np.intp)) \
+        .tolist() == [0.0, 0.0, 0.0]
+    for i, ram in enumerate((10.0, 20.0, 30.0, 40.0, 50.0)):
+        store.ingest(packets(f"h{i}", ram=ram), now=0.0)
+    assert store.latest[:5, RAM].tolist() == [10.0, 20.0, 30.0, 40.0, 50.0]
+    assert store.memory_percentiles((50,), store.online(now=0.0)) \
+        .tolist() == pytest.approx([30.0])
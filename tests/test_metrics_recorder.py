@@ -0,0 +1,39 @@
+"""
+    Name: test_metrics_recorder.py
+    Created: 10/18/26
+    Purpose: Records stay in order when the wall clock is stepped back
+    while recording
+"""
+import time
+import pytest
+from metrics_file import MetricsReader
+from metrics_recorder import Recorder
+
+SECOND = 1_000_000_000
+
+
+def test_wall_clock_step_back(tmp_path, monkeypatch):
+    recorder = Recorder(str(tmp_path))
+    snapshot = recorder.sampler.sample()
+    start = recorder.wall_start
+
+    # The wall clock goes back 75 s before the last sample
+    wall = time.time
+    for seconds, cpu in ((30, 10.0), (70, 20.0)):
+        recorder.writer.write(recorder.to_record(snapshot._replace(
+            timestamp=recorder.monotonic_start + seconds * SECOND,
+            cpu_percent=cpu)))
+    monkeypatch.setattr(time, "time", lambda: wall() - 75)
+    record = recorder.to_record(snapshot._replace(
+        timestamp=recorder.monotonic_start + 71 * SECOND, cpu_percent=30.0))
+    assert record.timestamp == pytest.approx(start + 71)
+    recorder.writer.write(record)
+    recorder.writer.close()
+
+    reader = MetricsReader(str(tmp_path))
+    try:
+        assert reader.at(start + 30).cpu_percent == 10.0
+        assert reader.at(start + 70).cpu_percent == 20.0
+        assert reader.at(start + 80).cpu_percent == 30.0
+    finally:
+        reader.close()
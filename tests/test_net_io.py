@@ -0,0 +1,124 @@
+"""
+    Name: test_net_io.py
+    Created: 10/18/26
+    Purpose: Interfaces are filtered by name once, rates follow
+    interfaces that come and go, and link use needs a known speed
+"""
+import pytest
+from fake_psutil import snetio, snicstats
+from net_io import InterfaceFilter, NetIO, link_utilisation
+
+SECOND = 1_000_000_000
+MBPS = 1_000_000 / 8
+
+
+class Provider:
+    """
+        net_if_stats() that counts how often it is called
+    """
+    def __init__(self, stats):
+        self.stats = stats
+        self.calls = 0
+
+    def net_if_stats(self):
+        self.calls += 1
+        return self.stats
+
+
+def counters(sent, recv, errors=0, drops=0):
+    return snetio(sent, recv, sent // 1000, recv // 1000,
+                  errors, errors, drops, drops)
+
+
+def stats(speed, isup=True):
+    return snicstats(isup, 2, speed, 1500, "")
+
+
+def test_default_filter_leaves_out_virtual_interfaces():
+    shown = InterfaceFilter()
+    names = ["eth0", "lo", "docker0", "br-1a2b", "veth12ab", "wlan0",
+             "enp3s0"]
+    assert [name for name in names if shown(name)] \
+        == ["eth0", "wlan0", "enp3s0"]
+
+
+@pytest.mark.parametrize("include, exclude, shown", [
+    (["eth*"], (), ["eth0", "eth1"]),
+    (["eth*", "wl*"], ["eth1"], ["eth0", "wlan0"]),
+    (None, ["*0"], ["eth1", "lo"]),
+    (None, None, ["eth0", "eth1", "lo", "wlan0"]),
+])
+def test_include_and_exclude(include, exclude, shown):
+    interface_filter = InterfaceFilter(include, exclude)
+    names = ["eth0", "eth1", "lo", "wlan0"]
+    assert [name for name in names if interface_filter(name)] == shown
+
+
+def test_decisions_are_cached():
+    interface_filter = InterfaceFilter(["eth*"])
+    assert interface_filter("eth0") and not interface_filter("lo")
+    assert interface_filter.decisions == {"eth0": True, "lo": False}
+    # A cached decision is used without matching again
+    interface_filter.decisions["lo"] = True
+    assert interface_filter("lo")
+
+
+def test_rates_and_utilisation():
+    provider = Provider({"eth0": stats(100), "wlan0": stats(0)})
+    net_io = NetIO(provider=provider)
+    net_io.update({"eth0": counters(0, 0), "wlan0": counters(0, 0)}, 0)
+    nics = net_io.update({
+        "eth0": counters(5 * MBPS, 25 * MBPS, errors=1, drops=2),
+        "wlan0": counters(1000, 2000)}, 2 * SECOND)
+
+    eth0, wlan0 = nics
+    assert eth0.interface == "eth0"
+    assert eth0.bytes_recv == pytest.approx(12.5 * MBPS)
+    assert eth0.errors == 1.0
+    assert eth0.drops == 2.0
+    # 12.5 of 100 Mbps received
+    assert eth0.utilisation == pytest.approx(12.5)
+    # No known speed, no utilisation
+    assert wlan0.speed == 0
+    assert wlan0.utilisation is None
+    assert link_utilisation(nics) == pytest.approx(12.5)
+    # Link speeds are read once, not every update
+    assert provider.calls == 1
+
+
+def test_interfaces_that_come_and_go():
+    net_io = NetIO(provider=Provider({}))
+    net_io.update({"eth0": counters(0, 0)}, 0)
+    nics = net_io.update(
+        {"eth0": counters(1000, 0), "wg0": counters(5000, 0)}, SECOND)
+    # A new interface has no rate until its second reading
+    assert [(nic.interface, nic.bytes_sent) for nic in nics] \
+        == [("eth0", 1000.0), ("wg0", 0.0)]
+
+    nics = net_io.update({"wg0": counters(7000, 0)}, 2 * SECOND)
+    assert [(nic.interface, nic.bytes_sent) for nic in nics] \
+        == [("wg0", 2000.0)]
+
+    # Back with its counters started again, no negative rate
+    nics = net_io.update(
+        {"eth0": counters(300, 0), "wg0": counters(7000, 0)}, 3 * SECOND)
+    assert nics[0].interface == "eth0"
+    assert nics[0].bytes_sent >= 0
+
+
+def test_link_utilisation_without_speeds():
+    provider = Provider({"eth0": stats(0), "eth1": stats(1000, isup=False)})
+    net_io = NetIO(provider=provider)
+    net_io.update({"eth0": counters(0, 0), "eth1": counters(0, 0)}, 0)
+    nics = net_io.update({"eth0": counters(MBPS, 0),
+                          "eth1": counters(MBPS, 0)}, SECOND)
+    assert link_utilisation(nics) is None
+    assert link_utilisation([]) is None
+
+
+def test_utilisation_is_capped():
+    net_io = NetIO(provider=Provider({"eth0": stats(10)}))
+    net_io.update({"eth0": counters(0, 0)}, 0)
+    nic, = net_io.update({"eth0": counters(100 * MBPS, 0)}, SECOND)
+    assert nic.utilisation == 100.0
+    assert link_utilisation([nic]) == 100.0
@@ -0,0 +1,53 @@
+"""
+    Name: test_network_chart.py
+    Created: 10/18/26
+    Purpose: The network chart keeps every spike of a long history and
+    draws a frame within its budget however long the history is
+"""
+import statistics
+import time
+import numpy as np
+import pytest
+from benchmark_suite import make_chart
+from system_info_gui_chart_1 import min_max
+
+# Most milliseconds a frame may take
+FRAME_BUDGET_MS = 5.0
+FRAMES = 50
+
+
+def test_min_max_fits_and_keeps_extremes():
+    times = np.arange(100_000, dtype=float)
+    values = np.zeros(100_000)
+    values[12_345] = 900.0
+    values[54_321] = -3.0
+    times_out, lowest, highest = min_max(times, values, 500)
+
+    assert len(times_out) <= 2 * 500
+    assert highest.max() == 900.0
+    assert lowest.min() == -3.0
+    # The newest sample closes the last column
+    assert times_out[-1] == times[-1]
+    assert np.all(np.diff(times_out) > 0)
+
+
+def test_min_max_leaves_short_history():
+    times = np.arange(100, dtype=float)
+    assert min_max(times, times, 500) is None
+
+
+@pytest.mark.parametrize("points", [10, 1_000, 100_000])
+def test_frame_budget(points):
+    app = make_chart(points)
+    clock = app.network_time.last()
+    frames = []
+    for frame in range(FRAMES):
+        clock += 1
+        app.network_time.append(clock)
+        app.upload_data.append(50.0)
+        app.download_data.append(120.0)
+        start = time.perf_counter()
+        app.update_line_charts()
+        frames.append((time.perf_counter() - start) * 1000)
+    # The median leaves out the full redraw when the x-axis moves
+    assert statistics.median(frames) < FRAME_BUDGET_MS
@@ -0,0 +1,152 @@
+"""
+    Name: test_proc_sampler.py
+    Created: 10/18/26
+    Purpose: ProcSampler parses a copy of the proc and sys trees right
+    and agrees with psutil on the real system
+"""
+import os
+import pytest
+# pip install psutil
+import psutil
+from proc_sampler import ProcSampler, VALUE_SIZE
+
+STAT = """\
+cpu  100 20 30 800 50 5 5 0 10 0
+cpu0 50 10 15 400 25 3 2 0 5 0
+cpu1 50 10 15 400 25 2 3 0 5 0
+intr 12345 1 2 3
+ctxt 67890
+btime 1700000000
+processes 4242
+procs_running 2
+procs_blocked 0
+softirq 555 1 2 3
+"""
+MEMINFO = """\
+MemTotal:        8000000 kB
+MemFree:         1000000 kB
+MemAvailable:    6000000 kB
+Buffers:          200000 kB
+Cached:          3000000 kB
+SwapCached:            0 kB
+Active:          2500000 kB
+Inactive:        2000000 kB
+Shmem:            100000 kB
+Slab:             400000 kB
+SReclaimable:     300000 kB
+SwapTotal:       2000000 kB
+SwapFree:        1500000 kB
+"""
+NET_DEV = """\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:    1000      10    0    0    0     0          0         0     1000      10    0    0    0     0       0          0
+  eth0:  500000    4000    1    2    0     0          0         0   300000    2000    3    4    0     0       0          0
+"""
+DISKSTATS = """\
+   8       0 sda 100 10 2000 50 200 20 4000 80 0 120 130 0 0 0 0
+   8       1 sda1 90 9 1800 45 180 18 3600 72 0 110 117 0 0 0 0
+ 253       0 dm-0 5 0 40 1 0 0 0 0 0 1 1 0 0 0 0
+"""
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """
+        proc and sys folders side by side, like a copy of /
+    """
+    files = {
+        "proc/stat": STAT,
+        "proc/meminfo": MEMINFO,
+        "proc/net/dev": NET_DEV,
+        "proc/diskstats": DISKSTATS,
+        "sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq": "1000000\n",
+        "sys/devices/system/cpu/cpu1/cpufreq/scaling_cur_freq": "3000000\n",
+        # Whole disks only, sda1 is inside sda and dm-0 is left out
+        "sys/block/sda/size": "1\n",
+    }
+    for path, text in files.items():
+        path = tmp_path / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return tmp_path
+
+
+def test_fixture_tree(tree):
+    sampler = ProcSampler(percpu=True, perdisk=True, pernic=True,
+                          diskio=True, cpustats=True,
+                          root=str(tree / "proc"))
+    try:
+        snapshot = sampler.sample()
+    finally:
+        sampler.close()
+
+    memory = snapshot.virtual_memory
+    assert memory.total == 8000000 * 1024
+    assert memory.available == 6000000 * 1024
+    assert memory.percent == 25.0
+    assert memory.cached == 3300000 * 1024
+    assert snapshot.swap_memory.used == 500000 * 1024
+    assert snapshot.swap_memory.percent == 25.0
+
+    assert snapshot.net_io.bytes_recv == 501000
+    assert snapshot.net_io.bytes_sent == 301000
+    assert snapshot.net_io.errout == 3
+    assert snapshot.net_io_pernic["eth0"].dropin == 2
+
+    # Only sda is a whole disk in the tree's own sys/block
+    assert snapshot.disk_io.read_count == 100
+    assert snapshot.disk_io.read_bytes == 2000 * 512
+    assert snapshot.disk_io.busy_time == 120
+    assert set(snapshot.disk_io_perdisk) == {"sda", "sda1", "dm-0"}
+
+    assert snapshot.cpu_stats.ctx_switches == 67890
+    assert snapshot.cpu_stats.interrupts == 12345
+    assert snapshot.cpu_stats.soft_interrupts == 555
+    assert len(snapshot.cpu_percpu) == 2
+    # kHz of both cores in the tree, averaged to MHz
+    assert snapshot.cpu_freq.current == 2000.0
+    assert [len(file.buffer) for file in sampler.freq_files] \
+        == [VALUE_SIZE, VALUE_SIZE]
+
+
+def test_sys_root_follows_root(tree):
+    sampler = ProcSampler(root=str(tree / "proc") + os.sep)
+    sampler.close()
+    assert sampler.block_root == str(tree / "sys" / "block")
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/stat"), reason="needs /proc")
+def test_matches_psutil():
+    sampler = ProcSampler(pernic=True, diskio=True, cpustats=True)
+    try:
+        snapshot = sampler.sample()
+    finally:
+        sampler.close()
+
+    memory = psutil.virtual_memory()
+    assert type(snapshot.virtual_memory) is type(memory)
+    assert snapshot.virtual_memory.total == memory.total
+    # Other processes run between the two reads, allow 5% of RAM
+    for field in ("available", "used", "free", "cached", "buffers"):
+        assert abs(getattr(snapshot.virtual_memory, field)
+                   - getattr(memory, field)) <= memory.total * 0.05, field
+    assert snapshot.swap_memory.total == psutil.swap_memory().total
+
+    nics = psutil.net_io_counters(pernic=True)
+    assert set(snapshot.net_io_pernic) == set(nics)
+    net_io = psutil.net_io_counters()
+    assert 0 <= net_io.bytes_recv - snapshot.net_io.bytes_recv < 10 ** 8
+    assert 0 <= net_io.packets_sent - snapshot.net_io.packets_sent < 10 ** 6
+
+    ctx_switches = psutil.cpu_stats().ctx_switches
+    assert snapshot.cpu_stats.ctx_switches <= ctx_switches
+    assert snapshot.cpu_stats.ctx_switches > ctx_switches * 0.9
+
+    disk_io = psutil.disk_io_counters()
+    if disk_io is None:
+        assert snapshot.disk_io is None
+    else:
+        assert 0 <= disk_io.read_count - snapshot.disk_io.read_count < 10 ** 5
+        assert 0 <= disk_io.write_count - snapshot.disk_io.write_count \
+            < 10 ** 5
@@ -0,0 +1,134 @@
+"""
+    Name: test_process_table.py
+    Created: 10/18/26
+    Purpose: The process list keeps the busiest processes on top while
+    only reading every process once every few ticks
+"""
+import pytest
+import fake_psutil
+from fake_psutil import FakeSystem, FakeProcess
+from process_table import ProcessTable, WATCH_FACTOR
+
+SECOND = 1_000_000_000
+PROCESSES = 500
+
+
+class CachedProcess(FakeProcess):
+    """
+        Keeps its start time from when it was made, like psutil.Process
+    """
+    def __init__(self, system, pid):
+        super().__init__(system, pid)
+        self.created = system.created.get(pid, system.boot_time() + pid)
+
+    def create_time(self):
+        return self.created
+
+    def name(self):
+        if self.pid in self.system.created:
+            return f"new-{self.pid}"
+        return super().name()
+
+
+class ReusingSystem(FakeSystem):
+    """
+        A host where a pid can be handed to a new process
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # {pid: create_time} of processes started on a reused pid
+        self.created = {}
+
+    def Process(self, pid=None):
+        super().Process(pid)
+        return CachedProcess(self, pid)
+
+
+def tick(system, table, ticks):
+    rows = None
+    for i in range(ticks):
+        system.advance()
+        rows = table.update(system.index * SECOND)
+    return rows
+
+
+def busiest(system, count):
+    return sorted(range(1, PROCESSES + 1),
+                  key=lambda pid: -system.process_shares[pid - 1])[:count]
+
+
+@pytest.mark.parametrize("full_scan_ticks", [1, 5])
+def test_busiest_first(full_scan_ticks):
+    system = FakeSystem(processes=PROCESSES)
+    table = ProcessTable(count=5, provider=system,
+                         full_scan_ticks=full_scan_ticks)
+    table.update(0)
+    rows = tick(system, table, 7)
+    assert [row.pid for row in rows] == busiest(system, 5)
+    top = system.process_shares[rows[0].pid - 1] * 100
+    assert rows[0].cpu_percent == pytest.approx(top, abs=0.1)
+
+
+def test_only_watched_processes_read_between_full_reads(monkeypatch):
+    system = FakeSystem(processes=PROCESSES)
+    table = ProcessTable(count=5, provider=system, full_scan_ticks=5)
+    table.update(0)
+
+    reads = []
+    cpu_times = fake_psutil.FakeProcess.cpu_times
+
+    def counted(process):
+        reads.append(process.pid)
+        return cpu_times(process)
+
+    monkeypatch.setattr(fake_psutil.FakeProcess, "cpu_times", counted)
+    tick(system, table, 4)
+    assert len(reads) == 4 * WATCH_FACTOR * 5
+    reads.clear()
+    # The fifth tick reads every process again, and the ones that ran
+    # once more from a new Process to check their pid wasn't reused
+    tick(system, table, 1)
+    assert len(set(reads)) == PROCESSES
+    assert len(reads) == PROCESSES + sum(
+        share > 0 for share in system.process_shares)
+
+
+def test_process_that_gets_busy_shows_within_a_full_read():
+    system = FakeSystem(processes=PROCESSES)
+    table = ProcessTable(count=5, provider=system, full_scan_ticks=5)
+    table.update(0)
+    tick(system, table, 2)
+
+    idle = next(pid for pid in range(1, PROCESSES + 1)
+                if system.process_shares[pid - 1] == 0.0)
+    system.process_shares[idle - 1] = 2.0
+    seen = [idle in [row.pid for row in tick(system, table, 1)]
+            for i in range(5)]
+    assert any(seen)
+    # Stays on top once it is found
+    assert seen[-1]
+
+
+def test_reused_pid_is_a_new_process():
+    system = ReusingSystem(processes=PROCESSES)
+    table = ProcessTable(count=5, provider=system, full_scan_ticks=1)
+    table.update(0)
+    rows = tick(system, table, 2)
+    pid = rows[0].pid
+    assert rows[0].name == f"process-{pid}"
+
+    # The new process on the pid has used more CPU time than the old
+    # one, so the CPU seconds alone don't show the pid was reused
+    system.created[pid] = system.boot_time() + 10 ** 6
+    system.process_shares[pid - 1] *= 2
+    # The new process has no CPU percent yet instead of a spike worked
+    # out from the old one
+    rows = tick(system, table, 1)
+    assert pid not in [row.pid for row in rows]
+    assert table.last[pid, system.created[pid]][0] > 0
+
+    rows = tick(system, table, 1)
+    assert rows[0].pid == pid
+    assert rows[0].name == f"new-{pid}"
+    top = system.process_shares[pid - 1] * 100
+    assert rows[0].cpu_percent == pytest.approx(top, abs=0.1)
@@ -0,0 +1,54 @@
+"""
+    Name: test_rate_engine.py
+    Created: 10/18/26
+    Purpose: Rates use the real time between readings and survive
+    counters that wrap or are reset
+"""
+from collections import namedtuple
+import pytest
+from rate_engine import RateEngine, COUNTER_32_BIT, COUNTER_64_BIT
+
+SECOND = 1_000_000_000
+
+
+def test_first_reading_is_zero():
+    assert RateEngine().update("net", 5_000, 0) == 0.0
+
+
+def test_rate_over_real_elapsed_time():
+    engine = RateEngine()
+    engine.update("net", 1_000, 0)
+    # 3000 bytes in half a second, not in the 1 second a tick should take
+    assert engine.update("net", 4_000, SECOND // 2) == 6_000.0
+    assert engine.rate("net") == 6_000.0
+
+
+def test_same_timestamp_keeps_last_rate():
+    engine = RateEngine()
+    engine.update("net", 0, 0)
+    engine.update("net", 100, SECOND)
+    assert engine.update("net", 500, SECOND) == 100.0
+
+
+@pytest.mark.parametrize("modulus", [COUNTER_32_BIT, COUNTER_64_BIT])
+def test_counter_wrap(modulus):
+    engine = RateEngine()
+    engine.update("net", modulus - 100, 0)
+    # 100 bytes up to the wrap and 50 after it
+    assert engine.update("net", 50, SECOND) == 150.0
+
+
+def test_counter_reset():
+    engine = RateEngine()
+    engine.update("net", 1_000_000, 0)
+    # Far too big a jump for a wrap, the counter started over from 0
+    assert engine.update("net", 700, SECOND) == 700.0
+
+
+def test_update_counters_every_field():
+    counters = namedtuple("snetio", "bytes_sent bytes_recv")
+    engine = RateEngine()
+    engine.update_counters("net", counters(0, 0), 0)
+    rates = engine.update_counters("net", counters(2_048, 1_024), 2 * SECOND)
+    assert rates == {"bytes_sent": 1_024.0, "bytes_recv": 512.0}
+    assert engine.rate("net.bytes_recv") == 512.0
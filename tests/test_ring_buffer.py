@@ -0,0 +1,56 @@
+"""
+    Name: test_ring_buffer.py
+    Created: 10/18/26
+    Purpose: A ring buffer keeps the newest samples in order once it wraps
+"""
+import pytest
+from ring_buffer import RingBuffer
+
+
+def test_empty():
+    buffer = RingBuffer(3)
+    assert len(buffer) == 0
+    assert list(buffer.view()) == []
+    assert buffer.last() == 0.0
+
+
+def test_fills_in_order():
+    buffer = RingBuffer(4)
+    for value in (1.0, 2.0, 3.0):
+        buffer.append(value)
+    assert list(buffer.view()) == [1.0, 2.0, 3.0]
+    assert buffer.last() == 3.0
+
+
+@pytest.mark.parametrize("appended", [5, 8, 9, 1_003])
+def test_wrap_keeps_newest_in_order(appended):
+    buffer = RingBuffer(4)
+    for value in range(appended):
+        buffer.append(float(value))
+    assert len(buffer) == 4
+    assert list(buffer.view()) == [float(value)
+                                   for value in range(appended - 4, appended)]
+    assert buffer.last() == appended - 1
+
+
+def test_view_is_one_contiguous_slice():
+    buffer = RingBuffer(3)
+    for value in range(7):
+        buffer.append(float(value))
+    view = buffer.view()
+    assert view.contiguous
+    assert view.nbytes == 3 * 8
+
+
+def test_clear():
+    buffer = RingBuffer(2)
+    buffer.append(1.0)
+    buffer.clear()
+    assert len(buffer) == 0
+    buffer.append(5.0)
+    assert list(buffer.view()) == [5.0]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
@@ -0,0 +1,119 @@
+"""
+    Name: test_sensors.py
+    Created: 10/18/26
+    Purpose: Sensors finds the thermal zones, hwmon temperatures and
+    fans of a fake sysfs tree and groups the CPU ones by package
+"""
+import pytest
+from sensors import Sensors, temperature_rows
+
+
+def make_tree(root, files):
+    for path, text in files.items():
+        path = root / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return str(root)
+
+
+ZONES = {
+    "thermal/thermal_zone0/type": "acpitz\n",
+    "thermal/thermal_zone0/temp": "27800\n",
+    "thermal/thermal_zone1/type": "x86_pkg_temp\n",
+    "thermal/thermal_zone1/temp": "45000\n",
+}
+CORETEMP = {
+    "hwmon/hwmon1/name": "coretemp\n",
+    "hwmon/hwmon1/temp1_label": "Package id 0\n",
+    "hwmon/hwmon1/temp1_input": "52000\n",
+    "hwmon/hwmon1/temp1_max": "80000\n",
+    "hwmon/hwmon1/temp1_crit": "100000\n",
+    "hwmon/hwmon1/temp2_label": "Core 0\n",
+    "hwmon/hwmon1/temp2_input": "50000\n",
+    "hwmon/hwmon1/temp3_label": "Core 1\n",
+    "hwmon/hwmon1/temp3_input": "49000\n",
+    # Lists an input that never reads, it is left out
+    "hwmon/hwmon1/temp4_label": "Core 2\n",
+    "hwmon/hwmon1/temp4_input": "error\n",
+}
+FANS = {
+    "hwmon/hwmon2/name": "nct6775\n",
+    "hwmon/hwmon2/fan1_input": "1200\n",
+    "hwmon/hwmon2/fan2_label": "Pump\n",
+    "hwmon/hwmon2/fan2_input": "2400\n",
+}
+
+
+@pytest.fixture
+def sensors(tmp_path):
+    sensors = Sensors(make_tree(tmp_path, {**ZONES, **CORETEMP, **FANS}))
+    yield sensors
+    sensors.close()
+
+
+def test_thermal_zones(tmp_path):
+    sensors = Sensors(make_tree(tmp_path, ZONES))
+    readings = sensors.read()
+    sensors.close()
+    assert [(t.chip, t.label, t.current) for t in readings.temperatures] \
+        == [("thermal_zone0", "acpitz", 27.8),
+            ("thermal_zone1", "x86_pkg_temp", 45.0)]
+    # x86_pkg_temp is the CPU, acpitz is the board
+    assert [(p.label, p.current) for p in readings.packages] \
+        == [("x86_pkg_temp", 45.0)]
+
+
+def test_coretemp_package_and_cores(sensors):
+    readings = sensors.read()
+    package, = readings.packages
+    assert package.label == "Package id 0"
+    assert package.current == 52.0
+    assert [(core.label, core.current) for core in package.cores] \
+        == [("Core 0", 50.0), ("Core 1", 49.0)]
+
+    coretemp = [t for t in readings.temperatures if t.chip == "coretemp"]
+    assert [t.label for t in coretemp] == ["Package id 0", "Core 0", "Core 1"]
+    assert (coretemp[0].high, coretemp[0].critical) == (80.0, 100.0)
+    assert temperature_rows(readings) == [
+        ("CPU temp", "52.0 °C"),
+        ("Package id 0", "52.0 °C  cores 50  49 °C")]
+
+
+def test_input_that_fails_later(sensors, tmp_path):
+    (tmp_path / "hwmon/hwmon1/temp2_input").write_text("")
+    readings = sensors.read()
+    core = readings.packages[0].cores[0]
+    assert (core.label, core.current) == ("Core 0", None)
+    assert temperature_rows(readings)[1] \
+        == ("Package id 0", "52.0 °C  cores -  49 °C")
+
+
+def test_fans(sensors):
+    assert [(fan.chip, fan.label, fan.current)
+            for fan in sensors.read().fans] \
+        == [("nct6775", "fan1", 1200), ("nct6775", "Pump", 2400)]
+
+
+def test_falls_back_to_thermal_zone0(tmp_path):
+    sensors = Sensors(make_tree(tmp_path, {
+        "thermal/thermal_zone0/type": "acpitz\n",
+        "thermal/thermal_zone0/temp": "31000\n",
+        "thermal/thermal_zone1/type": "iwlwifi_1\n",
+        "thermal/thermal_zone1/temp": "40000\n",
+        # Not a CPU chip, so it doesn't count as a package
+        "hwmon/hwmon0/name": "nvme\n",
+        "hwmon/hwmon0/temp1_input": "38000\n",
+    }))
+    readings = sensors.read()
+    sensors.close()
+    assert [(p.label, p.current) for p in readings.packages] \
+        == [("acpitz", 31.0)]
+    assert temperature_rows(readings) == [
+        ("CPU temp", "31.0 °C"), ("acpitz", "31.0 °C")]
+
+
+def test_no_sensors(tmp_path):
+    sensors = Sensors(str(tmp_path))
+    readings = sensors.read()
+    assert readings.packages == [] and readings.fans == []
+    assert temperature_rows(readings) == [("CPU temp", "-")]
@@ -0,0 +1,52 @@
+"""
+    Name: test_system_sampler.py
+    Created: 10/18/26
+    Purpose: Counters only a few readers use are only read when asked for
+"""
+import pytest
+from adaptive_sampler import AdaptiveSampler
+from fake_psutil import FakeSystem
+from system_sampler import Sampler
+
+
+class CountingProvider:
+    """
+        A FakeSystem that counts the calls made to it
+    """
+    def __init__(self):
+        self.system = FakeSystem(cores=4, processes=10)
+        self.calls = {}
+
+    def __getattr__(self, name):
+        function = getattr(self.system, name)
+
+        def call(*args, **kwargs):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            return function(*args, **kwargs)
+
+        return call
+
+
+@pytest.mark.parametrize("sampler_type", [Sampler, AdaptiveSampler])
+def test_disk_io_and_cpu_stats_off_by_default(sampler_type):
+    provider = CountingProvider()
+    snapshot = sampler_type(provider=provider).sample()
+    assert snapshot.disk_io is None
+    assert snapshot.cpu_stats is None
+    assert "disk_io_counters" not in provider.calls
+    assert "cpu_stats" not in provider.calls
+
+
+@pytest.mark.parametrize("sampler_type", [Sampler, AdaptiveSampler])
+def test_disk_io_and_cpu_stats_when_asked(sampler_type):
+    provider = CountingProvider()
+    snapshot = sampler_type(
+        diskio=True, cpustats=True, provider=provider).sample()
+    assert snapshot.disk_io.read_bytes >= 0
+    assert snapshot.cpu_stats.ctx_switches >= 0
+
+
+def test_perdisk_without_total():
+    snapshot = Sampler(perdisk=True, provider=FakeSystem(disks=3)).sample()
+    assert snapshot.disk_io is None
+    assert len(snapshot.disk_io_perdisk) == 3
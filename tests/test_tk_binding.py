@@ -0,0 +1,115 @@
+"""
+    Name: test_tk_binding.py
+    Created: 10/18/26
+    Purpose: Only values that changed reach Tk, in one idle callback per
+    frame, and a destroyed widget doesn't hold up the others
+"""
+import tkinter as tk
+from benchmark_suite import FakeLabel, FakeRoot
+from tk_binding import TkBinding
+
+
+class CountingRoot(FakeRoot):
+    def __init__(self):
+        super().__init__()
+        self.after_idle_calls = 0
+
+    def after_idle(self, function):
+        self.after_idle_calls += 1
+        super().after_idle(function)
+
+
+class CountingLabel(FakeLabel):
+    def __init__(self, i, shown):
+        super().__init__()
+        self.i = i
+        self.shown = shown
+
+    def configure(self, options=None, **kwargs):
+        self.shown.append((self.i, (options or kwargs)["text"]))
+        super().configure(options, **kwargs)
+
+
+def make_binding(count=3):
+    root = CountingRoot()
+    binding = TkBinding(root)
+    # Every call into a widget, as (widget number, text)
+    shown = []
+    labels = [CountingLabel(i, shown) for i in range(count)]
+    for i, label in enumerate(labels):
+        binding.bind(f"key{i}", label)
+    return root, binding, labels, shown
+
+
+def test_changed_values_shown_in_one_idle_callback():
+    root, binding, labels, shown = make_binding()
+    binding.update({"key0": "a", "key1": "b", "key2": "c"})
+    assert root.after_idle_calls == 1
+    assert shown == []
+    root.run_idle()
+    assert [label.options["text"] for label in labels] == ["a", "b", "c"]
+    assert binding.frame_calls[-1] == 4
+
+
+def test_unchanged_values_skipped():
+    root, binding, labels, shown = make_binding()
+    binding.update({"key0": "a", "key1": "b", "key2": "c"})
+    root.run_idle()
+    shown.clear()
+
+    binding.update({"key0": "a", "key1": "B", "key2": "c"})
+    assert root.after_idle_calls == 2
+    root.run_idle()
+    assert shown == [(1, "B")]
+    assert binding.skipped == 2
+
+    # Nothing changed, not even an idle callback
+    binding.update({"key0": "a", "key1": "B", "key2": "c"})
+    assert root.after_idle_calls == 2
+    assert root.idle == []
+
+
+def test_set_and_set_back_in_one_frame_costs_nothing():
+    root, binding, labels, shown = make_binding()
+    binding.set("key0", "a")
+    root.run_idle()
+    shown.clear()
+
+    binding.set("key0", "b")
+    binding.set("key0", "a")
+    root.run_idle()
+    assert shown == []
+    assert labels[0].options["text"] == "a"
+    # Only the idle callback itself
+    assert binding.frame_calls[-1] == 1
+
+
+def test_per_frame_counts():
+    root, binding, labels, shown = make_binding()
+    binding.update({"key0": 1, "key1": 1})
+    root.run_idle()
+    binding.set("key2", 1)
+    root.run_idle()
+    assert list(binding.frame_calls) == [3, 2]
+    assert binding.frames == 2
+    assert binding.calls == 5
+    assert binding.summary().startswith("Tcl calls per frame: 2 (mean 2.5")
+
+
+def test_destroyed_widget_does_not_drop_the_frame():
+    root, binding, labels, shown = make_binding()
+
+    def destroyed(value):
+        raise tk.TclError('invalid command name ".!label2"')
+
+    binding.bind_function("key1", destroyed)
+    binding.update({"key0": "a", "key1": "b", "key2": "c"})
+    root.run_idle()
+    assert labels[0].options["text"] == "a"
+    assert labels[2].options["text"] == "c"
+    assert "key1" not in binding.setters
+
+    # Values for the forgotten key are dropped
+    binding.set("key1", "d")
+    root.run_idle()
+    assert "key1" not in binding.rendered
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+    Name: tk_binding.py
+    Created: 10/18/26
+    Purpose: Map metric keys to Tk widgets and only call into Tcl for
+    values that changed, with every change of a frame made in one idle
+    callback
+
+    Each configure() is a Tcl round trip and asks Tk to lay out and
+    redraw the widget, even when the text is the same as before
+"""
+import sys
+import tkinter as tk
+from collections import deque
+
+# Frames kept for the per frame report
+REPORT_FRAMES = 60
+
+
+class TkBinding:
+    def __init__(self, root, report=False):
+        """
+            :param root: Tk root, updates run in its idle callback
+            :param report: Print the Tcl calls of every frame to stderr
+        """
+        self.root = root
+        self.report = report
+        # {key: function that shows a value}
+        self.setters = {}
+        # {key: value last shown}
+        self.rendered = {}
+        # {key: value to show in the next idle callback}
+        self.pending = {}
+        self.scheduled = False
+
+        self.frames = 0
+        # Widget calls made and skipped over the life of the binding
+        self.calls = 0
+        self.skipped = 0
+        # Widget calls of each recent frame, including the after_idle
+        self.frame_calls = deque(maxlen=REPORT_FRAMES)
+
+# ------------------------------- BIND ----------------------------------- #
+    def bind(self, key, widget, option="text"):
+        """
+            Show the values of key in one option of a widget
+            :param widget: Label, Progressbar or anything with configure()
+            :param option: "text" for a label, "value" for a progressbar
+        """
+        self.bind_function(
+            key, lambda value: widget.configure({option: value}))
+
+    def bind_function(self, key, function):
+        """
+            Show the values of key by calling function(value), for
+            anything that isn't one configure(), like a Treeview row
+        """
+        self.setters[key] = function
+        self.rendered.pop(key, None)
+
+    def unbind(self, key):
+        """
+            Forget a key whose widget is gone
+        """
+        self.setters.pop(key, None)
+        self.rendered.pop(key, None)
+        self.pending.pop(key, None)
+
+# ------------------------------- SET ------------------------------------ #
+    def set(self, key, value):
+        """
+            Show value at the end of this frame if it is not already shown
+        """
+        if key not in self.pending and key in self.rendered \
+                and self.rendered[key] == value:
+            self.skipped += 1
+            return
+        self.pending[key] = value
+        if not self.scheduled:
+            self.scheduled = True
+            self.root.after_idle(self.flush)
+
+    def update(self, values):
+        """
+            Set every value of a {key: value} dict
+        """
+        for key, value in values.items():
+            self.set(key, value)
+
+# ------------------------------- FLUSH ---------------------------------- #
+    def flush(self):
+        """
+            Make every change of this frame, runs once Tk is idle
+        """
+        self.scheduled = False
+        # The after_idle that brought us here
+        calls = 1
+        pending, self.pending = self.pending, {}
+        for key, value in pending.items():
+            if key in self.rendered and self.rendered[key] == value:
+                # Set back to what is shown before the frame ended
+                self.skipped += 1
+                continue
+            setter = self.setters.get(key)
+            if setter is None:
+                # Unbound since the value was set
+                continue
+            calls += 1
+            try:
+                setter(value)
+            except tk.TclError:
+                # The widget was destroyed, the rest of the frame still
+                # gets shown
+                self.unbind(key)
+                continue
+            self.rendered[key] = value
+
+        self.frames += 1
+        self.calls += calls
+        self.frame_calls.append(calls)
+        if self.report:
+            print(self.summary(), file=sys.stderr, flush=True)
+
+# ------------------------------ SUMMARY --------------------------------- #
+    def summary(self):
+        """
+            :returns: Tcl calls of the last frame and recent average
+            :rtype: str
+        """
+        if not self.frame_calls:
+            return "Tcl calls per frame: no frames yet"
+        mean = sum(self.frame_calls) / len(self.frame_calls)
+        return (f"Tcl calls per frame: {self.frame_calls[-1]} "
+                f"(mean {mean:.1f} over {len(self.frame_calls)} frames), "
+                f"{self.skipped} unchanged values skipped")